@@ -0,0 +1,170 @@
+"""Headless batch processing of the folder with FMI files.
+
+Every relevant channel of every file is segmented for every threshold and exported
+the same way as from the widget. Files are processed on a pool of worker processes.
+
+    python -m napari_fmi.batch path/to/folder --output path/to/results --thresholds 50 100 150
+
+With --sweep, whashout curves for all thresholds are also exported as one table per channel.
+With --convert, pickles are first converted to chunked stores, which this and later runs read instead.
+"""
+
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from pathlib import Path
+
+import numpy as np
+
+from plugin_fmi.constants import BATCH_TASKS_PER_WORKER, CHANNELS_TO_PARSE
+from plugin_fmi.export import (
+    get_export_name,
+    init_results_folders,
+    save_mask,
+    save_whashout_curve,
+    save_whashout_sweep,
+)
+from plugin_fmi.loaders import get_available_files, load_fmi_file
+from plugin_fmi.processing import get_mask_labels, get_whashout_sweep, segment_fmi_image
+from plugin_fmi.storage import convert_fmi_folder
+
+
+DEPTH_KEY: str = "DEPT"
+
+
+def process_file(  # noqa: PLR0913
+    path_to_file: Path,
+    thresholds: list[int],
+    path_xlsx_files: Path,
+    path_img_files: Path,
+    channels: list[str] = CHANNELS_TO_PARSE,
+    sweep: bool = False,
+) -> int:
+    """Method to segment and export every relevant channel of the file for every threshold.
+
+    Args:
+        path_to_file: path to FMI file
+        thresholds: thresholds to segment with
+        path_xlsx_files: folder for whashout curves
+        path_img_files: folder for masks
+        channels: channels to process
+        sweep: export whashout curves for all thresholds computed in one pass as well
+
+    Returns: N of exported results
+
+    """
+    fmi_file = load_fmi_file(path_to_file)
+    depth = np.asarray(fmi_file[DEPTH_KEY])
+    n_results = 0
+    for channel in [key for key in fmi_file if key.upper() in channels]:
+        fmi_image = fmi_file[channel]
+        for threshold in thresholds:
+            fmi_mask, whashout_curve, _ = segment_fmi_image(fmi_image, threshold)
+            save_name = get_export_name(path_to_file, threshold, channel=channel)
+            save_whashout_curve(path_xlsx_files / f"{save_name}.xlsx", depth, whashout_curve, width=fmi_mask.shape[1])
+            save_mask(path_img_files / f"{save_name}.png", get_mask_labels(fmi_mask))
+            n_results += 1
+        if sweep:
+            save_name = get_export_name(path_to_file, "sweep", channel=channel)
+            whashout_sweep = get_whashout_sweep(fmi_image, thresholds)
+            save_whashout_sweep(
+                path_xlsx_files / f"{save_name}.xlsx",
+                depth,
+                whashout_sweep,
+                thresholds,
+                width=fmi_image.shape[1],
+            )
+            n_results += 1
+    return n_results
+
+
+def run_batch(
+    files: list[Path],
+    thresholds: list[int],
+    path_to_results: Path,
+    max_workers: int | None = None,
+    sweep: bool = False,
+) -> int:
+    """Method to process files on the pool of processes, reporting progress and throughput.
+
+    Only a few files per process are submitted ahead, so pending work does not grow
+    with the size of the folder.
+
+    Args:
+        files: FMI files to process
+        thresholds: thresholds to segment with
+        path_to_results: folder to store results
+        max_workers: N of processes, by default N of cores
+        sweep: export whashout curves for all thresholds as one table per channel
+
+    Returns: N of files which failed
+
+    """
+    path_xlsx_files, path_img_files = init_results_folders(path_to_results)
+    max_workers = max_workers or os.cpu_count() or 1
+    max_in_flight = max_workers * BATCH_TASKS_PER_WORKER
+    pending_files = iter(files)
+    in_flight: dict[Future, Path] = {}
+    n_done, n_failed, n_bytes = 0, 0, 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        while True:
+            while len(in_flight) < max_in_flight and (path_to_file := next(pending_files, None)) is not None:
+                future = executor.submit(
+                    process_file,
+                    path_to_file,
+                    thresholds,
+                    path_xlsx_files,
+                    path_img_files,
+                    sweep=sweep,
+                )
+                in_flight[future] = path_to_file
+            if not in_flight:
+                break
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                path_to_file = in_flight.pop(future)
+                n_done += 1
+                n_bytes += path_to_file.stat().st_size
+                error = future.exception()
+                if error is None:
+                    status = f"{future.result()} results"
+                else:
+                    n_failed += 1
+                    status = f"failed: {error!r}"
+                elapsed = time.perf_counter() - start
+                print(
+                    f"[{n_done}/{len(files)}] {path_to_file.name}: {status} | "
+                    f"{n_done / elapsed:.2f} files/s, {n_bytes / 1024**2 / elapsed:.1f} MB/s",
+                    flush=True,
+                )
+    return n_failed
+
+
+def main() -> None:
+    """Method to run batch processing from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", type=Path, help="folder with FMI files")
+    parser.add_argument("--output", type=Path, required=True, help="folder to store results")
+    parser.add_argument("--thresholds", type=int, nargs="+", default=[100], help="thresholds to segment with")
+    parser.add_argument("--sweep", action="store_true", help="export whashout curves for all thresholds per channel")
+    parser.add_argument("--workers", type=int, default=None, help="N of processes, by default N of cores")
+    parser.add_argument("--convert", action="store_true", help="convert pickles to chunked stores before processing")
+    args = parser.parse_args()
+
+    if args.convert:
+        # files without up-to-date store are converted, so they are loaded without unpickling
+        stores = convert_fmi_folder(args.folder)
+        print(f"Converted {len(stores)} files to stores", flush=True)
+
+    files = get_available_files(args.folder)
+    if not files:
+        sys.exit(f"No FMI files found in {args.folder}")
+    n_failed = run_batch(files, args.thresholds, args.output, max_workers=args.workers, sweep=args.sweep)
+    sys.exit(1 if n_failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Benchmark of the vectorized LAS reader against lasio.
+
+Run from the plugin folder:
+
+    python benchmarks/bench_las_reader.py --rows 30000 --curves 200
+"""
+
+import argparse
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import lasio
+import numpy as np
+
+from plugin_fmi.las_reader import read_las_fast
+
+
+def write_synthetic_las(path_to_file: Path, n_rows: int, n_curves: int, step: float = 0.1) -> None:
+    """Method to write regularly sampled LAS file with random curves."""
+    depth = 1000 + np.arange(n_rows) * step
+    data = np.random.default_rng(0).normal(size=(n_rows, n_curves)).round(4)
+    data[::97, 1:] = -999.25
+    names = [f"C{ix:03d}" for ix in range(n_curves)]
+    header = [
+        "~VERSION INFORMATION",
+        " VERS.   2.0 : CWLS LAS VERSION 2.0",
+        " WRAP.   NO  : ONE LINE PER DEPTH STEP",
+        "~WELL INFORMATION",
+        f" STRT.M  {depth[0]:.4f} : START DEPTH",
+        f" STOP.M  {depth[-1]:.4f} : STOP DEPTH",
+        f" STEP.M  {step:.4f} : STEP",
+        " NULL.   -999.25 : NULL VALUE",
+        " WELL.   SYNTHETIC : WELL",
+        "~CURVE INFORMATION",
+        " DEPT.M : DEPTH",
+        *[f" {name}.UNIT : CURVE {name}" for name in names],
+        "~A",
+    ]
+    table = np.column_stack([depth, data])
+    with path_to_file.open("w") as f:
+        f.write("\n".join(header) + "\n")
+        np.savetxt(f, table, fmt="%.4f")
+
+
+def timeit(func: Callable, repeat: int) -> float:
+    """Method to return best wall time of the function."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    """Method to run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=30000)
+    parser.add_argument("--curves", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as folder:
+        path_to_file = Path(folder) / "synthetic.las"
+        write_synthetic_las(path_to_file, args.rows, args.curves)
+        size_mb = path_to_file.stat().st_size / 1024**2
+        depth_window = (1000 + args.rows * 0.1 * 0.4, 1000 + args.rows * 0.1 * 0.5)
+        cases = {
+            "lasio, all curves": lambda: lasio.read(path_to_file).df().reset_index(drop=False),
+            "fast, all curves": lambda: read_las_fast(path_to_file),
+            "fast, 3 curves": lambda: read_las_fast(path_to_file, curves=["C001", "C002", "C003"]),
+            "fast, 3 curves, 10% window": lambda: read_las_fast(
+                path_to_file,
+                curves=["C001", "C002", "C003"],
+                depth_range=depth_window,
+            ),
+        }
+        print(f"File: {args.rows} rows x {args.curves + 1} curves, {size_mb:.1f} MB")
+        baseline = None
+        for name, func in cases.items():
+            elapsed = timeit(func, args.repeat)
+            baseline = baseline or elapsed
+            print(f"{name:<30} {elapsed * 1000:10.1f} ms {baseline / elapsed:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
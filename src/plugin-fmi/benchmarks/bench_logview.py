@@ -0,0 +1,57 @@
+"""Benchmark of logview figure build time against the number of curve tracks.
+
+Run from the plugin folder:
+
+    python benchmarks/bench_logview.py --tracks 5 10 20 40 80 --samples 20000
+"""
+
+import argparse
+import time
+
+import numpy as np
+import pandas as pd
+import plotly.io as pio
+
+from plugin_fmi.visualization import logview
+
+
+N_REPEATS: int = 3
+
+
+def make_logs(n_tracks: int, n_samples: int) -> pd.DataFrame:
+    """Method to create table with random walk curves."""
+    rng = np.random.default_rng(0)
+    curves = np.cumsum(rng.normal(size=(n_samples, n_tracks)), axis=0)
+    df_log = pd.DataFrame(curves, columns=[f"CURVE_{i}" for i in range(n_tracks)])
+    df_log["DEPTH"] = 1000 + np.arange(n_samples) * 0.1
+    return df_log
+
+
+def measure(df_log: pd.DataFrame) -> tuple[float, float]:
+    """Method to return best time of figure build and of its serialization to HTML in seconds."""
+    build_times, html_times = [], []
+    for _ in range(N_REPEATS):
+        start = time.perf_counter()
+        fig = logview(df_log)
+        build_times.append(time.perf_counter() - start)
+        start = time.perf_counter()
+        pio.to_html(fig, include_plotlyjs=False, validate=False)
+        html_times.append(time.perf_counter() - start)
+    return min(build_times), min(html_times)
+
+
+def main() -> None:
+    """Method to run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tracks", type=int, nargs="+", default=[5, 10, 20, 40, 80])
+    parser.add_argument("--samples", type=int, default=20000)
+    args = parser.parse_args()
+
+    print(f"{'tracks':>6} {'build, ms':>10} {'to_html, ms':>12}")
+    for n_tracks in args.tracks:
+        build_time, html_time = measure(make_logs(n_tracks, args.samples))
+        print(f"{n_tracks:>6} {build_time * 1000:>10.1f} {html_time * 1000:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark of the fused segmentation kernel against separate mask, curve and porosity steps.
+
+Run from the plugin folder:
+
+    python benchmarks/bench_segmentation.py --height 200000 --width 180
+"""
+
+import argparse
+import time
+import tracemalloc
+from collections.abc import Callable
+from functools import partial
+
+import numpy as np
+
+from plugin_fmi import processing
+from plugin_fmi.processing import get_mask_labels, segment_fmi_image
+
+
+THRESHOLD: int = 100
+
+
+def separate_steps(fmi_image: np.ndarray) -> None:
+    """Method to run the steps as they were done before the fused kernel."""
+    fmi_mask = np.where(fmi_image < THRESHOLD, 1, 0)
+    width = fmi_mask.shape[1]
+    fmi_mask.sum(axis=1) / width * width
+    fmi_mask * 255
+    fmi_mask.sum(axis=1) / width
+
+
+def fused_kernel(fmi_image: np.ndarray, use_numba: bool = True) -> None:
+    """Method to run the fused kernel and convert the mask to labels."""
+    fmi_mask, _, _ = segment_fmi_image(fmi_image, THRESHOLD, use_numba=use_numba)
+    get_mask_labels(fmi_mask)
+
+
+def measure(func: Callable, fmi_image: np.ndarray) -> tuple[float, float]:
+    """Method to return wall time and peak of allocated memory in MB."""
+    func(fmi_image)
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(fmi_image)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024**2
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main() -> None:
+    """Method to run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--height", type=int, default=200000)
+    parser.add_argument("--width", type=int, default=180)
+    args = parser.parse_args()
+
+    fmi_image = np.random.default_rng(0).uniform(-150, 255, size=(args.height, args.width)).astype(np.float32)
+    cases = {"separate steps": separate_steps, "fused, numpy": partial(fused_kernel, use_numba=False)}
+    if processing.get_segment_rows_numba() is not None:
+        cases["fused, numba"] = fused_kernel
+
+    print(f"Image: {args.height} x {args.width}, {fmi_image.nbytes / 1024**2:.0f} MB")
+    baseline = None
+    for name, func in cases.items():
+        elapsed, peak = measure(func, fmi_image)
+        baseline = baseline or (elapsed, peak)
+        print(
+            f"{name:<16} {elapsed * 1000:8.1f} ms {baseline[0] / elapsed:6.1f}x"
+            f" | peak {peak:8.1f} MB {baseline[1] / peak:6.1f}x",
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""Benchmark of threshold slider latency: thresholding the image vs lookup in sorted rows.
+
+Run from the plugin folder:
+
+    python benchmarks/bench_threshold_slider.py --height 200000 --width 180
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+from plugin_fmi.processing import get_boolean_mask, get_whashout_curve, get_whashout_curve_sorted, sort_rows
+
+
+def main() -> None:
+    """Method to run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--height", type=int, default=200000)
+    parser.add_argument("--width", type=int, default=180)
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args()
+
+    fmi_image = np.random.default_rng(0).uniform(0, 255, size=(args.height, args.width)).astype(np.float32)
+    thresholds = np.linspace(1, 255, args.ticks).astype(int)
+
+    start = time.perf_counter()
+    sorted_rows = sort_rows(fmi_image)
+    sort_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for threshold in thresholds:
+        get_whashout_curve(get_boolean_mask(fmi_image, threshold))
+    before = (time.perf_counter() - start) / args.ticks
+
+    start = time.perf_counter()
+    for threshold in thresholds:
+        get_whashout_curve_sorted(sorted_rows, threshold)
+    after = (time.perf_counter() - start) / args.ticks
+
+    print(f"Image: {args.height} x {args.width}, {fmi_image.nbytes / 1024**2:.0f} MB")
+    print(f"one-time row sort:           {sort_time * 1000:10.1f} ms")
+    print(f"per tick, mask + curve:      {before * 1000:10.1f} ms")
+    print(f"per tick, sorted rows:       {after * 1000:10.1f} ms {before / after:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""Check of the import time of the plugin core against a budget.
+
+Core modules are imported in a fresh interpreter with ``python -X importtime``, the check
+fails with exit code 1 if the import takes longer than the budget or pulls in Qt, napari
+or plotting libraries, which have to stay lazy.
+
+Run from the plugin folder, the plugin sources next to the script are imported even if the
+plugin is not installed:
+
+    python benchmarks/check_import_time.py --budget-ms 1500
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+
+# numeric core of the plugin and figure builders, importable without Qt
+CORE_MODULES: tuple[str, ...] = (
+    "plugin_fmi",
+    "plugin_fmi.cache",
+    "plugin_fmi.constants",
+    "plugin_fmi.depth_frame",
+    "plugin_fmi.downsampling",
+    "plugin_fmi.export",
+    "plugin_fmi.folder_index",
+    "plugin_fmi.formations",
+    "plugin_fmi.las_reader",
+    "plugin_fmi.loaders",
+    "plugin_fmi.prefetch",
+    "plugin_fmi.processing",
+    "plugin_fmi.products",
+    "plugin_fmi.pyramid",
+    "plugin_fmi.rendering",
+    "plugin_fmi.serialization",
+    "plugin_fmi.sidecar",
+    "plugin_fmi.storage",
+    "plugin_fmi.viewport",
+    "plugin_fmi.visualization",
+)
+
+# packages the core must not import at load time
+FORBIDDEN_PACKAGES: tuple[str, ...] = (
+    "qtpy",
+    "PyQt5",
+    "PyQt6",
+    "PySide2",
+    "PySide6",
+    "napari",
+    "matplotlib",
+    "cv2",
+    "numba",
+    "statsmodels",
+)
+
+# sources of the plugin, put first on the path of the measured interpreter
+PLUGIN_SOURCES: Path = Path(__file__).resolve().parents[1] / "src"
+
+IMPORT_TIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+
+def measure_import(modules: tuple[str, ...]) -> tuple[dict[str, int], list[str]]:
+    """Method to import modules in a fresh interpreter.
+
+    Args:
+        modules: names of modules to import
+
+    Returns: cumulative import time in microseconds of every top level import and forbidden packages loaded
+
+    """
+    code = (
+        f"import sys\nimport {', '.join(modules)}\n"
+        f"print(' '.join(name for name in {FORBIDDEN_PACKAGES!r} if name in sys.modules))"
+    )
+    python_path = os.pathsep.join(filter(None, [str(PLUGIN_SOURCES), os.environ.get("PYTHONPATH")]))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        check=True,
+        env={**os.environ, "PYTHONPATH": python_path},
+    )
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        match = IMPORT_TIME_LINE.match(line)
+        # nested imports are indented, top level ones add up to the total
+        if match is not None and not match.group(3):
+            cumulative[match.group(4)] = int(match.group(2))
+    return cumulative, result.stdout.split()
+
+
+def main() -> None:
+    """Method to run the check."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500)
+    parser.add_argument("--repeat", type=int, default=3, help="best of N runs is compared to the budget")
+    parser.add_argument("--top", type=int, default=10, help="N of slowest top level imports to print")
+    args = parser.parse_args()
+
+    runs = [measure_import(CORE_MODULES) for _ in range(max(args.repeat, 1))]
+    cumulative, forbidden = min(runs, key=lambda run: sum(run[0].values()))
+    total_ms = sum(cumulative.values()) / 1000
+
+    for name, microseconds in sorted(cumulative.items(), key=lambda item: -item[1])[: args.top]:
+        print(f"{name:<40} {microseconds / 1000:8.1f} ms")
+    print(f"{'total':<40} {total_ms:8.1f} ms, budget {args.budget_ms:.0f} ms")
+
+    failed = False
+    if total_ms > args.budget_ms:
+        print(f"FAIL: import of the core takes {total_ms:.0f} ms, over the budget of {args.budget_ms:.0f} ms")
+        failed = True
+    if forbidden:
+        print(f"FAIL: import of the core loads {', '.join(forbidden)}")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 __version__ = "0.0.1"
 
-from .widget_main import FMIProcessor
+__all__ = ["FMIProcessor"]
 
-import matplotlib.pyplot
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg
 
-__all__ = ["FMIProcessor"]
+def __getattr__(name: str) -> type:
+    # widget pulls in Qt and napari, so it is imported only when requested;
+    # processing modules stay importable in headless environments
+    if name == "FMIProcessor":
+        from .widget_main import FMIProcessor
+
+        return FMIProcessor
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,150 @@
+"""Module to cache decoded FMI channels in memory."""
+
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator, Mapping
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .constants import CACHE_MAX_BYTES
+from .loaders import load_fmi_file
+from .storage import FMIStore
+
+
+CacheKey = tuple[str, int, str]
+
+
+class ChannelCache:
+    """Class implements LRU cache of decoded channels limited by memory budget.
+
+    Whole channels are evicted, starting from the least recently used one, until
+    the total size fits into the budget. Cached arrays are read-only, so they can
+    be shared between widgets without copying.
+    """
+
+    def __init__(self, max_bytes: int = CACHE_MAX_BYTES) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes: int = 0
+        self.items: OrderedDict[CacheKey, NDArray] = OrderedDict()
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(path_to_file: Path, channel: str) -> CacheKey:
+        """Method to build cache key, modified file gets a new key."""
+        return str(path_to_file.resolve()), path_to_file.stat().st_mtime_ns, channel
+
+    def get(self, key: CacheKey) -> NDArray | None:
+        """Method to return cached array and mark it as recently used."""
+        with self.lock:
+            array = self.items.get(key)
+            if array is not None:
+                self.items.move_to_end(key)
+            return array
+
+    def put(self, key: CacheKey, array: NDArray) -> NDArray:
+        """Method to add array to the cache, evicting old channels if needed.
+
+        Args:
+            key: cache key
+            array: decoded channel
+
+        Returns: read-only array stored in the cache
+
+        """
+        array = np.asarray(array)
+        array.setflags(write=False)
+        if array.nbytes > self.max_bytes:
+            return array
+        with self.lock:
+            previous = self.items.pop(key, None)
+            if previous is not None:
+                self.nbytes -= previous.nbytes
+            self.items[key] = array
+            self.nbytes += array.nbytes
+            while self.nbytes > self.max_bytes:
+                _, evicted = self.items.popitem(last=False)
+                self.nbytes -= evicted.nbytes
+        return array
+
+    def clear(self) -> None:
+        """Method to drop all cached channels."""
+        with self.lock:
+            self.items.clear()
+            self.nbytes = 0
+
+
+class CachedFMIFile(Mapping):
+    """Class to access channels of FMI file through the channel cache.
+
+    Store is opened lazily and only requested channel is decoded. Pickle has to be
+    read as a whole, so all its channels are put into the cache at once.
+    """
+
+    def __init__(
+        self,
+        path_to_file: Path,
+        cache: ChannelCache,
+        loader: Callable[[Path], Mapping] = load_fmi_file,
+    ) -> None:
+        self.path = path_to_file
+        self.cache = cache
+        self.loader = loader
+        self._store: FMIStore | None = None
+        self._keys: list[str] | None = None
+        self._extra: dict[str, object] = {}  # non-array values of the pickle
+
+    def open(self) -> Mapping:
+        """Method to open the file and fill the cache with what was decoded.
+
+        Returns: opened store or decoded pickle
+
+        """
+        data = self.loader(self.path)
+        if isinstance(data, FMIStore):
+            self._store = data
+            self._keys = list(data)
+            return data
+        self._keys = list(data)
+        for key, value in data.items():
+            array = np.asarray(value)
+            if array.ndim and array.dtype.kind in "biuf":
+                self.cache.put(self.cache.make_key(self.path, key), array)
+            else:
+                self._extra[key] = value
+        return data
+
+    def __getitem__(self, key: str) -> object:
+        if key in self._extra:
+            return self._extra[key]
+        cache_key = self.cache.make_key(self.path, key)
+        array = self.cache.get(cache_key)
+        if array is not None:
+            return array
+        data = self.open() if self._keys is None else None
+        if key not in self._keys:
+            raise KeyError(key)
+        if key in self._extra:
+            return self._extra[key]
+        if self._store is not None:
+            return self.cache.put(cache_key, self._store.read_rows(key))
+        # channel of the pickle was evicted or is too big to cache, the pickle is decoded at most once per access
+        if data is None:
+            data = self.open()
+        return data[key]
+
+    def __contains__(self, key: object) -> bool:
+        if self._keys is None:
+            self.open()
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[str]:
+        if self._keys is None:
+            self.open()
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        if self._keys is None:
+            self.open()
+        return len(self._keys)
@@ -1,7 +1,7 @@
 """Module contains constants used in the plugin."""
 
-# N of rows to consider during visualization of logview for FMI image
-SAMPLING_STEP: int = 10
+# N of rows FMI tracks are reduced to for logview, about twice the pixel height of the plot
+LOGVIEW_TARGET_HEIGHT: int = 2048
 # sigma value for gaussian filter
 SIGMA: int = 2
 # constant number of logs to select
@@ -10,3 +10,61 @@ N_LOGS: int = 3
 N_COLS_FORMATION_TOPS: int = 6
 # encoded None value within logs
 ENCODED_NONE: int = -99
+# suffix of the chunked store created next to FMI pickle file
+STORE_SUFFIX: str = ".fmi"
+# N of depth rows within one chunk of the store
+STORE_CHUNK_ROWS: int = 2048
+# zlib compression level for chunks of the store
+STORE_COMPRESSION_LEVEL: int = 3
+# N of files before and after the current one to load in background
+PREFETCH_DEPTH: int = 1
+# N of worker threads used to prefetch files
+PREFETCH_WORKERS: int = 2
+# memory budget in bytes for decoded channels kept in memory
+CACHE_MAX_BYTES: int = 8 * 1024**3
+# suffix of hidden folder with parsed table cached next to .las / .xlsx file
+SIDECAR_SUFFIX: str = ".cache"
+# N of bytes read at once while hashing source file
+SIDECAR_HASH_BLOCK: int = 1024 * 1024
+# name of the file with metadata index stored within the folder with FMI files
+FOLDER_INDEX_NAME: str = ".fmi_index.json"
+# N of worker threads used to index the folder
+FOLDER_INDEX_WORKERS: int = 4
+# N of histogram bins stored for every channel
+FOLDER_INDEX_BINS: int = 256
+# percentiles stored for every channel
+FOLDER_INDEX_PERCENTILES: tuple = (1, 5, 50, 95, 99)
+# suffix of hidden folder with persisted pyramid levels next to FMI file
+PYRAMID_SUFFIX: str = ".pyramid"
+# height of the lowest resolution level of the pyramid
+PYRAMID_MIN_HEIGHT: int = 1024
+# width below which pyramid levels are downsampled only along depth
+PYRAMID_MIN_WIDTH: int = 64
+# delay in ms to coalesce slider events before recomputation starts in background
+WORKER_DEBOUNCE_MS: int = 30
+# FMI channels which are processed
+CHANNELS_TO_PARSE: list = ["DYN_HRUT", "DYN_HRLT", "STA_HRLT", "STA_HRUT"]
+# N of files queued per batch worker process, bounds memory held by pending work
+BATCH_TASKS_PER_WORKER: int = 2
+# N of thresholds within the whashout sweep track of logview
+SWEEP_N_THRESHOLDS: int = 32
+# N of image rows processed at once by the fused segmentation kernel and the whashout sweep
+SEGMENTATION_BLOCK_ROWS: int = 4096
+# how FMI image and segmentation tracks of logview are drawn: "image" embeds colour-mapped PNG, "heatmap" sends values
+FMI_TRACK_RENDER_MODE: str = "image"
+# values mapped to the ends of colorscale of FMI segmentation track, mask is scaled by 255
+FMI_SEGMENTATION_RANGE: tuple[float, float] = (0, 255)
+# format of images embedded into logview, "png" or "webp", both lossless
+FMI_TRACK_IMAGE_FORMAT: str = "png"
+# method to downsample log curves for display, "minmax" keeps every spike, "lttb" keeps the visual shape
+CURVE_DOWNSAMPLING: str = "minmax"
+# how curves and cross plot markers are drawn: "svg", "webgl" or "auto" to switch to webgl above threshold
+SCATTER_RENDER_MODE: str = "auto"
+# N of points in a trace above which "auto" render mode draws it with webgl
+WEBGL_POINT_THRESHOLD: int = 5000
+# how cross plot shows points: "markers", "density" as 2d histogram or "auto" to switch to density above threshold
+CROSS_PLOT_MODE: str = "auto"
+# N of points in cross plot above which "auto" mode shows density
+CROSS_PLOT_DENSITY_THRESHOLD: int = 100000
+# N of bins along every axis of the density cross plot
+CROSS_PLOT_DENSITY_BINS: int = 200
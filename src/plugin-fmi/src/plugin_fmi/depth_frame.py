@@ -0,0 +1,189 @@
+"""Module to keep curves of several sources at native depth sampling and resample them on request."""
+
+from collections.abc import Mapping
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+
+RESAMPLING_MODES: tuple = ("nearest", "linear", "mean")
+
+
+def get_depth_column(df: pd.DataFrame | list[str]) -> str | None:
+    """Method to find depth column of the table loaded from .las file, or within the list of its curves."""
+    depth_cols = [col for col in df if "depth" in col.lower() and "orig" not in col.lower()]
+    return depth_cols[0] if depth_cols else None
+
+
+def get_sampling_step(depth: NDArray) -> float:
+    """Method to return typical depth step of sorted depth array."""
+    if len(depth) < 2:  # noqa: PLR2004
+        return np.inf
+    return float(np.median(np.diff(depth)))
+
+
+def resample_curve(depth: NDArray, values: NDArray, grid: NDArray, mode: str = "linear") -> NDArray:
+    """Method to resample curve onto sorted depth grid.
+
+    Args:
+        depth: sorted depth of the curve
+        values: values of the curve, any dtype for "nearest"
+        grid: sorted depth to resample to
+        mode: "nearest" sample within one step of the curve, "linear" interpolation between valid
+            samples, "mean" of samples within every grid cell
+
+    Returns: values on the grid, NaN (None for non-numeric values) where the curve has no data
+
+    """
+    if mode not in RESAMPLING_MODES:
+        raise ValueError(f"Unknown resampling mode {mode}, expected one of {RESAMPLING_MODES}")
+    is_numeric = values.dtype.kind in "biuf"
+    empty = np.nan if is_numeric else None
+    if mode == "linear":
+        valid = np.isfinite(values)
+        if not valid.any():
+            return np.full(len(grid), np.nan)
+        return np.interp(grid, depth[valid], values[valid].astype(np.float64), left=np.nan, right=np.nan)
+    if mode == "mean":
+        # cells are bounded by midpoints between grid depths
+        edges = (grid[1:] + grid[:-1]) / 2
+        cells = np.searchsorted(edges, depth)
+        valid = np.isfinite(values)
+        sums = np.bincount(cells[valid], weights=values[valid], minlength=len(grid))
+        counts = np.bincount(cells[valid], minlength=len(grid))
+        with np.errstate(invalid="ignore"):
+            resampled = sums / counts
+        # samples outside of the grid are not attributed to the first and last cells
+        step = get_sampling_step(grid)
+        resampled[(grid < depth[0] - step / 2) | (grid > depth[-1] + step / 2)] = np.nan
+        return resampled
+    right = np.clip(np.searchsorted(depth, grid), 1, len(depth) - 1)
+    left = right - 1
+    ix = np.where(np.abs(grid - depth[left]) <= np.abs(depth[right] - grid), left, right)
+    resampled = values.take(ix).astype(np.float64 if is_numeric else object)
+    resampled[np.abs(depth[ix] - grid) > get_sampling_step(depth)] = empty
+    return resampled
+
+
+class DepthFrame:
+    """Class keeps curves of several sources, e.g. logs, drilling data and FMI porosity.
+
+    Every source keeps its own depth sampling; curves are put on a common depth grid
+    only when requested, so sources are never merged on raw depth values.
+    """
+
+    def __init__(self) -> None:
+        self.sources: dict[str, tuple[NDArray, dict[str, NDArray]]] = {}
+        self.curve_sources: dict[str, str] = {}  # curve name to source name
+        self.frame: pd.DataFrame | None = None  # all curves on the finest grid, built on request
+
+    def add_source(self, name: str, depth: NDArray, curves: Mapping[str, NDArray]) -> None:
+        """Method to add or replace source of curves.
+
+        Args:
+            name: name of the source, e.g. "WELL_LOGGING"
+            depth: depth of the source samples
+            curves: curve name to values, all of the depth length
+
+        """
+        self.remove_source(name)
+        depth = np.asarray(depth, dtype=np.float64)
+        order = np.argsort(depth, kind="stable")
+        valid = np.isfinite(depth[order])
+        order = order[valid]
+        self.sources[name] = (depth[order], {curve: np.asarray(values)[order] for curve, values in curves.items()})
+        for curve in curves:
+            self.curve_sources[curve] = name
+
+    def add_table(self, name: str, df: pd.DataFrame, depth_col: str | None = None) -> None:
+        """Method to add source from the table with depth column, other numeric columns become curves.
+
+        Args:
+            name: name of the source
+            df: table with depth column
+            depth_col: name of the depth column; by default the column named as depth, or the first
+                column which is the index curve of .las file, e.g. DEPT
+
+        """
+        if depth_col is None:
+            depth_col = get_depth_column(df) or next(iter(df.columns), None)
+        if depth_col not in df or not pd.api.types.is_numeric_dtype(df[depth_col]):
+            raise ValueError(f"Table of source {name} has no numeric depth column {depth_col}")
+        curves = {
+            col: df[col].to_numpy()
+            for col in df.columns
+            if col != depth_col and pd.api.types.is_numeric_dtype(df[col])
+        }
+        self.add_source(name, df[depth_col].to_numpy(), curves)
+
+    def remove_source(self, name: str) -> None:
+        """Method to remove source and its curves."""
+        if self.sources.pop(name, None) is None:
+            return
+        self.curve_sources = {curve: source for curve, source in self.curve_sources.items() if source != name}
+        # curves of other sources with the same names become visible again
+        for source, (_, curves) in self.sources.items():
+            for curve in curves:
+                self.curve_sources.setdefault(curve, source)
+        self.frame = None
+
+    def get_curve_names(self) -> list[str]:
+        """Method to return names of all curves."""
+        return list(self.curve_sources)
+
+    def get_curve(self, curve: str) -> tuple[NDArray, NDArray]:
+        """Method to return native depth and values of the curve."""
+        depth, curves = self.sources[self.curve_sources[curve]]
+        return depth, curves[curve]
+
+    def get_source_name(self, curve: str) -> str:
+        """Method to return name of the source of the curve."""
+        return self.curve_sources[curve]
+
+    def resample(self, curve: str, grid: NDArray, mode: str = "linear") -> NDArray:
+        """Method to resample curve onto depth grid, see resample_curve for modes."""
+        depth, values = self.get_curve(curve)
+        return resample_curve(depth, values, grid, mode=mode)
+
+    def get_cross_plot_data(self, x_curve: str, y_curve: str, mode: str = "linear") -> pd.DataFrame:
+        """Method to put two curves on a common depth grid.
+
+        Only the two curves are resampled. The grid is native depth of the more finely sampled
+        curve, the other curve is resampled onto it; curves of one source are taken as is.
+
+        Args:
+            x_curve: curve for X axis
+            y_curve: curve for Y axis
+            mode: resampling mode for the coarser curve
+
+        Returns: dataframe with DEPTH and both curves
+
+        """
+        x_depth, x_values = self.get_curve(x_curve)
+        y_depth, y_values = self.get_curve(y_curve)
+        if self.get_source_name(x_curve) == self.get_source_name(y_curve):
+            return pd.DataFrame({"DEPTH": x_depth, x_curve: x_values, y_curve: y_values})
+        if get_sampling_step(x_depth) <= get_sampling_step(y_depth):
+            return pd.DataFrame({"DEPTH": x_depth, x_curve: x_values, y_curve: self.resample(y_curve, x_depth, mode)})
+        return pd.DataFrame({"DEPTH": y_depth, x_curve: self.resample(x_curve, y_depth, mode), y_curve: y_values})
+
+    def get_grid(self) -> NDArray:
+        """Method to return grid covering all sources with the finest sampling step among them."""
+        depths = [depth for depth, _ in self.sources.values() if len(depth)]
+        if not depths:
+            return np.empty(0)
+        step = min(get_sampling_step(depth) for depth in depths)
+        top, bottom = min(depth[0] for depth in depths), max(depth[-1] for depth in depths)
+        if not np.isfinite(step) or step <= 0:
+            return np.unique(np.concatenate(depths))
+        return top + np.arange(int(np.floor((bottom - top) / step)) + 1) * step
+
+    def get_frame(self, mode: str = "linear") -> pd.DataFrame:
+        """Method to return all curves on the common grid, the table is built once until sources change."""
+        if self.frame is None:
+            grid = self.get_grid()
+            self.frame = pd.DataFrame(
+                {"DEPTH": grid, **{curve: self.resample(curve, grid, mode) for curve in self.curve_sources}},
+            )
+        return self.frame
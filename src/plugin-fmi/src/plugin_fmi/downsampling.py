@@ -0,0 +1,92 @@
+"""Module to downsample log curves for display keeping their shape."""
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .constants import CURVE_DOWNSAMPLING
+
+
+def get_minmax_indices(values: NDArray, n_out: int) -> NDArray:
+    """Method to return indices of minimum and maximum of every bucket of samples.
+
+    Every spike stays visible, as a pixel row of the track shows the range of samples within it.
+
+    Args:
+        values: 1d curve
+        n_out: maximum N of samples to keep
+
+    Returns: sorted indices of kept samples
+
+    """
+    n_buckets = max(n_out // 2, 1)
+    bucket_size = -(-len(values) // n_buckets)
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[: len(values)] = values
+    buckets = padded.reshape(n_buckets, bucket_size)
+    # buckets without valid samples keep their first sample so the gap is drawn
+    is_empty = np.isnan(buckets).all(axis=1)
+    filled = np.where(is_empty[:, None], 0, buckets)
+    offsets = np.arange(n_buckets) * bucket_size
+    indices = np.concatenate([offsets + np.nanargmin(filled, axis=1), offsets + np.nanargmax(filled, axis=1)])
+    return np.unique(indices[indices < len(values)])
+
+
+def get_lttb_indices(depth: NDArray, values: NDArray, n_out: int) -> NDArray:
+    """Method to select samples with largest triangle three buckets algorithm.
+
+    Args:
+        depth: 1d sorted depth
+        values: 1d curve without NaN
+        n_out: N of samples to keep, at least 3
+
+    Returns: sorted indices of kept samples
+
+    """
+    n_out = max(n_out, 3)
+    edges = np.linspace(1, len(values) - 1, n_out - 1).astype(np.int64)
+    indices = np.empty(n_out, dtype=np.int64)
+    indices[0], indices[-1] = 0, len(values) - 1
+    for i in range(n_out - 2):
+        start, stop = edges[i], max(edges[i + 1], edges[i] + 1)
+        next_stop = edges[i + 2] if i + 2 < len(edges) else len(values)
+        # mean of the next bucket is the third point of the triangle
+        next_depth = depth[stop:next_stop].mean() if next_stop > stop else depth[-1]
+        next_value = values[stop:next_stop].mean() if next_stop > stop else values[-1]
+        prev_depth, prev_value = depth[indices[i]], values[indices[i]]
+        areas = np.abs(
+            (prev_depth - next_depth) * (values[start:stop] - prev_value)
+            - (prev_depth - depth[start:stop]) * (next_value - prev_value),
+        )
+        indices[i + 1] = start + np.argmax(areas)
+    return indices
+
+
+def downsample_curve(
+    depth: NDArray,
+    values: NDArray,
+    n_out: int,
+    method: str = CURVE_DOWNSAMPLING,
+) -> tuple[NDArray, NDArray]:
+    """Method to downsample curve to about n_out samples for display.
+
+    Args:
+        depth: 1d sorted depth
+        values: 1d curve
+        n_out: N of samples to keep, about twice the pixel height of the track
+        method: "minmax" or "lttb", NaN samples are dropped before lttb
+
+    Returns: depth and values of kept samples
+
+    """
+    depth, values = np.asarray(depth), np.asarray(values, dtype=np.float64)
+    if len(values) <= n_out:
+        return depth, values
+    if method == "lttb":
+        valid = ~np.isnan(values)
+        depth, values = depth[valid], values[valid]
+        if len(values) <= n_out:
+            return depth, values
+        indices = get_lttb_indices(depth, values, n_out)
+    else:
+        indices = get_minmax_indices(values, n_out)
+    return depth[indices], values[indices]
@@ -0,0 +1,82 @@
+"""Module to export segmentation results, shared by the widget and the batch CLI."""
+
+from pathlib import Path
+
+import pandas as pd
+from numpy.typing import NDArray
+
+
+def init_results_folders(path_to_results: Path) -> tuple[Path, Path]:
+    """Method to create folders for .xlsx files and segmentation images.
+
+    Args:
+        path_to_results: folder selected to store results
+
+    Returns: paths to folders for .xlsx files and for images
+
+    """
+    path_xlsx_files = path_to_results / "excel_files"
+    path_img_files = path_to_results / "segmentation_results"
+    path_xlsx_files.resolve().mkdir(exist_ok=True, parents=True)
+    path_img_files.resolve().mkdir(exist_ok=True, parents=True)
+    return path_xlsx_files, path_img_files
+
+
+def get_export_name(path_to_file: Path, threshold: int | str, channel: str | None = None) -> str:
+    """Method to return base name of exported files.
+
+    Args:
+        path_to_file: path to FMI file
+        threshold: threshold used for segmentation, or tag such as "sweep"
+        channel: channel name, added when several channels of the file are exported
+
+    Returns: name without extension
+
+    """
+    file_name = path_to_file.name.split(".")[0]
+    if channel is None:
+        return f"{file_name}_{threshold}"
+    return f"{file_name}_{channel}_{threshold}"
+
+
+def save_whashout_curve(path_to_export: Path, depth: NDArray, whashout_curve: NDArray, width: int) -> None:
+    """Method to save whashout curve to .xlsx file.
+
+    Args:
+        path_to_export: path to .xlsx file
+        depth: depth of every row
+        whashout_curve: output of get_whashout_curve
+        width: width of the image to normalize the curve
+
+    """
+    df_results = pd.DataFrame(
+        {
+            "Depth": depth,
+            "Whashout": whashout_curve[:, 1] / width,
+        },
+    )
+    df_results.to_excel(path_to_export.resolve(), index=False)
+
+
+def save_whashout_sweep(path_to_export: Path, depth: NDArray, sweep: NDArray, thresholds: list[int], width: int) -> None:
+    """Method to save whashout curves for several thresholds to .xlsx file, one column per threshold.
+
+    Args:
+        path_to_export: path to .xlsx file
+        depth: depth of every row
+        sweep: output of get_whashout_sweep
+        thresholds: thresholds of the sweep columns
+        width: width of the image to normalize the curves
+
+    """
+    df_results = pd.DataFrame(sweep / width, columns=[f"Whashout_{threshold}" for threshold in thresholds])
+    df_results.insert(0, "Depth", depth)
+    df_results.to_excel(path_to_export.resolve(), index=False)
+
+
+def save_mask(path_to_save: Path, mask: NDArray) -> None:
+    """Method to save mask to .png file."""
+    # opencv is heavy to import and is needed only for export
+    import cv2
+
+    cv2.imwrite(str(path_to_save.resolve()), mask)
@@ -0,0 +1,250 @@
+"""Module to build persistent metadata index for the folder with FMI files."""
+
+import json
+import threading
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from contextlib import suppress
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .constants import FOLDER_INDEX_BINS, FOLDER_INDEX_NAME, FOLDER_INDEX_PERCENTILES, FOLDER_INDEX_WORKERS
+from .storage import FMIStore, find_store
+
+
+INDEX_VERSION: int = 1
+# index is saved by the folder worker and by workers indexing opened files, one at a time
+INDEX_LOCK = threading.Lock()
+
+
+def iter_channel_chunks(data: FMIStore | dict, key: str) -> Iterator[NDArray]:
+    """Method to iterate over channel by chunks of rows, store is decoded chunk by chunk."""
+    if isinstance(data, FMIStore):
+        for ix in range(data.channels[key]["n_chunks"]):
+            yield data.read_chunk(key, ix)
+    else:
+        yield np.asarray(data[key])
+
+
+def compute_channel_stats(data: FMIStore | dict, key: str) -> dict:
+    """Method to compute value statistics of the channel in two streaming passes.
+
+    Percentiles are interpolated from the histogram, so the channel is never held
+    in memory as a whole when it comes from the store.
+
+    Args:
+        data: opened store or dict loaded from pickle
+        key: channel name
+
+    Returns: dict with min, max, percentiles and histogram of finite values
+
+    """
+    v_min, v_max, n_valid = np.inf, -np.inf, 0
+    for chunk in iter_channel_chunks(data, key):
+        finite = chunk[np.isfinite(chunk)]
+        if finite.size:
+            v_min, v_max = min(v_min, finite.min()), max(v_max, finite.max())
+            n_valid += finite.size
+    if not n_valid:
+        return {"min": None, "max": None, "percentiles": {}, "histogram": {"edges": [], "counts": []}}
+    edges = np.linspace(v_min, v_max, FOLDER_INDEX_BINS + 1)
+    counts = np.zeros(FOLDER_INDEX_BINS, dtype=np.int64)
+    for chunk in iter_channel_chunks(data, key):
+        counts += np.histogram(chunk[np.isfinite(chunk)], bins=edges)[0]
+    cdf = np.concatenate(([0], np.cumsum(counts))) / n_valid
+    percentiles = {str(q): float(np.interp(q / 100, cdf, edges)) for q in FOLDER_INDEX_PERCENTILES}
+    return {
+        "min": float(v_min),
+        "max": float(v_max),
+        "percentiles": percentiles,
+        "histogram": {"edges": edges.tolist(), "counts": counts.tolist()},
+    }
+
+
+def index_data(data: Mapping, path_to_file: Path, depth_key: str = "DEPT") -> dict:
+    """Method to collect metadata of one opened FMI file.
+
+    Store is read chunk by chunk, channels of opened pickle are taken as they are.
+
+    Args:
+        data: opened store or mapping of channels
+        path_to_file: path to pickle
+        depth_key: name of the depth channel
+
+    Returns: index entry for the file
+
+    """
+    stat = path_to_file.stat()
+    entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "depth": None, "channels": {}}
+    if depth_key in data:
+        depth = np.asarray(data[depth_key], dtype=np.float64)
+        if depth.size:
+            entry["depth"] = {
+                "top": float(np.nanmin(depth)),
+                "bottom": float(np.nanmax(depth)),
+                "sampling": float(np.nanmedian(np.abs(np.diff(depth)))) if depth.size > 1 else None,
+            }
+    for key in data:
+        if key == depth_key:
+            continue
+        if isinstance(data, FMIStore):
+            shape, dtype = data.shape(key), data.dtype(key)
+        else:
+            array = np.asarray(data[key])
+            if not array.ndim or array.dtype.kind not in "biuf":
+                continue
+            shape, dtype = array.shape, array.dtype
+        entry["channels"][key] = {"shape": list(shape), "dtype": dtype.str, **compute_channel_stats(data, key)}
+    return entry
+
+
+def index_file(path_to_file: Path, depth_key: str = "DEPT") -> dict | None:
+    """Method to collect metadata of one FMI file from its store.
+
+    Pickle is not decoded just to be indexed, it is indexed by index_opened_file once opened.
+
+    Args:
+        path_to_file: path to pickle
+        depth_key: name of the depth channel
+
+    Returns: index entry for the file, None if the file has no store or the store can not be read
+
+    """
+    path_to_store = find_store(path_to_file)
+    if path_to_store is None:
+        return None
+    # broken file is left unindexed, the error is shown once the file is opened
+    try:
+        return index_data(FMIStore(path_to_store), path_to_file, depth_key=depth_key)
+    except Exception:  # noqa: BLE001
+        return None
+
+
+def index_opened_file(
+    path_to_folder: Path,
+    path_to_file: Path,
+    data: Mapping,
+    depth_key: str = "DEPT",
+) -> tuple[Path, dict | None]:
+    """Method to index file opened for display and add it to saved index of the folder.
+
+    Args:
+        path_to_folder: path to folder
+        path_to_file: path to pickle
+        data: opened file, its channels are read through the channel cache
+        depth_key: name of the depth channel
+
+    Returns: path to file and its index entry, None if the file can not be indexed
+
+    """
+    try:
+        entry = index_data(data, path_to_file, depth_key=depth_key)
+    except Exception:  # noqa: BLE001
+        return path_to_file, None
+    update_folder_index(path_to_folder, {path_to_file.name: entry})
+    return path_to_file, entry
+
+
+def read_folder_index(path_to_folder: Path) -> dict:
+    """Method to read saved index of the folder."""
+    with suppress(OSError, ValueError):
+        index = json.loads((path_to_folder / FOLDER_INDEX_NAME).read_text())
+        if index.get("version") == INDEX_VERSION:
+            return index
+    return {"version": INDEX_VERSION, "files": {}}
+
+
+def write_folder_index(path_to_folder: Path, entries: dict[str, dict]) -> None:
+    """Method to save index of the folder, read-only folder is left without index.
+
+    Index is written to temporary file first, so readers never see partially written index.
+    """
+    path_to_index = path_to_folder / FOLDER_INDEX_NAME
+    path_to_index_tmp = path_to_folder / f"{FOLDER_INDEX_NAME}.tmp"
+    with suppress(OSError):
+        path_to_index_tmp.write_text(json.dumps({"version": INDEX_VERSION, "files": entries}))
+        path_to_index_tmp.replace(path_to_index)
+
+
+def update_folder_index(path_to_folder: Path, entries: dict[str, dict], files: list[Path] | None = None) -> None:
+    """Method to merge entries into saved index of the folder.
+
+    Index is read and written under the lock, so entries saved by other workers in the meantime are kept.
+
+    Args:
+        path_to_folder: path to folder
+        entries: dict of file name to index entry
+        files: FMI files within the folder, entries of other files are dropped; None to keep all of them
+
+    """
+    with INDEX_LOCK:
+        merged = {**read_folder_index(path_to_folder)["files"], **entries}
+        if files is not None:
+            names = {path_to_file.name for path_to_file in files}
+            merged = {name: entry for name, entry in merged.items() if name in names}
+        write_folder_index(path_to_folder, merged)
+
+
+def iter_folder_index(
+    path_to_folder: Path,
+    files: list[Path],
+    max_workers: int = FOLDER_INDEX_WORKERS,
+) -> Iterator[tuple[Path, dict | None]]:
+    """Method to build or refresh index of the folder, yielding entries as they are ready.
+
+    Only new or modified files are indexed, in parallel; entries of removed files are dropped.
+    Index is saved once all files are processed, so stopped iteration leaves the saved index as it was.
+    Entries are merged into the saved index, entries of files indexed on opening in the meantime are kept.
+
+    Args:
+        path_to_folder: path to folder
+        files: FMI files within the folder
+        max_workers: N of worker threads
+
+    Yields: path to file and its index entry, None for the files which are not indexed
+
+    """
+    index = read_folder_index(path_to_folder)
+    entries: dict[str, dict] = {}
+    outdated = []
+    for path_to_file in files:
+        entry = index["files"].get(path_to_file.name)
+        with suppress(OSError):
+            stat = path_to_file.stat()
+            if entry is not None and entry["size"] == stat.st_size and entry["mtime_ns"] == stat.st_mtime_ns:
+                entries[path_to_file.name] = entry
+                yield path_to_file, entry
+                continue
+        outdated.append(path_to_file)
+    if outdated:
+        executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fmi-index")
+        try:
+            futures = {executor.submit(index_file, path_to_file): path_to_file for path_to_file in outdated}
+            for future in as_completed(futures):
+                path_to_file, entry = futures[future], future.result()
+                if entry is not None:
+                    entries[path_to_file.name] = entry
+                yield path_to_file, entry
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+    if entries != index["files"]:
+        update_folder_index(path_to_folder, entries, files=files)
+
+
+def build_folder_index(
+    path_to_folder: Path,
+    files: list[Path],
+    max_workers: int = FOLDER_INDEX_WORKERS,
+) -> dict[str, dict]:
+    """Method to build or refresh index of the folder, see iter_folder_index.
+
+    Returns: dict of file name to index entry for the indexed files
+
+    """
+    return {
+        path_to_file.name: entry
+        for path_to_file, entry in iter_folder_index(path_to_folder, files, max_workers=max_workers)
+        if entry is not None
+    }
@@ -0,0 +1,82 @@
+"""Module to keep formation tops as depth intervals."""
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+
+class FormationIntervals:
+    """Class keeps formation tops as sorted intervals with categorical formation codes.
+
+    Formation at any depth is found by binary search over the tops, so neither
+    the log view nor the cross plot needs formations expanded on a depth grid.
+    """
+
+    def __init__(self, tops: NDArray, bottoms: NDArray, formations: NDArray) -> None:
+        order = np.argsort(tops, kind="stable")
+        self.tops: NDArray = np.asarray(tops, dtype=np.float64)[order]
+        self.bottoms: NDArray = np.asarray(bottoms, dtype=np.float64)[order]
+        # codes index names, names are in order of the first appearance from the top
+        self.codes, self.names = pd.factorize(np.asarray(formations, dtype=object)[order])
+        self.names: NDArray = np.asarray(self.names, dtype=object)
+
+    @classmethod
+    def from_table(
+        cls,
+        df_tops: pd.DataFrame,
+        col_top: str = "TOP",
+        col_bottom: str = "BOTTOM",
+        col_formation: str = "FORMATION",
+    ) -> "FormationIntervals":
+        """Method to create intervals from the table returned by load_formation_tops.
+
+        Args:
+            df_tops: table with tops, bottoms and formation names
+            col_top: column with tops
+            col_bottom: column with bottoms, the next top is used where it is missing
+            col_formation: column with formation names
+
+        Returns: formation intervals
+
+        """
+        df_tops = df_tops.dropna(subset=[col_top, col_formation]).sort_values(col_top)
+        tops = df_tops[col_top].to_numpy(dtype=np.float64)
+        bottoms = (
+            df_tops[col_bottom].to_numpy(dtype=np.float64) if col_bottom in df_tops else np.full(len(tops), np.nan)
+        )
+        next_tops = np.append(tops[1:], np.inf)
+        bottoms = np.where(np.isnan(bottoms), next_tops, bottoms)
+        return cls(tops, bottoms, df_tops[col_formation].to_numpy())
+
+    def __len__(self) -> int:
+        return len(self.tops)
+
+    def lookup_codes(self, depth: NDArray) -> NDArray:
+        """Method to return formation codes at the depths, -1 outside of the intervals."""
+        depth = np.asarray(depth, dtype=np.float64)
+        ix = np.searchsorted(self.tops, depth, side="right") - 1
+        inside = (ix >= 0) & (depth < self.bottoms[np.maximum(ix, 0)])
+        return np.where(inside, self.codes[np.maximum(ix, 0)], -1)
+
+    def lookup(self, depth: NDArray) -> NDArray:
+        """Method to return formation names at the depths, None outside of the intervals."""
+        codes = self.lookup_codes(depth)
+        names = np.append(self.names, None)
+        # code -1 takes the trailing None
+        return names[codes]
+
+    def get_intervals(self, bottom_limit: float | None = None) -> pd.DataFrame:
+        """Method to return intervals for visualization.
+
+        Args:
+            bottom_limit: depth to cut the bottoms at, e.g. the bottom of the logged interval,
+                as the last formation is open ended
+
+        Returns: dataframe with TOP, BOTTOM and FORMATION columns
+
+        """
+        bottoms = self.bottoms if bottom_limit is None else np.minimum(self.bottoms, bottom_limit)
+        keep = bottoms > self.tops
+        return pd.DataFrame(
+            {"TOP": self.tops[keep], "BOTTOM": bottoms[keep], "FORMATION": self.names[self.codes[keep]]},
+        )
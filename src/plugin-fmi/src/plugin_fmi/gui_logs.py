@@ -5,6 +5,7 @@ from qtpy.QtCore import Qt
 from qtpy.QtGui import QFont
 from qtpy.QtWidgets import (
     QButtonGroup,
+    QCheckBox,
     QComboBox,
     QHBoxLayout,
     QLabel,
@@ -174,6 +175,12 @@ class LogsBase(QMainWindow):
         self.drilling_logs_to_plot.setFont(self.get_font(size=10))
         self.left_layout.addWidget(self.drilling_logs_to_plot)
 
+        # checkbox to add track with whashout curves for a range of thresholds
+        self.checkbox_threshold_sweep = QCheckBox("Whashout vs threshold track")
+        self.checkbox_threshold_sweep.setFont(self.get_font(size=10))
+        self.set_font_color(self.checkbox_threshold_sweep, color="white")
+        self.left_layout.addWidget(self.checkbox_threshold_sweep)
+
     def setup_logview_tab(self) -> None:
         """Setup the Layout tab content."""
         self.logview_tab_layout = QVBoxLayout()
@@ -333,8 +340,10 @@ class LogsBase(QMainWindow):
             self.logs_to_plot.hide()
             self.label_select_drilling.hide()
             self.drilling_logs_to_plot.hide()
+            self.checkbox_threshold_sweep.hide()
         else:
             self.label_select_logs.show()
             self.logs_to_plot.show()
             self.label_select_drilling.show()
             self.drilling_logs_to_plot.show()
+            self.checkbox_threshold_sweep.show()
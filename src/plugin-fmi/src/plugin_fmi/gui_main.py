@@ -6,6 +6,7 @@ from napari.viewer import Viewer
 from qtpy.QtCore import Qt
 from qtpy.QtGui import QFont
 from qtpy.QtWidgets import (
+    QCheckBox,
     QFormLayout,
     QHBoxLayout,
     QLabel,
@@ -18,9 +19,6 @@ from qtpy.QtWidgets import (
 )
 from superqt import QCollapsible, QLabeledSlider
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-
 import os
 from pathlib import Path
 
@@ -124,9 +122,11 @@ class FMIProcessorBase(QWidget):
 
         # table for showing images within the folder
         self.tableWidget = QTableWidget()
-        self.tableWidget.setColumnCount(1)
-        self.tableWidget.setHorizontalHeaderLabels(["FMI files"])
+        self.tableWidget.setColumnCount(3)
+        self.tableWidget.setHorizontalHeaderLabels(["FMI files", "Channels", "Depth range"])
         self.tableWidget.setColumnWidth(0, 300)
+        self.tableWidget.setColumnWidth(1, 150)
+        self.tableWidget.setColumnWidth(2, 150)
         self.tableWidget.setEditTriggers(QTableWidget.NoEditTriggers)
         self.tableWidget.setCornerButtonEnabled(False)
         # specify style of the table
@@ -212,6 +212,11 @@ class FMIProcessorBase(QWidget):
         layout_aspect_ratio.addWidget(self.aspect_ratio_label)
         layout_aspect_ratio.addWidget(self.slider_aspect_ratio)
         self.layout.addLayout(layout_aspect_ratio)
+
+        # checkbox to show image as multiscale pyramid
+        self.checkbox_multiscale = QCheckBox("Multiscale pyramid for long images")
+        self.checkbox_multiscale.setFont(self.get_font(size=10, italic=True))
+        self.layout.addWidget(self.checkbox_multiscale)
         self.add_spacer()
 
         # button to save results
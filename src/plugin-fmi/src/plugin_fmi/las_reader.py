@@ -0,0 +1,233 @@
+"""Module with vectorized reader for LAS 2.0 files."""
+
+import io
+import re
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+SECTION_PATTERN = re.compile(r"^~(\w)", re.MULTILINE)
+ITEM_PATTERN = re.compile(r"^\s*([^.#\s~][^.]*?)?\s*\.(\S*)\s*(.*):(.*)$")
+# extra rows parsed around the depth window computed from STRT / STEP
+WINDOW_MARGIN_ROWS: int = 2
+
+
+class LASFormatError(ValueError):
+    """Raised when the file can not be parsed by the vectorized reader."""
+
+
+def read_text(path_to_file: Path) -> str:
+    """Method to read the file as text, falling back to latin-1 for legacy files."""
+    raw = Path(path_to_file).read_bytes()
+    try:
+        return raw.decode("utf-8")
+    except UnicodeDecodeError:
+        return raw.decode("latin-1")
+
+
+def parse_section_items(text: str) -> dict[str, str]:
+    """Method to parse `MNEM.UNIT VALUE : DESCRIPTION` lines of header section."""
+    items = {}
+    for line in text.splitlines()[1:]:
+        match = ITEM_PATTERN.match(line)
+        if match:
+            items[(match.group(1) or "").strip().upper()] = match.group(3).strip()
+    return items
+
+
+def parse_curve_names(text: str) -> list[str]:
+    """Method to parse curve mnemonics from ~C section, duplicates are numbered as in lasio."""
+    names = []
+    for line in text.splitlines()[1:]:
+        match = ITEM_PATTERN.match(line)
+        if match:
+            names.append((match.group(1) or "").strip() or "UNKNOWN")
+    counts = {name: names.count(name) for name in names}
+    seen: dict[str, int] = {}
+    unique_names = []
+    for name in names:
+        if counts[name] > 1:
+            seen[name] = seen.get(name, 0) + 1
+            name = f"{name}:{seen[name]}"
+        unique_names.append(name)
+    return unique_names
+
+
+def split_sections(text: str) -> dict[str, tuple[int, int]]:
+    """Method to return start and end offsets for every section of the file."""
+    matches = list(SECTION_PATTERN.finditer(text))
+    sections = {}
+    for ix, match in enumerate(matches):
+        end = matches[ix + 1].start() if ix + 1 < len(matches) else len(text)
+        sections.setdefault(match.group(1).upper(), (match.start(), end))
+    return sections
+
+
+def read_las_header(path_to_file: Path) -> dict:
+    """Method to read header of LAS file without parsing the data.
+
+    Args:
+        path_to_file: path to las
+
+    Returns: dict with curves, null value, wrap flag, start / step of depth and data text
+
+    """
+    text = read_text(path_to_file)
+    sections = split_sections(text)
+    if "A" not in sections or "C" not in sections:
+        raise LASFormatError("File has no ~C or ~A section")
+    version = parse_section_items(text[slice(*sections["V"])]) if "V" in sections else {}
+    well = parse_section_items(text[slice(*sections["W"])]) if "W" in sections else {}
+    data_start, data_end = sections["A"]
+    return {
+        "curves": parse_curve_names(text[slice(*sections["C"])]),
+        "wrap": version.get("WRAP", "NO").upper().startswith("Y"),
+        "null": to_float(well.get("NULL")),
+        "start": to_float(well.get("STRT")),
+        "step": to_float(well.get("STEP")),
+        # data begins on the line after ~A
+        "data": text[text.find("\n", data_start, data_end) + 1 : data_end],
+    }
+
+
+def to_float(value: str | None) -> float | None:
+    """Method to convert header value to float."""
+    if value is None:
+        return None
+    try:
+        return float(value.split()[0])
+    except (ValueError, IndexError):
+        return None
+
+
+def count_columns(data: str) -> int:
+    """Method to count values within the first data line."""
+    for line in data.splitlines():
+        line = line.strip()
+        if line and not line.startswith("#"):
+            return len(line.split())
+    return 0
+
+
+def get_row_window(header: dict, depth_range: tuple[float, float]) -> tuple[int, int | None]:
+    """Method to compute rows to skip and to read from STRT / STEP for the depth window."""
+    start, step = header["start"], header["step"]
+    if start is None or not step:
+        return 0, None
+    rows = sorted((depth - start) / step for depth in depth_range)
+    first = max(int(np.floor(rows[0])) - WINDOW_MARGIN_ROWS, 0)
+    last = int(np.ceil(rows[1])) + WINDOW_MARGIN_ROWS
+    return first, last - first + 1
+
+
+def parse_data(header: dict, usecols: list[int], skiprows: int = 0, max_rows: int | None = None) -> np.ndarray:
+    """Method to parse ~A section with the C parser of NumPy.
+
+    Raises:
+        LASFormatError: data is not a plain numeric table with one row per depth
+
+    """
+    try:
+        data = np.loadtxt(
+            io.StringIO(header["data"]),
+            dtype=np.float64,
+            comments="#",
+            usecols=usecols,
+            skiprows=skiprows,
+            max_rows=max_rows,
+            ndmin=2,
+        )
+    except ValueError as e:
+        raise LASFormatError(str(e)) from e
+    if header["null"] is not None:
+        data[data == header["null"]] = np.nan
+    return data
+
+
+def read_las_fast(
+    path_to_file: Path,
+    curves: list[str] | None = None,
+    depth_range: tuple[float, float] | None = None,
+) -> pd.DataFrame:
+    """Method to read LAS file with NumPy bulk text parsing.
+
+    Only requested curves are converted, depth window is mapped to rows with STRT / STEP,
+    so lines outside the window are not parsed at all.
+
+    Args:
+        path_to_file: path to las
+        curves: curves to read, depth curve is always included
+        depth_range: (top, bottom) depth window
+
+    Returns: dataframe with depth column first, as lasio.read(...).df().reset_index()
+
+    Raises:
+        LASFormatError: file is wrapped or has irregular data section
+
+    """
+    header = read_las_header(path_to_file)
+    if header["wrap"]:
+        raise LASFormatError("Wrapped files are not supported")
+    names: list[str] = header["curves"]
+    selected = names if curves is None else [names[0]] + [name for name in names[1:] if name in curves]
+    usecols = [names.index(name) for name in selected]
+    if count_columns(header["data"]) != len(names):
+        raise LASFormatError("Number of values does not match number of curves")
+
+    data = None
+    if depth_range is not None:
+        skiprows, max_rows = get_row_window(header, depth_range)
+        if max_rows is not None:
+            data = parse_data(header, usecols, skiprows=skiprows, max_rows=max_rows)
+            expected_depth = header["start"] + skiprows * header["step"]
+            # header does not describe the data, fall back to full parse
+            if not len(data) or not np.isclose(data[0, 0], expected_depth):
+                data = None
+    if data is None:
+        data = parse_data(header, usecols)
+    df_las = pd.DataFrame(data, columns=selected)
+    if depth_range is not None:
+        top, bottom = sorted(depth_range)
+        df_las = df_las[df_las[selected[0]].between(top, bottom)].reset_index(drop=True)
+    return df_las
+
+
+def read_las_lasio(
+    path_to_file: Path,
+    curves: list[str] | None = None,
+    depth_range: tuple[float, float] | None = None,
+) -> pd.DataFrame:
+    """Method to read LAS file with lasio, used for files the fast reader does not support."""
+    # lasio is imported only for the fallback, the fast reader does not need it
+    import lasio
+
+    df_las = lasio.read(path_to_file).df().reset_index(drop=False)
+    if curves is not None:
+        df_las = df_las[[df_las.columns[0]] + [col for col in df_las.columns[1:] if col in curves]]
+    if depth_range is not None:
+        top, bottom = sorted(depth_range)
+        df_las = df_las[df_las.iloc[:, 0].between(top, bottom)].reset_index(drop=True)
+    return df_las
+
+
+def read_las(
+    path_to_file: Path,
+    curves: list[str] | None = None,
+    depth_range: tuple[float, float] | None = None,
+) -> pd.DataFrame:
+    """Method to read LAS file with the fast reader and lasio as a fallback.
+
+    Args:
+        path_to_file: path to las
+        curves: curves to read, depth curve is always included
+        depth_range: (top, bottom) depth window
+
+    Returns: pandas dataframe with logs
+
+    """
+    try:
+        return read_las_fast(path_to_file, curves=curves, depth_range=depth_range)
+    except LASFormatError:
+        return read_las_lasio(path_to_file, curves=curves, depth_range=depth_range)
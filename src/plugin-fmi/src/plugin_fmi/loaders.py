@@ -1,12 +1,14 @@
 """Module to load FMI files."""
 
+from collections.abc import Mapping
 from pathlib import Path
 
-import lasio
 import pandas as pd
-from openpyxl.utils.exceptions import InvalidFileException
 
 from .constants import N_COLS_FORMATION_TOPS
+from .las_reader import LASFormatError, read_las, read_las_header
+from .sidecar import read_sidecar, write_sidecar
+from .storage import FMIStore, find_store
 
 
 def get_available_files(path_to_folder: Path, file_format: str = ".pkl") -> list[Path]:
@@ -33,23 +35,70 @@ def load_fmi_pickle(path_to_file: Path) -> dict:
     return pd.read_pickle(path_to_file)
 
 
-def load_las(file_path: str) -> pd.DataFrame:
+def load_fmi_file(path_to_file: Path) -> Mapping:
+    """Method to open FMI file, preferring the chunked store over the pickle.
+
+    Args:
+        path_to_file: path to pickle or to store directory
+
+    Returns: mapping of channel name to array
+
+    """
+    path_to_store = find_store(path_to_file)
+    if path_to_store is not None:
+        return FMIStore(path_to_store)
+    return load_fmi_pickle(path_to_file)
+
+
+def load_las(
+    file_path: str,
+    curves: list[str] | None = None,
+    depth_range: tuple[float, float] | None = None,
+) -> pd.DataFrame:
     """Method to load las file.
 
     Args:
         file_path: path to las
+        curves: curves to load, by default all of them
+        depth_range: (top, bottom) depth window to load
 
     Returns: pandas dataframe with logs
 
     """
-    # Check if the file exists
-    return lasio.read(file_path).df().reset_index(drop=False)
+    path_to_file = Path(file_path)
+    df_las = read_sidecar(path_to_file, kind="las", columns=curves, keep_first_column=True)
+    if df_las is None:
+        # whole file is parsed once, later loads read only requested columns from the sidecar
+        df_las = read_las(path_to_file)
+        write_sidecar(path_to_file, kind="las", df=df_las)
+        if curves is not None:
+            df_las = df_las[[df_las.columns[0]] + [col for col in df_las.columns[1:] if col in curves]]
+    if depth_range is not None:
+        top, bottom = sorted(depth_range)
+        df_las = df_las[df_las.iloc[:, 0].between(top, bottom)].reset_index(drop=True)
+    return df_las
+
+
+def get_las_curves(file_path: str) -> list[str]:
+    """Method to list curves of las file reading only its header, curves are loaded later by load_las."""
+    path_to_file = Path(file_path)
+    try:
+        return read_las_header(path_to_file)["curves"]
+    except LASFormatError:
+        return list(load_las(path_to_file).columns)
 
 
 def load_formation_tops(path: Path) -> (pd.DataFrame, str):
     """Method to load formation tops data from xlsx file."""
     # get file name
     file_name = path.name
+    # take parsed table from the sidecar if the workbook was not changed
+    df_cached = read_sidecar(path, kind="tops")
+    if df_cached is not None:
+        return df_cached, ""
+    # openpyxl is imported only when a workbook is parsed
+    from openpyxl.utils.exceptions import InvalidFileException
+
     # try to open file
     try:
         df_form = pd.read_excel(path)
@@ -81,4 +130,5 @@ def load_formation_tops(path: Path) -> (pd.DataFrame, str):
     # generate BOTTOM AND WELL columns
     df_filtered["BOTTOM"] = df_filtered.TOP.shift(-1)
     df_filtered["BOTTOM"].iloc[-1] = df_filtered.TOP.iloc[-1] + 20000
+    write_sidecar(path, kind="tops", df=df_filtered)
     return df_filtered, ""
@@ -0,0 +1,29 @@
+"""Module with numba kernels, imported on the first use as compiling them needs numba."""
+
+import numpy as np
+from numba import njit, prange
+from numpy.typing import NDArray
+
+
+def segment_rows_loops(fmi_image: NDArray, threshold: float, encoded_none: float) -> tuple[NDArray, ...]:
+    """Method with the same output as processing.segment_rows_numpy written as loops for numba compilation."""
+    height, width = fmi_image.shape
+    fmi_mask = np.empty((height, width), dtype=np.bool_)
+    counts = np.empty(height, dtype=np.int64)
+    porous_counts = np.empty(height, dtype=np.int64)
+    valid_counts = np.empty(height, dtype=np.int64)
+    for i in prange(height):
+        n_below, n_porous, n_valid = 0, 0, 0
+        for j in range(width):
+            value = fmi_image[i, j]
+            below = value < threshold
+            fmi_mask[i, j] = below
+            n_below += below
+            if value > encoded_none:
+                n_valid += 1
+                n_porous += below
+        counts[i], porous_counts[i], valid_counts[i] = n_below, n_porous, n_valid
+    return fmi_mask, counts, porous_counts, valid_counts
+
+
+segment_rows_numba = njit(parallel=True, cache=True)(segment_rows_loops)
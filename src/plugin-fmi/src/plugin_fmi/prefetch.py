@@ -0,0 +1,86 @@
+"""Module to prefetch neighbouring FMI files in background."""
+
+import threading
+from collections.abc import Callable, Mapping
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+from .constants import PREFETCH_DEPTH, PREFETCH_WORKERS
+
+
+class FilePrefetcher:
+    """Class to load files around the current one on worker threads.
+
+    Loaded files are kept until navigation moves away from them, so next / previous
+    buttons take an already decoded file instead of reading it on the Qt thread.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[Path], Mapping],
+        depth: int = PREFETCH_DEPTH,
+        max_workers: int = PREFETCH_WORKERS,
+    ) -> None:
+        self.loader = loader
+        self.depth = depth
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="fmi-prefetch")
+        self.futures: dict[Path, Future] = {}
+        self.lock = threading.Lock()
+
+    def warm_file(self, path_to_file: Path, channel: str | None) -> Mapping:
+        """Method to load file and decode the channel which will be shown."""
+        data = self.loader(path_to_file)
+        if channel is not None and channel in data:
+            data[channel]
+        return data
+
+    def load(self, path_to_file: Path) -> Mapping:
+        """Method to return the file, waiting for prefetch if it is in flight.
+
+        Args:
+            path_to_file: path to file
+
+        Returns: loaded file
+
+        """
+        with self.lock:
+            future = self.futures.pop(path_to_file, None)
+        # failed prefetch is repeated on the caller thread to surface the error there
+        if future is not None and not future.cancelled() and future.exception() is None:
+            return future.result()
+        return self.loader(path_to_file)
+
+    def prefetch(self, files: list[Path], index: int, channel: str | None = None) -> None:
+        """Method to schedule loading of files around the index and cancel the rest.
+
+        Args:
+            files: list of files within the folder
+            index: index of the current file
+            channel: channel to decode in advance
+
+        """
+        neighbours = [
+            files[ix]
+            for offset in range(1, self.depth + 1)
+            for ix in (index + offset, index - offset)
+            if 0 <= ix < len(files)
+        ]
+        with self.lock:
+            for path_to_file in list(self.futures):
+                if path_to_file not in neighbours:
+                    self.futures.pop(path_to_file).cancel()
+            for path_to_file in neighbours:
+                if path_to_file not in self.futures:
+                    self.futures[path_to_file] = self.executor.submit(self.warm_file, path_to_file, channel)
+
+    def clear(self) -> None:
+        """Method to cancel all prefetches and drop loaded files."""
+        with self.lock:
+            for future in self.futures.values():
+                future.cancel()
+            self.futures.clear()
+
+    def shutdown(self) -> None:
+        """Method to stop worker threads."""
+        self.clear()
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -1,20 +1,29 @@
 """Module for processing."""
 
+import functools
+from collections.abc import Callable
+
 import numpy as np
-import pandas as pd
 from numpy.typing import NDArray
 
+from .constants import ENCODED_NONE, SEGMENTATION_BLOCK_ROWS
+
 
 def get_boolean_mask(fmi_image: NDArray, threshold: int) -> NDArray:
-    """Method to prepare boolean (0 or 1) mask for fmi image.
+    """Method to prepare boolean mask for fmi image.
 
     Args:
         fmi_image: raw input array
-        threshold: threshold value for making 0 or 1
+        threshold: threshold value, pixels below it are True
     Returns:
         boolean 2d NDArray
     """
-    return np.where(fmi_image < threshold, 1, 0)
+    return fmi_image < threshold
+
+
+def get_mask_labels(fmi_mask: NDArray) -> NDArray:
+    """Method to convert boolean mask to uint8 labels (0 or 255) for display and export."""
+    return np.multiply(fmi_mask, 255, dtype=np.uint8)
 
 
 def get_whashout_curve(fmi_boolean: NDArray) -> np.array:
@@ -25,34 +34,289 @@ def get_whashout_curve(fmi_boolean: NDArray) -> np.array:
 
     """
     # obtain curve
-    height, width = fmi_boolean.shape
-    fmi_sum = fmi_boolean.sum(axis=1) / width
+    height = fmi_boolean.shape[0]
     x = np.arange(height)
-    y = fmi_sum * width
+    y = np.count_nonzero(fmi_boolean, axis=1)
+    return np.vstack((x, y)).T
+
+
+def segment_rows_numpy(fmi_image: NDArray, threshold: float, block_rows: int) -> tuple[NDArray, ...]:
+    """Method to compute mask and per-row pixel counts, streaming the image in blocks of rows.
+
+    Args:
+        fmi_image: raw input array
+        threshold: threshold value
+        block_rows: N of rows processed at once, bounds temporary memory
+    Returns:
+        boolean mask, N of pixels below threshold, N of valid pixels below threshold, N of valid pixels
+    """
+    height = fmi_image.shape[0]
+    fmi_mask = np.empty(fmi_image.shape, dtype=bool)
+    counts, porous_counts, valid_counts = (np.empty(height, dtype=np.int64) for _ in range(3))
+    for start in range(0, height, block_rows):
+        rows = slice(start, start + block_rows)
+        block = fmi_image[rows]
+        np.less(block, threshold, out=fmi_mask[rows])
+        counts[rows] = np.count_nonzero(fmi_mask[rows], axis=1)
+        # NaN compares False, so only finite values above the encoded None are valid
+        valid = block > ENCODED_NONE
+        valid_counts[rows] = np.count_nonzero(valid, axis=1)
+        valid &= fmi_mask[rows]
+        porous_counts[rows] = np.count_nonzero(valid, axis=1)
+    return fmi_mask, counts, porous_counts, valid_counts
+
+
+@functools.cache
+def get_segment_rows_numba() -> Callable | None:
+    """Method to import numba kernel of segmentation on the first use, None if numba is not installed."""
+    try:
+        from .numba_kernels import segment_rows_numba
+    except ImportError:  # numba is optional, the NumPy implementation is used without it
+        return None
+    return segment_rows_numba
+
+
+def segment_fmi_image(
+    fmi_image: NDArray,
+    threshold: float,
+    block_rows: int = SEGMENTATION_BLOCK_ROWS,
+    use_numba: bool = True,
+) -> tuple[NDArray, NDArray, NDArray]:
+    """Method to get mask, whashout curve and porosity reading the image once.
+
+    Replaces get_boolean_mask followed by get_whashout_curve and summing the mask for porosity.
+    Numba kernel is used if numba is installed, it is imported and compiled on the first call.
+
+    Args:
+        fmi_image: raw input array
+        threshold: threshold value
+        block_rows: N of rows processed at once by the NumPy implementation
+        use_numba: False to use the NumPy implementation even if numba is installed
+    Returns:
+        boolean mask, whashout curve as from get_whashout_curve and porosity of every row,
+        i.e. share of valid pixels below threshold (NaN for rows without valid pixels)
+    """
+    fmi_image = np.asarray(fmi_image)
+    segment_rows_numba = get_segment_rows_numba() if use_numba else None
+    if segment_rows_numba is not None:
+        fmi_mask, counts, porous_counts, valid_counts = segment_rows_numba(fmi_image, threshold, ENCODED_NONE)
+    else:
+        fmi_mask, counts, porous_counts, valid_counts = segment_rows_numpy(fmi_image, threshold, block_rows)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        porosity = porous_counts / valid_counts
+    whashout_curve = np.vstack((np.arange(len(counts)), counts)).T
+    return fmi_mask, whashout_curve, porosity
+
+
+def sort_rows(fmi_image: NDArray) -> NDArray:
+    """Method to prepare per-row sorted copy of fmi image for fast threshold lookups.
+
+    Args:
+        fmi_image: raw input array
+    Returns:
+        2d NDArray with every row sorted, NaN values are placed at the end of rows
+    """
+    return np.sort(fmi_image, axis=1)
+
+
+def count_below_threshold(sorted_rows: NDArray, threshold: float) -> NDArray:
+    """Method to count values below threshold within every row.
+
+    Branchless binary search is run for all rows at once, so the cost is O(H log W)
+    instead of O(H W) for comparing the whole image.
+
+    Args:
+        sorted_rows: output of sort_rows
+        threshold: threshold value
+    Returns:
+        1d NDArray with number of values below threshold for every row
+    """
+    height, width = sorted_rows.shape
+    flat = sorted_rows.ravel()
+    row_offsets = np.arange(height, dtype=np.int64) * width - 1
+    counts = np.zeros(height, dtype=np.int64)
+    step = 1 << max(width.bit_length() - 1, 0)
+    while step:
+        candidate = counts + step
+        # position is moved forward only while the value before it is below threshold
+        below = flat.take(row_offsets + np.minimum(candidate, width)) < threshold
+        below &= candidate <= width
+        counts += below * step
+        step >>= 1
+    return counts
+
+
+def get_whashout_curve_sorted(sorted_rows: NDArray, threshold: float) -> NDArray:
+    """Method to get whashout curve from per-row sorted image without building the mask.
+
+    Args:
+        sorted_rows: output of sort_rows
+        threshold: threshold value
+    Returns:
+        same curve as get_whashout_curve(get_boolean_mask(fmi_image, threshold))
+    """
+    y = count_below_threshold(sorted_rows, threshold)
+    x = np.arange(len(y))
     return np.vstack((x, y)).T
 
 
-def pivot_data_for_visualization(
-    df_strat: pd.DataFrame,
-    col_reference: str = "FORMATION",
-    col_depth: str = "TOP",
-    depth_step: float = 0.5,
-) -> pd.DataFrame:
-    """Method to pivot data for visualization."""
-    # pivot table
-    df_pivot = (
-        df_strat[[col_depth, col_reference]].dropna().pivot(index=col_depth, columns=col_reference, values=col_depth)
-    )
-    # fillna with 0
-    df_pivot = df_pivot.fillna(0)
-    # replace all non na values with 100
-    df_pivot[df_pivot != 0] = 100
-    # reset index
-    df_pivot = df_pivot.reset_index()
-    # rename Кровля to MD
-    df_pivot.rename(columns={col_depth: "DEPTH"}, inplace=True)
-    # resample the dataframe
-    start, end = df_pivot["DEPTH"].min(), df_pivot["DEPTH"].max()
-    new_md = list(np.arange(start, end + depth_step, depth_step))
-    resampled_df = pd.DataFrame(new_md, columns=["DEPTH"])
-    return resampled_df.merge(df_pivot, on="DEPTH", how="outer").sort_values(by="DEPTH").ffill()
+def get_whashout_sweep(
+    fmi_image: NDArray,
+    thresholds: NDArray,
+    block_rows: int = SEGMENTATION_BLOCK_ROWS,
+) -> NDArray:
+    """Method to count values below every threshold within every row in one pass over the image.
+
+    Every value is placed into the interval between sorted thresholds, per-row histograms
+    of the intervals are accumulated, so values below threshold k are those in intervals up to k.
+
+    Args:
+        fmi_image: raw input array
+        thresholds: 1d array of thresholds
+        block_rows: N of rows processed at once, bounds memory of interval indices
+    Returns:
+        2d NDArray (H x N thresholds), column k is the whashout curve for thresholds[k]
+    """
+    order = np.argsort(thresholds)
+    sorted_thresholds = np.asarray(thresholds)[order]
+    height = fmi_image.shape[0]
+    n_bins = len(sorted_thresholds) + 1
+    row_offsets = np.arange(min(block_rows, height))[:, None] * n_bins
+    sweep = np.empty((height, len(sorted_thresholds)), dtype=np.int64)
+    for start in range(0, height, block_rows):
+        block = fmi_image[start : start + block_rows]
+        n_rows = len(block)
+        # NaN values are placed into the last interval and are never counted
+        bins = np.searchsorted(sorted_thresholds, block, side="right")
+        bins += row_offsets[:n_rows]
+        histograms = np.bincount(bins.ravel(), minlength=n_rows * n_bins).reshape(n_rows, n_bins)
+        sweep[start : start + n_rows, order] = np.cumsum(histograms, axis=1)[:, :-1]
+    return sweep
+
+
+def get_decimation_factor(n_rows: int, target_height: int) -> int:
+    """Method to return N of rows reduced to one so that the track has at most target_height rows."""
+    return max(1, -(-n_rows // target_height))
+
+
+def reduce_row_block(block: NDArray, factor: int, reducer: str) -> NDArray:
+    """Method to reduce every factor rows of float32 block to one, the block is modified in place.
+
+    Args:
+        block: float32 2d array, the last group may be incomplete
+        factor: N of rows within group
+        reducer: "mean" ignoring invalid values or "max"
+
+    Returns: reduced rows
+
+    """
+    n_groups = -(-block.shape[0] // factor)
+    n_pad = n_groups * factor - block.shape[0]
+    if reducer == "max":
+        if n_pad:
+            block = np.concatenate((block, np.full((n_pad, block.shape[1]), -np.inf, dtype=np.float32)))
+        return block.reshape(n_groups, factor, -1).max(axis=1)
+    # NaN compares False, so only finite values above the encoded None are averaged
+    valid = block > ENCODED_NONE
+    block[~valid] = 0
+    if n_pad:
+        block = np.concatenate((block, np.zeros((n_pad, block.shape[1]), dtype=np.float32)))
+        valid = np.concatenate((valid, np.zeros((n_pad, valid.shape[1]), dtype=bool)))
+    sums = block.reshape(n_groups, factor, -1).sum(axis=1)
+    counts = valid.reshape(n_groups, factor, -1).sum(axis=1, dtype=np.float32)
+    return np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+
+
+def decimate_rows(
+    data: NDArray,
+    factor: int,
+    reducer: str = "mean",
+    block_rows: int = SEGMENTATION_BLOCK_ROWS,
+) -> NDArray:
+    """Method to reduce every factor rows to one in float32, streaming the data in blocks of rows.
+
+    Unlike taking every Nth row, thin features are kept: by the mean for images and porosity,
+    by the max for masks. Only one block is converted to float32 at a time.
+
+    Args:
+        data: 1d or 2d array
+        factor: N of rows reduced to one, output of get_decimation_factor
+        reducer: "mean" ignoring NaN and encoded None values, or "max"
+        block_rows: N of input rows processed at once
+
+    Returns: float32 array with ceil(N rows / factor) rows, rows without valid values are 0
+
+    """
+    data = np.asarray(data)
+    rows = data.reshape(data.shape[0], -1)
+    decimated = np.empty((-(-rows.shape[0] // factor), rows.shape[1]), dtype=np.float32)
+    step = max(block_rows // factor, 1) * factor
+    for start in range(0, rows.shape[0], step):
+        reduced = reduce_row_block(rows[start : start + step].astype(np.float32), factor, reducer)
+        decimated[start // factor : start // factor + len(reduced)] = reduced
+    return decimated.reshape(-1) if data.ndim == 1 else decimated
+
+
+def prepare_logview_track(data: NDArray, factor: int, reducer: str = "mean", sigma: float | None = None) -> NDArray:
+    """Method to decimate FMI image, mask or porosity for logview and optionally smooth it.
+
+    Args:
+        data: 1d or 2d array
+        factor: N of rows reduced to one
+        reducer: "mean" for images and porosity, "max" for masks
+        sigma: sigma of gaussian smoothing applied to the decimated track, None to skip it
+
+    Returns: float32 track
+
+    """
+    track = decimate_rows(data, factor, reducer=reducer)
+    if sigma:
+        # scipy.ndimage is heavy to import and is needed only for smoothing
+        from scipy.ndimage import gaussian_filter
+
+        track = gaussian_filter(track, sigma=sigma, output=np.float32)
+    return track
+
+
+def get_group_slices(codes: NDArray, n_groups: int) -> tuple[NDArray, list[slice]]:
+    """Method to partition rows by group code with one stable argsort.
+
+    Args:
+        codes: group code of every row from 0 to n_groups - 1, rows with negative codes are dropped
+        n_groups: N of groups
+
+    Returns: order of rows grouped by code and slice of the order for every group
+
+    """
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(n_groups + 1), side="left")
+    return order, [slice(bounds[i], bounds[i + 1]) for i in range(n_groups)]
+
+
+def fit_lines(x: NDArray, y: NDArray, codes: NDArray | None = None, n_groups: int = 1) -> dict[str, NDArray]:
+    """Method to fit least squares lines y = intercept + slope * x for every group in closed form.
+
+    Args:
+        x: x values without NaN
+        y: y values without NaN
+        codes: group code of every value from 0 to n_groups - 1, None for one group
+        n_groups: N of groups
+
+    Returns: slope, intercept, r_squared and n of every group, NaN for groups with less than 2 distinct x
+
+    """
+    codes = np.zeros(len(x), dtype=np.int64) if codes is None else codes
+    n = np.bincount(codes, minlength=n_groups).astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean_x = np.bincount(codes, weights=x, minlength=n_groups) / n
+        mean_y = np.bincount(codes, weights=y, minlength=n_groups) / n
+        # centered sums are accurate for large offsets such as depth or resistivity
+        dx, dy = x - mean_x[codes], y - mean_y[codes]
+        sxx = np.bincount(codes, weights=dx * dx, minlength=n_groups)
+        syy = np.bincount(codes, weights=dy * dy, minlength=n_groups)
+        sxy = np.bincount(codes, weights=dx * dy, minlength=n_groups)
+        slope = np.where(sxx > 0, sxy / sxx, np.nan)
+        intercept = mean_y - slope * mean_x
+        r_squared = np.where(syy > 0, sxy * sxy / (sxx * syy), 1.0)
+    r_squared[np.isnan(slope)] = np.nan
+    return {"slope": slope, "intercept": intercept, "r_squared": r_squared, "n": n}
@@ -0,0 +1,70 @@
+"""Module to share products derived from the current FMI channel between widgets."""
+
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any, TypeVar
+
+from .constants import SIGMA
+
+
+ProductKey = tuple[str, str, int | None, int, int]
+ProductT = TypeVar("ProductT")
+
+
+class ProductRegistry:
+    """Class holds products prepared from the current channel, e.g. smoothed image for logview.
+
+    Every product is computed once per (file, channel, threshold, decimation factor, SIGMA);
+    products which do not depend on threshold use None instead of it. Only products of
+    the channel and threshold shown in the viewer are kept.
+    """
+
+    def __init__(self) -> None:
+        self.items: dict[tuple[ProductKey, str], Any] = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def make_key(path_to_file: Path, channel: str, threshold: int | None = None, factor: int = 1) -> ProductKey:
+        """Method to build key of the products, factor is N of rows reduced to one for display."""
+        return str(path_to_file), channel, threshold, factor, SIGMA
+
+    def get_or_compute(self, key: ProductKey, name: str, compute: Callable[[], ProductT]) -> ProductT:
+        """Method to return product, computing it on the first request.
+
+        Args:
+            key: output of make_key
+            name: name of the product, e.g. "image" or "porosity"
+            compute: function to compute the product
+
+        Returns: product
+
+        """
+        with self.lock:
+            if (key, name) in self.items:
+                return self.items[key, name]
+        product = compute()
+        with self.lock:
+            self.items[key, name] = product
+        return product
+
+    def retain(self, path_to_file: Path, channel: str, threshold: int) -> None:
+        """Method to drop products of other files, channels and thresholds.
+
+        Args:
+            path_to_file: file shown in the viewer
+            channel: channel shown in the viewer
+            threshold: threshold of the current mask
+
+        """
+        with self.lock:
+            self.items = {
+                (key, name): product
+                for (key, name), product in self.items.items()
+                if key[:2] == (str(path_to_file), channel) and key[2] in (None, threshold)
+            }
+
+    def clear(self) -> None:
+        """Method to drop all products."""
+        with self.lock:
+            self.items.clear()
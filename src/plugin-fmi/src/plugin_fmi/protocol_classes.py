@@ -10,12 +10,25 @@ class FMIProcessorProtocol(Protocol):
 
     viewer: Viewer
     current_layer: any
+    current_file: any
+    current_channel: str
     current_threshold: int
+    fmi_mask: any
+    fmi_porosity: any
+    fmi_mask_key: tuple | None
+    products: any
     img_scale: str
+    slider_threshold: any
 
     def init_click_events(self) -> None:
         """Method to connect click events with actions."""
 
+    def get_current_key(self) -> tuple:
+        """Method to return file and channel shown in the viewer."""
+
+    def get_channel_stats(self) -> dict | None:
+        """Method to return statistics of the current channel from the folder index."""
+
     def load_image_folder(self) -> None:
         """Method to load image folder."""
 
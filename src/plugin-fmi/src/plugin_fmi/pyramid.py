@@ -0,0 +1,131 @@
+"""Module to build multiscale pyramids for long FMI channels."""
+
+import json
+import re
+import shutil
+from contextlib import suppress
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .constants import PYRAMID_MIN_HEIGHT, PYRAMID_MIN_WIDTH, PYRAMID_SUFFIX
+
+
+META_NAME: str = "levels.json"
+
+
+def get_level_factors(shape: tuple[int, ...]) -> tuple[int, int]:
+    """Method to return downsampling factors for the next level.
+
+    Depth is always halved, width only while it stays wider than PYRAMID_MIN_WIDTH,
+    so narrow images keep their azimuthal resolution.
+    """
+    return 2, 2 if shape[1] >= 2 * PYRAMID_MIN_WIDTH else 1
+
+
+def block_reduce(data: NDArray, factors: tuple[int, int], reducer: str = "mean") -> NDArray:
+    """Method to reduce 2d array by non-overlapping blocks.
+
+    Args:
+        data: 2d array
+        factors: block size along rows and columns
+        reducer: "mean" (NaN-aware) for images or "max" for masks
+
+    Returns: reduced array with the same dtype
+
+    """
+    rows, cols = (data.shape[0] // factors[0]) * factors[0], (data.shape[1] // factors[1]) * factors[1]
+    blocks = data[:rows, :cols].reshape(rows // factors[0], factors[0], cols // factors[1], factors[1])
+    if reducer == "max":
+        return blocks.max(axis=(1, 3))
+    reduced = np.nanmean(blocks, axis=(1, 3), dtype=np.float32)
+    if np.issubdtype(data.dtype, np.integer):
+        return np.rint(reduced).astype(data.dtype)
+    return reduced.astype(data.dtype, copy=False)
+
+
+def build_pyramid(data: NDArray, reducer: str = "mean", min_height: int = PYRAMID_MIN_HEIGHT) -> list[NDArray]:
+    """Method to build multiscale pyramid, the first level is the data itself.
+
+    Images and masks of the same shape get levels of the same shapes.
+
+    Args:
+        data: 2d array
+        reducer: "mean" for images, "max" for masks so thin washouts survive
+        min_height: height at which downsampling stops
+
+    Returns: list of levels from full to lowest resolution
+
+    """
+    levels = [data]
+    while levels[-1].shape[0] >= 2 * min_height:
+        levels.append(block_reduce(levels[-1], get_level_factors(levels[-1].shape), reducer=reducer))
+    return levels
+
+
+def get_pyramid_path(path_to_file: Path, channel: str) -> Path:
+    """Method to return folder with persisted levels of the channel."""
+    return path_to_file.with_name(f".{path_to_file.name}{PYRAMID_SUFFIX}") / re.sub(r"[^\w.-]", "_", channel)
+
+
+def describe_source(path_to_file: Path, data: NDArray) -> dict:
+    """Method to describe source of the pyramid to detect outdated levels."""
+    stat = path_to_file.stat()
+    return {
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "shape": list(data.shape),
+        "dtype": data.dtype.str,
+    }
+
+
+def load_pyramid(path_to_file: Path, channel: str, data: NDArray) -> list[NDArray] | None:
+    """Method to load persisted levels of the channel, memory mapped.
+
+    Args:
+        path_to_file: path to FMI file
+        channel: channel name
+        data: full resolution channel, used as the first level
+
+    Returns: list of levels or None if there are no up-to-date levels
+
+    """
+    path_to_pyramid = get_pyramid_path(path_to_file, channel)
+    with suppress(OSError, ValueError):
+        meta = json.loads((path_to_pyramid / META_NAME).read_text())
+        if meta["source"] == describe_source(path_to_file, data):
+            return [data] + [np.load(path_to_pyramid / f"{ix}.npy", mmap_mode="r") for ix in range(1, meta["n_levels"])]
+    return None
+
+
+def save_pyramid(path_to_file: Path, channel: str, levels: list[NDArray]) -> None:
+    """Method to persist all levels except the full resolution one next to the FMI file."""
+    path_to_pyramid = get_pyramid_path(path_to_file, channel)
+    try:
+        shutil.rmtree(path_to_pyramid, ignore_errors=True)
+        path_to_pyramid.mkdir(parents=True)
+        for ix, level in enumerate(levels[1:], start=1):
+            np.save(path_to_pyramid / f"{ix}.npy", level)
+        meta = {"n_levels": len(levels), "source": describe_source(path_to_file, levels[0])}
+        (path_to_pyramid / META_NAME).write_text(json.dumps(meta))
+    except OSError:
+        shutil.rmtree(path_to_pyramid, ignore_errors=True)
+
+
+def load_or_build_pyramid(path_to_file: Path, channel: str, data: NDArray) -> list[NDArray]:
+    """Method to return image pyramid of the channel, building and persisting it once.
+
+    Args:
+        path_to_file: path to FMI file
+        channel: channel name
+        data: full resolution channel
+
+    Returns: list of levels from full to lowest resolution
+
+    """
+    levels = load_pyramid(path_to_file, channel, data)
+    if levels is None:
+        levels = build_pyramid(data, reducer="mean")
+        save_pyramid(path_to_file, channel, levels)
+    return levels
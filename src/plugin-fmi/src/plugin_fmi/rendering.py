@@ -0,0 +1,76 @@
+"""Module to render FMI tracks as images embedded into plotly figures."""
+
+import base64
+import functools
+import io
+
+import numpy as np
+from numpy.typing import NDArray
+from PIL import Image
+from plotly.colors import get_colorscale, hex_to_rgb, unlabel_rgb
+
+from .constants import FMI_TRACK_IMAGE_FORMAT
+
+
+@functools.cache
+def get_colormap_lut(colorscale: str) -> NDArray:
+    """Method to return 256 x 3 uint8 lookup table of plotly colorscale.
+
+    Colours are interpolated linearly between the stops of the colorscale, as plotly does for heatmaps.
+
+    Args:
+        colorscale: name of plotly colorscale, e.g. "viridis" or "gray"
+
+    Returns: lookup table, read-only
+
+    """
+    stops = get_colorscale(colorscale)
+    positions = np.array([position for position, _ in stops])
+    colors = np.array(
+        [hex_to_rgb(color) if color.startswith("#") else unlabel_rgb(color) for _, color in stops],
+        dtype=np.float64,
+    )
+    levels = np.linspace(0, 1, 256)
+    lut = np.column_stack([np.interp(levels, positions, colors[:, channel]) for channel in range(3)])
+    lut = np.round(lut).astype(np.uint8)
+    lut.flags.writeable = False
+    return lut
+
+
+def apply_colormap(data: NDArray, colorscale: str, zmin: float | None = None, zmax: float | None = None) -> NDArray:
+    """Method to colour-map 2d array to RGBA image, NaN pixels are transparent.
+
+    Args:
+        data: 2d array
+        colorscale: name of plotly colorscale
+        zmin: value mapped to the first colour, minimum of the data by default
+        zmax: value mapped to the last colour, maximum of the data by default
+
+    Returns: uint8 RGBA image
+
+    """
+    valid = np.isfinite(data)
+    zmin = np.nanmin(data) if zmin is None else zmin
+    zmax = np.nanmax(data) if zmax is None else zmax
+    scale = 255 / (zmax - zmin) if zmax > zmin else 0
+    levels = np.clip(np.nan_to_num((data - zmin) * scale), 0, 255).round().astype(np.uint8)
+    rgba = np.empty((*data.shape, 4), dtype=np.uint8)
+    rgba[..., :3] = get_colormap_lut(colorscale)[levels]
+    rgba[..., 3] = np.where(valid, 255, 0)
+    return rgba
+
+
+def encode_image(rgba: NDArray, image_format: str = FMI_TRACK_IMAGE_FORMAT) -> str:
+    """Method to encode RGBA image as data URI.
+
+    Args:
+        rgba: uint8 RGBA image
+        image_format: "png" or "webp", both lossless
+
+    Returns: data URI to use as source of plotly image
+
+    """
+    buffer = io.BytesIO()
+    options = {"lossless": True} if image_format == "webp" else {"optimize": False}
+    Image.fromarray(rgba).save(buffer, format=image_format.upper(), **options)
+    return f"data:image/{image_format};base64,{base64.b64encode(buffer.getvalue()).decode('ascii')}"
@@ -0,0 +1,89 @@
+"""Module to serialize plotly figures with arrays as base64 typed arrays."""
+
+import base64
+import json
+
+import numpy as np
+import plotly.graph_objects as go
+from numpy.typing import NDArray
+from plotly.utils import PlotlyJSONEncoder
+
+
+try:
+    import orjson
+except ImportError:  # orjson is optional, the standard encoder is used without it
+    orjson = None
+
+
+# numpy dtypes understood by plotly.js typed array spec, others are converted to float
+TYPED_ARRAY_DTYPES: dict[str, str] = {
+    "int8": "i1",
+    "uint8": "u1",
+    "int16": "i2",
+    "uint16": "u2",
+    "int32": "i4",
+    "uint32": "u4",
+    "float32": "f4",
+    "float64": "f8",
+}
+
+
+def encode_array(array: NDArray, float_dtype: str = "f4") -> dict | list:
+    """Method to encode numeric array as plotly.js typed array spec.
+
+    Args:
+        array: array of any dtype, non-numeric arrays are returned as lists
+        float_dtype: "f4" to send floats and large 64-bit integers as float32, "f8" to keep float64
+
+    Returns: dict with dtype, base64 data and shape of 2d arrays
+
+    """
+    if array.dtype.kind not in "iuf" or array.ndim > 2:  # noqa: PLR2004
+        return array.tolist()
+    dtype = TYPED_ARRAY_DTYPES.get(array.dtype.name)
+    if dtype is None and array.dtype.kind in "iu" and array.size:
+        # 64-bit integers are sent as int32 when they fit
+        info = np.iinfo(np.int32)
+        dtype = "i4" if info.min <= array.min() and array.max() <= info.max else None
+    if dtype is None or dtype == "f8":
+        dtype = float_dtype
+    array = np.ascontiguousarray(array, dtype=np.dtype(dtype).newbyteorder("<"))
+    spec = {"dtype": dtype, "bdata": base64.b64encode(array.data).decode("ascii")}
+    if array.ndim == 2:  # noqa: PLR2004
+        spec["shape"] = f"{array.shape[0]}, {array.shape[1]}"
+    return spec
+
+
+def encode_arrays(obj: object, float_dtype: str = "f4") -> object:
+    """Method to replace numeric arrays within dicts and lists by typed array specs."""
+    if isinstance(obj, dict):
+        return {key: encode_arrays(value, float_dtype) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [encode_arrays(value, float_dtype) for value in obj]
+    if hasattr(obj, "to_numpy"):  # pandas series and index
+        obj = obj.to_numpy()
+    if isinstance(obj, np.ndarray):
+        return encode_array(obj, float_dtype)
+    return obj
+
+
+def dumps(obj: object) -> str:
+    """Method to serialize object to JSON with orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY).decode("utf-8")
+    return json.dumps(obj, cls=PlotlyJSONEncoder)
+
+
+def get_figure_json(fig: go.Figure, float_dtype: str = "f4") -> tuple[list[str], str]:
+    """Method to serialize traces and layout of the figure separately.
+
+    Args:
+        fig: plotly figure
+        float_dtype: "f4" or "f8", see encode_array
+
+    Returns: JSON of every trace and JSON of the layout
+
+    """
+    figure = fig.to_plotly_json()
+    traces = [dumps(encode_arrays(trace, float_dtype)) for trace in figure["data"]]
+    return traces, dumps(encode_arrays(figure["layout"], float_dtype))
@@ -0,0 +1,131 @@
+"""Module to cache parsed tables in columnar sidecar folders next to source files."""
+
+import hashlib
+import json
+import shutil
+from contextlib import suppress
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .constants import SIDECAR_HASH_BLOCK, SIDECAR_SUFFIX
+
+
+SIDECAR_VERSION: int = 1
+META_NAME: str = "meta.json"
+
+
+def get_sidecar_path(path_to_file: Path) -> Path:
+    """Method to return path of hidden sidecar folder for the file."""
+    return path_to_file.with_name(f".{path_to_file.name}{SIDECAR_SUFFIX}")
+
+
+def hash_file(path_to_file: Path) -> str:
+    """Method to compute content hash of the file."""
+    digest = hashlib.blake2b(digest_size=16)
+    with path_to_file.open("rb") as f:
+        while block := f.read(SIDECAR_HASH_BLOCK):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def read_meta(path_to_sidecar: Path) -> dict | None:
+    """Method to read metadata of the sidecar."""
+    try:
+        return json.loads((path_to_sidecar / META_NAME).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def is_valid(path_to_file: Path, path_to_sidecar: Path, meta: dict, kind: str) -> bool:
+    """Method to check that the sidecar was built from the current content of the file.
+
+    Size and mtime are checked first; if only mtime differs, content hash decides and
+    the stored mtime is refreshed, so touched but unchanged files keep their cache.
+    """
+    if meta.get("version") != SIDECAR_VERSION or meta.get("kind") != kind:
+        return False
+    stat = path_to_file.stat()
+    if meta["size"] != stat.st_size:
+        return False
+    if meta["mtime_ns"] == stat.st_mtime_ns:
+        return True
+    if meta["hash"] != hash_file(path_to_file):
+        return False
+    meta["mtime_ns"] = stat.st_mtime_ns
+    with suppress(OSError):
+        (path_to_sidecar / META_NAME).write_text(json.dumps(meta))
+    return True
+
+
+def read_sidecar(
+    path_to_file: Path,
+    kind: str,
+    columns: list[str] | None = None,
+    keep_first_column: bool = False,
+) -> pd.DataFrame | None:
+    """Method to read cached table for the file.
+
+    Args:
+        path_to_file: path to source file
+        kind: type of the table, e.g. "las" or "tops"
+        columns: columns to read, by default all of them
+        keep_first_column: read the first column even if it is not in columns, e.g. depth of las
+
+    Returns: dataframe or None if there is no valid sidecar
+
+    """
+    path_to_sidecar = get_sidecar_path(path_to_file)
+    meta = read_meta(path_to_sidecar)
+    if meta is None or not is_valid(path_to_file, path_to_sidecar, meta, kind):
+        return None
+    data = {}
+    for ix, (name, file_name, is_text) in enumerate(meta["columns"]):
+        if columns is not None and name not in columns and not (keep_first_column and ix == 0):
+            continue
+        # copy-on-write mapping, pages are read only when the column is used
+        values = np.load(path_to_sidecar / file_name, mmap_mode="c")
+        if is_text:
+            values = np.where(values == "", None, values.astype(object))
+        data[name] = values
+    return pd.DataFrame(data)
+
+
+def write_sidecar(path_to_file: Path, kind: str, df: pd.DataFrame) -> None:
+    """Method to write table parsed from the file to the sidecar.
+
+    Every column is stored as separate .npy file, so they can be memory mapped
+    and read selectively. Failures to write are ignored, cache is optional.
+
+    Args:
+        path_to_file: path to source file
+        kind: type of the table, e.g. "las" or "tops"
+        df: parsed table
+
+    """
+    path_to_sidecar = get_sidecar_path(path_to_file)
+    stat = path_to_file.stat()
+    meta = {
+        "version": SIDECAR_VERSION,
+        "kind": kind,
+        "size": stat.st_size,
+        "mtime_ns": stat.st_mtime_ns,
+        "hash": hash_file(path_to_file),
+        "columns": [],
+    }
+    try:
+        shutil.rmtree(path_to_sidecar, ignore_errors=True)
+        path_to_sidecar.mkdir(parents=True)
+        for ix, name in enumerate(df.columns):
+            values = df[name].to_numpy()
+            is_text = values.dtype == object
+            if is_text:
+                values = np.array(["" if pd.isna(value) else str(value) for value in values], dtype=str)
+            file_name = f"{ix}.npy"
+            np.save(path_to_sidecar / file_name, values, allow_pickle=False)
+            meta["columns"].append([str(name), file_name, is_text])
+        # metadata is written last, so partially written sidecar is never read
+        (path_to_sidecar / META_NAME).write_text(json.dumps(meta))
+    except OSError:
+        shutil.rmtree(path_to_sidecar, ignore_errors=True)
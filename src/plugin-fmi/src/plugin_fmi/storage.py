@@ -0,0 +1,235 @@
+"""Module to store FMI channels in chunked, compressed on-disk stores.
+
+Pickles of the folder are converted once, the widget and batch processing then read
+channels from the stores chunk by chunk instead of unpickling whole files:
+
+    python -m plugin_fmi.storage path/to/folder
+"""
+
+import argparse
+import json
+import zlib
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from numpy.typing import NDArray
+
+from .constants import STORE_CHUNK_ROWS, STORE_COMPRESSION_LEVEL, STORE_SUFFIX
+
+
+STORE_VERSION: int = 1
+HEADER_NAME: str = "header.json"
+CHUNK_SUFFIX: str = ".z"
+
+
+def get_store_path(path_to_file: Path) -> Path:
+    """Method to return path of the store created next to the pickle file.
+
+    Args:
+        path_to_file: path to pickle
+
+    Returns: path to store directory
+
+    """
+    return path_to_file.with_suffix(STORE_SUFFIX)
+
+
+def is_store(path: Path) -> bool:
+    """Method to check if the path points to a complete store."""
+    return (path / HEADER_NAME).is_file()
+
+
+def write_channel(path_to_channel: Path, array: NDArray, chunk_rows: int = STORE_CHUNK_ROWS) -> dict:
+    """Method to write one channel as compressed chunks of rows.
+
+    Args:
+        path_to_channel: directory to write chunks to
+        array: channel data, first axis is depth
+        chunk_rows: number of rows within one chunk
+
+    Returns: header entry for the channel
+
+    """
+    path_to_channel.mkdir(parents=True, exist_ok=True)
+    array = np.atleast_1d(array)
+    n_chunks = max(1, -(-array.shape[0] // chunk_rows))
+    for ix in range(n_chunks):
+        chunk = np.ascontiguousarray(array[ix * chunk_rows : (ix + 1) * chunk_rows])
+        raw = zlib.compress(chunk.tobytes(), STORE_COMPRESSION_LEVEL)
+        (path_to_channel / f"{ix}{CHUNK_SUFFIX}").write_bytes(raw)
+    return {
+        "dir": path_to_channel.name,
+        "shape": list(array.shape),
+        "dtype": array.dtype.str,
+        "n_chunks": n_chunks,
+    }
+
+
+def convert_fmi_pickle(
+    path_to_file: Path,
+    path_to_store: Path | None = None,
+    chunk_rows: int = STORE_CHUNK_ROWS,
+) -> Path:
+    """Method to convert pickle file with FMI channels to the chunked store.
+
+    Header is written last, so interrupted conversion is never picked up by the loader.
+
+    Args:
+        path_to_file: path to pickle
+        path_to_store: directory for the store, by default next to the pickle
+        chunk_rows: number of depth rows within one chunk
+
+    Returns: path to the store
+
+    """
+    path_to_store = path_to_store or get_store_path(path_to_file)
+    path_to_store.mkdir(parents=True, exist_ok=True)
+    data: dict = pd.read_pickle(path_to_file)
+    stat = path_to_file.stat()
+    header = {
+        "version": STORE_VERSION,
+        "source": path_to_file.name,
+        "source_size": stat.st_size,
+        "source_mtime_ns": stat.st_mtime_ns,
+        "chunk_rows": chunk_rows,
+        "channels": {},
+    }
+    for ix, (key, value) in enumerate(data.items()):
+        array = np.asarray(value)
+        # keep only numeric channels, metadata is not needed for processing
+        if array.dtype.kind not in "biuf":
+            continue
+        header["channels"][key] = write_channel(path_to_store / f"c{ix}", array, chunk_rows)
+    path_to_header_tmp = path_to_store / f"{HEADER_NAME}.tmp"
+    path_to_header_tmp.write_text(json.dumps(header, indent=2))
+    path_to_header_tmp.replace(path_to_store / HEADER_NAME)
+    return path_to_store
+
+
+def convert_fmi_folder(path_to_folder: Path, file_format: str = ".pkl", overwrite: bool = False) -> list[Path]:
+    """Method to convert every pickle within the folder to the chunked store.
+
+    Args:
+        path_to_folder: path to folder
+        file_format: format of files
+        overwrite: convert files even if up-to-date store exists
+
+    Returns: list of created stores
+
+    """
+    created = []
+    for path_to_file in sorted(path_to_folder.iterdir()):
+        if not path_to_file.is_file() or file_format not in path_to_file.name:
+            continue
+        if not overwrite and find_store(path_to_file) is not None:
+            continue
+        created.append(convert_fmi_pickle(path_to_file))
+    return created
+
+
+def find_store(path_to_file: Path) -> Path | None:
+    """Method to find up-to-date store for the pickle file.
+
+    Store is ignored if the pickle was modified after conversion.
+
+    Args:
+        path_to_file: path to pickle or to store directory
+
+    Returns: path to store or None
+
+    """
+    if path_to_file.is_dir():
+        return path_to_file if is_store(path_to_file) else None
+    path_to_store = get_store_path(path_to_file)
+    if not is_store(path_to_store):
+        return None
+    header = json.loads((path_to_store / HEADER_NAME).read_text())
+    stat = path_to_file.stat()
+    if header.get("source_size") != stat.st_size or header.get("source_mtime_ns") != stat.st_mtime_ns:
+        return None
+    return path_to_store
+
+
+class FMIStore(Mapping):
+    """Class to read channels from the chunked store.
+
+    Behaves like the dict loaded from pickle, but channel is decoded only when requested.
+    Only the depth and the last requested channel are kept decoded.
+    """
+
+    def __init__(self, path_to_store: Path, depth_key: str = "DEPT") -> None:
+        self.path = path_to_store
+        self.header: dict = json.loads((path_to_store / HEADER_NAME).read_text())
+        self.channels: dict[str, dict] = self.header["channels"]
+        self.chunk_rows: int = self.header["chunk_rows"]
+        self.depth_key = depth_key
+        self._decoded: dict[str, NDArray] = {}
+
+    def __getitem__(self, key: str) -> NDArray:
+        if key not in self.channels:
+            raise KeyError(key)
+        if key not in self._decoded:
+            # drop previously decoded channel, depth is small and used everywhere
+            self._decoded = {k: v for k, v in self._decoded.items() if k == self.depth_key}
+            self._decoded[key] = self.read_rows(key)
+        return self._decoded[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.channels)
+
+    def __len__(self) -> int:
+        return len(self.channels)
+
+    def shape(self, key: str) -> tuple[int, ...]:
+        """Method to return shape of the channel without decoding it."""
+        return tuple(self.channels[key]["shape"])
+
+    def dtype(self, key: str) -> np.dtype:
+        """Method to return dtype of the channel without decoding it."""
+        return np.dtype(self.channels[key]["dtype"])
+
+    def read_chunk(self, key: str, ix: int) -> NDArray:
+        """Method to decode one chunk of rows of the channel."""
+        info = self.channels[key]
+        raw = zlib.decompress((self.path / info["dir"] / f"{ix}{CHUNK_SUFFIX}").read_bytes())
+        return np.frombuffer(raw, dtype=info["dtype"]).reshape(-1, *info["shape"][1:])
+
+    def read_rows(self, key: str, start: int = 0, stop: int | None = None) -> NDArray:
+        """Method to read depth window of the channel, decoding only overlapping chunks.
+
+        Args:
+            key: channel name
+            start: first row
+            stop: last row (exclusive), by default end of the channel
+
+        Returns: array with rows [start, stop)
+
+        """
+        shape = self.shape(key)
+        start, stop, _ = slice(start, stop).indices(shape[0])
+        out = np.empty((max(stop - start, 0), *shape[1:]), dtype=self.dtype(key))
+        if not len(out):
+            return out
+        for ix in range(start // self.chunk_rows, (stop - 1) // self.chunk_rows + 1):
+            chunk_start = ix * self.chunk_rows
+            chunk = self.read_chunk(key, ix)
+            lo, hi = max(start, chunk_start), min(stop, chunk_start + len(chunk))
+            out[lo - start : hi - start] = chunk[lo - chunk_start : hi - chunk_start]
+        return out
+
+
+def main() -> None:
+    """Method to convert folder with FMI files to stores from the command line."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("folder", type=Path, help="folder with FMI files")
+    parser.add_argument("--overwrite", action="store_true", help="convert files even if up-to-date store exists")
+    args = parser.parse_args()
+
+    for path_to_store in convert_fmi_folder(args.folder, overwrite=args.overwrite):
+        print(f"Created {path_to_store}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Module to prepare logview tracks for the visible depth window."""
+
+import threading
+
+import numpy as np
+from numpy.typing import NDArray
+
+from .processing import decimate_rows
+
+
+class TrackPyramid:
+    """Class keeps FMI track at resolutions reduced 2, 4, 8, ... times along depth.
+
+    Level 0 is the full resolution track itself, other levels are built on the first
+    request directly from it, so zooming in reads full resolution rows of the window only.
+    """
+
+    def __init__(self, data: NDArray, reducer: str = "mean") -> None:
+        self.levels: dict[int, NDArray] = {0: data}
+        self.reducer = reducer
+        self.n_rows: int = len(data)
+        self.lock = threading.Lock()
+
+    def get_level(self, level: int) -> NDArray:
+        """Method to return the track reduced 2 ** level times along depth."""
+        with self.lock:
+            if level not in self.levels:
+                self.levels[level] = decimate_rows(self.levels[0], 2**level, reducer=self.reducer)
+            return self.levels[level]
+
+    def get_window(self, start: int, stop: int, target_height: int) -> tuple[int, NDArray]:
+        """Method to return rows of the window at the coarsest level with at least target_height rows.
+
+        Args:
+            start: first row of the window at full resolution
+            stop: row after the last one of the window at full resolution
+            target_height: N of rows wanted, about twice the pixel height of the plot
+
+        Returns: level and rows of the window at that level
+
+        """
+        n_rows = max(stop - start, 1)
+        level = int(np.floor(np.log2(n_rows / target_height))) if n_rows > target_height else 0
+        if level == 0:
+            # invalid values are treated the same way as within reduced levels
+            return level, decimate_rows(self.levels[0][start:stop], 1, reducer=self.reducer)
+        factor = 2**level
+        return level, self.get_level(level)[start // factor : -(-stop // factor)]
+
+
+def get_window_rows(depth: NDArray, top: float, bottom: float) -> tuple[int, int]:
+    """Method to return full resolution rows covering depth window, whole track for NaN window."""
+    if np.isnan(top) or np.isnan(bottom):
+        return 0, len(depth)
+    top, bottom = sorted((top, bottom))
+    start = max(int(np.searchsorted(depth, top, side="left")) - 1, 0)
+    stop = min(int(np.searchsorted(depth, bottom, side="right")) + 1, len(depth))
+    return start, stop
+
+
+def get_viewport_tracks(  # noqa: PLR0913
+    depth: TrackPyramid,
+    tracks: dict[str, tuple[TrackPyramid, float]],
+    top: float,
+    bottom: float,
+    target_height: int,
+    sigma: float | None = None,
+) -> tuple[NDArray, dict[str, NDArray]]:
+    """Method to prepare FMI tracks for the visible depth window.
+
+    Args:
+        depth: pyramid of FMI depth
+        tracks: name of the track to its pyramid and scale the rows are multiplied by
+        top: top of the window, NaN for the whole track
+        bottom: bottom of the window, NaN for the whole track
+        target_height: N of rows wanted, about twice the pixel height of the plot
+        sigma: sigma of gaussian smoothing applied to the window, None to skip it
+
+    Returns: depth of the window rows and float32 rows of every track
+
+    """
+    start, stop = get_window_rows(depth.levels[0], top, bottom)
+    _, window_depth = depth.get_window(start, stop, target_height)
+    window_tracks = {}
+    if sigma:
+        # scipy.ndimage is heavy to import and is needed only for smoothing
+        from scipy.ndimage import gaussian_filter
+
+    for name, (pyramid, scale) in tracks.items():
+        _, rows = pyramid.get_window(start, stop, target_height)
+        if sigma:
+            rows = gaussian_filter(rows, sigma=sigma, output=np.float32)
+        window_tracks[name] = rows * scale if scale != 1 else rows
+    return np.asarray(window_depth, dtype=np.float32), window_tracks
@@ -1,36 +1,224 @@
 """Module for visualizations."""
 
+import functools
 import warnings
 
 import numpy as np
 import pandas as pd
-import plotly
 import plotly.graph_objects as go
 from numpy.typing import NDArray
 from plotly.colors import qualitative
-from plotly.subplots import make_subplots
-from statsmodels.api import OLS, add_constant
+
+from .constants import (
+    CROSS_PLOT_DENSITY_BINS,
+    CROSS_PLOT_DENSITY_THRESHOLD,
+    CROSS_PLOT_MODE,
+    FMI_SEGMENTATION_RANGE,
+    FMI_TRACK_RENDER_MODE,
+    LOGVIEW_TARGET_HEIGHT,
+    SCATTER_RENDER_MODE,
+    WEBGL_POINT_THRESHOLD,
+)
+from .downsampling import downsample_curve
+from .formations import FormationIntervals
+from .processing import fit_lines, get_group_slices
+from .rendering import apply_colormap, encode_image
 
 
 warnings.filterwarnings("ignore")
-import matplotlib
-matplotlib.use("Qt5Agg")
-import matplotlib.pyplot as plt
-# from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 
-def logview(  # noqa: PLR0913 , PLR0912, PLR0915
+
+# style shared by axes of all logview tracks
+LOGVIEW_AXIS_STYLE: dict = {
+    "side": "top",
+    "tickangle": -90,
+    "tickfont": {"color": "white"},
+    "title": {"font": {"color": "white"}},
+    "showgrid": True,
+    "gridcolor": "gray",
+    "gridwidth": 0.2,
+    "layer": "below traces",
+}
+
+
+def get_scatter_type(n_points: int, render_mode: str = SCATTER_RENDER_MODE) -> str:
+    """Method to choose SVG or WebGL scatter trace.
+
+    Args:
+        n_points: N of points of the trace
+        render_mode: "svg", "webgl" or "auto" to use webgl above WEBGL_POINT_THRESHOLD points
+
+    Returns: "scatter" or "scattergl"
+
+    """
+    if render_mode == "webgl" or (render_mode == "auto" and n_points > WEBGL_POINT_THRESHOLD):
+        return "scattergl"
+    return "scatter"
+
+
+def get_scatter_class(n_points: int, render_mode: str = SCATTER_RENDER_MODE) -> type[go.Scatter | go.Scattergl]:
+    """Method to return trace class chosen by get_scatter_type."""
+    return go.Scattergl if get_scatter_type(n_points, render_mode) == "scattergl" else go.Scatter
+
+
+@functools.cache
+def get_logview_template() -> go.layout.Template:
+    """Method to return layout template of logview, it is validated once and shared by all figures."""
+    return go.layout.Template(
+        layout={
+            "showlegend": False,
+            "plot_bgcolor": "black",
+            "paper_bgcolor": "black",
+            "xaxis": LOGVIEW_AXIS_STYLE,
+            "yaxis": {key: value for key, value in LOGVIEW_AXIS_STYLE.items() if key not in ("side", "tickangle")},
+        },
+    )
+
+
+def build_logview_figure(tracks: list[tuple[list[dict], dict]], col_depth: str = "DEPTH") -> go.Figure:
+    """Method to assemble logview figure from tracks in one pass, without validation of traces and layout.
+
+    Tracks are laid out as make_subplots does for one row with shared depth axis.
+
+    Args:
+        tracks: traces of every track as dicts and properties of its x axis
+        col_depth: title of the depth axis
+
+    Returns: plotly figure
+
+    """
+    n_cols = max(len(tracks), 1)
+    spacing = 0.2 / n_cols
+    width = (1 - spacing * (n_cols - 1)) / n_cols
+    data = []
+    layout = {"template": get_logview_template()}
+    for i, (traces, x_axis) in enumerate(tracks, start=1):
+        suffix = "" if i == 1 else str(i)
+        for trace in traces:
+            data.append({**trace, "xaxis": f"x{suffix}", "yaxis": f"y{suffix}"})
+        left = (i - 1) * (width + spacing)
+        layout[f"xaxis{suffix}"] = {"anchor": f"y{suffix}", "domain": [left, left + width], **x_axis}
+        # image traces would lock aspect ratio of their y axis, tracks are stretched along depth instead
+        layout[f"yaxis{suffix}"] = {"anchor": f"x{suffix}", "domain": [0, 1], "scaleanchor": False}
+        if i > 1:
+            layout[f"yaxis{suffix}"].update(matches="y", showticklabels=False)
+    layout["yaxis"] = {
+        **layout.get("yaxis", {}),
+        "title": {"text": col_depth},
+        "autorange": "reversed",
+        "tickformat": ".0f",
+    }
+    return go.Figure(data=data, layout=layout, _validate=False)
+
+
+def get_curve_trace(
+    values: NDArray,
+    depth: NDArray,
+    max_points: int | None = LOGVIEW_TARGET_HEIGHT,
+    render_mode: str = SCATTER_RENDER_MODE,
+    **kwargs: object,
+) -> dict:
+    """Method to create trace of log curve downsampled for display.
+
+    Args:
+        values: values of the curve
+        depth: depth of the curve
+        max_points: N of points to downsample the curve to, about twice the pixel height of the track;
+            None to keep all samples
+        render_mode: "svg", "webgl" or "auto"
+        kwargs: other properties of the trace
+
+    Returns: scatter trace as dict
+
+    """
+    depth, values = np.asarray(depth), np.asarray(values, dtype=np.float64)
+    if max_points is not None:
+        depth, values = downsample_curve(depth, values, max_points)
+    return {"type": get_scatter_type(len(values), render_mode), "x": values, "y": depth, **kwargs}
+
+
+def get_fmi_track_data(
+    data: NDArray,
+    fmi_depth: NDArray,
+    colorscale: str,
+    render_mode: str = FMI_TRACK_RENDER_MODE,
+    value_range: tuple[float, float] | None = None,
+) -> dict:
+    """Method to return data attributes of FMI track trace, also used to update the shown trace in place.
+
+    Args:
+        data: 2d track, depth x columns
+        fmi_depth: depth of the track rows, evenly sampled
+        colorscale: name of plotly colorscale
+        render_mode: "image" to colour-map the track and embed it as image,
+            "heatmap" to send the values as they are
+        value_range: values mapped to the ends of the colorscale, taken from the whole track
+            so colours do not change with zoom; range of the data by default
+
+    Returns: attributes of go.Image or go.Heatmap trace
+
+    """
+    zmin, zmax = value_range if value_range is not None else (None, None)
+    if render_mode == "heatmap":
+        if value_range is None:
+            return {"z": data, "y": fmi_depth}
+        return {"z": data, "y": fmi_depth, "zmin": zmin, "zmax": zmax}
+    depth_step = (fmi_depth[-1] - fmi_depth[0]) / (len(fmi_depth) - 1) if len(fmi_depth) > 1 else 1
+    return {
+        "source": encode_image(apply_colormap(data, colorscale, zmin=zmin, zmax=zmax)),
+        "x0": 0,
+        "dx": 1,
+        "y0": float(fmi_depth[0]),
+        "dy": float(depth_step),
+    }
+
+
+def get_fmi_track_trace(  # noqa: PLR0913
+    data: NDArray,
+    fmi_depth: NDArray,
+    colorscale: str,
+    render_mode: str = FMI_TRACK_RENDER_MODE,
+    name: str | None = None,
+    value_range: tuple[float, float] | None = None,
+) -> dict:
+    """Method to create trace of FMI image or segmentation track.
+
+    Args:
+        data: 2d track, depth x columns
+        fmi_depth: depth of the track rows, evenly sampled
+        colorscale: name of plotly colorscale
+        render_mode: "image" or "heatmap", see get_fmi_track_data
+        name: name of the trace
+        value_range: values mapped to the ends of the colorscale, see get_fmi_track_data
+
+    Returns: heatmap or image trace as dict
+
+    """
+    track_data = get_fmi_track_data(data, fmi_depth, colorscale, render_mode=render_mode, value_range=value_range)
+    if render_mode == "heatmap":
+        return {"type": "heatmap", **track_data, "colorscale": colorscale, "showscale": False, "name": name}
+    return {"type": "image", **track_data, "hovertemplate": "Depth: %{y:.1f}<extra></extra>", "name": name}
+
+
+def logview(  # noqa: PLR0913
     df_log: pd.DataFrame,
     fmi_image: NDArray | None = None,
     fmi_depth: NDArray | None = None,
     fmi_segmentation: NDArray | None = None,
     fmi_porosity: NDArray | None = None,
+    fmi_sweep: NDArray | None = None,
+    sweep_thresholds: NDArray | None = None,
+    fmi_image_range: tuple[float, float] | None = None,
     df_lith_mixed: pd.DataFrame | None = pd.DataFrame(),
     df_lith_dominant: pd.DataFrame | None = pd.DataFrame(),
-    df_formation: pd.DataFrame | None = pd.DataFrame(),
+    formation_intervals: FormationIntervals | None = None,
     df_drilling: pd.DataFrame = pd.DataFrame(),
     features_to_log: list = [],
     col_depth: str = "DEPTH",
-) -> plotly.subplots.make_subplots:
+    fmi_render_mode: str = FMI_TRACK_RENDER_MODE,
+    max_points: int | None = LOGVIEW_TARGET_HEIGHT,
+    scatter_render_mode: str = SCATTER_RENDER_MODE,
+) -> go.Figure:
     """Method to visualize the logs.
 
     Args:
@@ -39,37 +227,27 @@ def logview(  # noqa: PLR0913 , PLR0912, PLR0915
         fmi_depth: dataframe containing FMI depth data
         fmi_segmentation: dataframe containing FMI segmentation data
         fmi_porosity: dataframe containing FMI porosity data
+        fmi_sweep: whashout content (depth x threshold) for a range of thresholds
+        sweep_thresholds: thresholds of the fmi_sweep columns
+        fmi_image_range: values of full resolution FMI image mapped to the ends of its colorscale
         df_lith_mixed: dataframe containing mixed lithology data
         df_lith_dominant: dataframe containing dominant lithology data
-        df_formation: dataframe containing formation tops data
+        formation_intervals: formation tops, every interval is drawn as one rectangle
         features_to_log: list of features to log
         df_drilling: dataframe containing drilling data
         col_depth: column name for depth
+        fmi_render_mode: "image" to embed FMI image and segmentation as images, "heatmap" to send values
+        max_points: N of points curves are downsampled to, None to keep all samples
+        scatter_render_mode: "svg", "webgl" or "auto" to draw long curves with webgl
 
     Returns:
-        plotly.subplots.make_subplots: plotly figure
+        go.Figure: plotly figure, traces of curves and FMI tracks have [source, name] as meta,
+            so traces with equal names are told apart
     """
-    num_cols: int = df_log.shape[1]
-    if not df_drilling.empty:
-        num_cols += df_drilling.shape[1]
-    # Add columns for additional data
-    if not fmi_image is None:
-        num_cols += 1
-    if not fmi_segmentation is None:
-        num_cols += 1
-    if not fmi_porosity is None:
-        num_cols += 1
-    if not df_lith_mixed.empty:
-        num_cols += 1
-    if not df_lith_dominant.empty:
-        num_cols += 1
-    if not df_formation.empty:
-        num_cols += 1
-    # Create the figure
-    fig = make_subplots(rows=1, cols=num_cols, shared_yaxes=True)
+    # every track is its traces and properties of its x axis, the figure is assembled at once
+    tracks: list[tuple[list[dict], dict]] = []
+    curve_style = {"mode": "lines", "line": {"color": "white", "width": 1}}
     features_logs = [col for col in df_log.columns if col not in [col_depth] + ["WELL"]]
-    # init counter or trace number
-    col_numbers = 0
     # check if bit size in drilling data if so, plot it first
     if not df_drilling.empty:
         features_drilling = [col for col in df_drilling.columns if col not in [col_depth] + ["WELL"]]
@@ -84,234 +262,285 @@ def logview(  # noqa: PLR0913 , PLR0912, PLR0915
                 and pd.api.types.is_numeric_dtype(df_drilling[col])
                 and df_drilling[col].notna().sum() > 0
             ]
-            fig.add_trace(
-                go.Scatter(
-                    x=df_drilling[bit_col],
-                    y=df_drilling[col_depth_drilling[0]],
-                    mode="lines",
-                    line={"color": "white", "width": 1},
-                    name=bit_col,
-                    fill="tozerox",
-                ),
-                row=1,
-                col=1,
-            )
-            fig.update_xaxes(
-                title={"text": bit_col, "font": {"color": "white"}},
-                row=1,
-                col=col_numbers + 1,
-                side="top",
-                tickangle=-90,
-                tickfont={"color": "white"},
-                showgrid=True,
-                gridcolor="gray",
-                gridwidth=0.2,
-                layer="below traces",
+            # filled trace is kept in SVG
+            bit_trace = get_curve_trace(
+                df_drilling[bit_col],
+                df_drilling[col_depth_drilling[0]],
+                max_points=max_points,
+                render_mode="svg",
+                name=bit_col,
+                meta=["drilling", bit_col],
+                fill="tozerox",
+                **curve_style,
             )
-            col_numbers += 1
+            tracks.append(([bit_trace], {"title": {"text": bit_col}}))
 
         for feat in features_drilling:
-            print(f"Plotting drilling feature: {feat}, dtype: {df_drilling[feat].dtype}, NaNs: {df_drilling[feat].isna().sum()}")
-            fig.add_trace(
-                go.Scatter(
-                    x=df_drilling[feat],
-                    y=df_drilling[col_depth],
-                    mode="lines",
-                    line={"color": "white", "width": 1},
-                    name=feat,
-                ),
-                row=1,
-                col=col_numbers + 1,
-            )
-
-            fig.update_xaxes(
-                title={"text": feat, "font": {"color": "white"}},
-                row=1,
-                col=col_numbers + 1,
-                side="top",
-                tickangle=-90,
-                tickfont={"color": "white"},
-                showgrid=True,
-                gridcolor="gray",
-                gridwidth=0.2,  # Set thinner grid lines
-                layer="below traces",  # Ensure grid is below the curves
+            trace = get_curve_trace(
+                df_drilling[feat],
+                df_drilling[col_depth],
+                max_points=max_points,
+                render_mode=scatter_render_mode,
+                name=feat,
+                meta=["drilling", feat],
+                **curve_style,
             )
-            col_numbers += 1
+            tracks.append(([trace], {"title": {"text": feat}}))
 
     for feat in features_logs:
-        fig.add_trace(
-            go.Scatter(
-                x=df_log[feat],
-                y=df_log[col_depth],
-                mode="lines",
-                line={"color": "white", "width": 1},
-                name=feat,
-            ),
-            row=1,
-            col=col_numbers + 1,
+        trace = get_curve_trace(
+            df_log[feat],
+            df_log[col_depth],
+            max_points=max_points,
+            render_mode=scatter_render_mode,
+            name=feat,
+            meta=["logs", feat],
+            **curve_style,
         )
-
-        fig.update_xaxes(
-            title={"text": feat, "font": {"color": "white"}},
-            row=1,
-            col=col_numbers + 1,
-            side="top",
-            tickangle=-90,
-            tickfont={"color": "white"},
-            showgrid=True,
-            gridcolor="gray",
-            gridwidth=0.2,  # Set thinner grid lines
-            layer="below traces",  # Ensure grid is below the curves
-        )
-        if feat in features_to_log:
-            fig.update_xaxes(col=col_numbers + 1, type="log")
-
-        col_numbers += 1
+        tracks.append(([trace], {"title": {"text": feat}, "type": "log" if feat in features_to_log else "-"}))
 
     # plot fmi image original
     if fmi_image is not None:
-        fig.add_trace(
-            go.Heatmap(
-                z=fmi_image,
-                y=fmi_depth,
-                colorscale="viridis",
-                showscale=False,
-            ),
-            row=1,
-            col=col_numbers + 1,
+        trace = get_fmi_track_trace(
+            fmi_image,
+            fmi_depth,
+            "viridis",
+            render_mode=fmi_render_mode,
+            name="FMI Image",
+            value_range=fmi_image_range,
         )
-        fig.update_xaxes(
-            title="FMI Image",
-            titlefont={"color": "white"},
-            row=1,
-            col=col_numbers + 1,
-            side="top",
-            tickangle=-90,
-            tickfont={"color": "white"},
-            gridcolor="gray",
-            gridwidth=0.2,
-            layer="below traces",
-        )
-        col_numbers += 1
+        trace["meta"] = ["fmi", "FMI Image"]
+        tracks.append(([trace], {"title": {"text": "FMI Image"}}))
 
     # plot segmentation results for fmi image
     if fmi_segmentation is not None:
-        fig.add_trace(
-            go.Heatmap(
-                z=fmi_segmentation,
-                y=fmi_depth,
-                colorscale="gray",
-                showscale=False,
-            ),
-            row=1,
-            col=col_numbers + 1,
+        trace = get_fmi_track_trace(
+            fmi_segmentation,
+            fmi_depth,
+            "gray",
+            render_mode=fmi_render_mode,
+            name="FMI Segmentation",
+            value_range=FMI_SEGMENTATION_RANGE,
         )
-        fig.update_xaxes(
-            title="FMI Segmentation",
-            titlefont={"color": "white"},
-            row=1,
-            col=col_numbers + 1,
-            side="top",
-            tickangle=-90,
-            tickfont={"color": "white"},
-            gridcolor="gray",
-            gridwidth=0.2,
-            layer="below traces",
-        )
-        col_numbers += 1
+        trace["meta"] = ["fmi", "FMI Segmentation"]
+        tracks.append(([trace], {"title": {"text": "FMI Segmentation"}}))
 
     if fmi_porosity is not None:
-        fig.add_trace(
-            go.Scatter(
-                x=fmi_porosity,
-                y=fmi_depth,
-                mode="lines",
-                line={"color": "blue", "width": 1},
-                name="FMI Porosity",
-            ),
-            row=1,
-            col=col_numbers + 1,
+        trace = get_curve_trace(
+            fmi_porosity,
+            fmi_depth,
+            max_points=max_points,
+            render_mode=scatter_render_mode,
+            name="FMI Porosity",
+            meta=["fmi", "FMI Porosity"],
+            mode="lines",
+            line={"color": "blue", "width": 1},
         )
+        tracks.append(([trace], {"title": {"text": "FMI Porosity"}}))
+
+    if fmi_sweep is not None:
+        trace = {
+            "type": "heatmap",
+            "z": fmi_sweep,
+            "x": sweep_thresholds,
+            "y": fmi_depth,
+            "colorscale": "viridis",
+            "showscale": False,
+            "hovertemplate": "Threshold: %{x:.0f}<br>Depth: %{y:.1f}<br>Whashout: %{z:.2f}<extra></extra>",
+        }
+        tracks.append(([trace], {"title": {"text": "Whashout vs threshold"}}))
+
+    if formation_intervals is not None and len(formation_intervals):
+        # the last formation is open ended, cut it at the bottom of the plotted data
+        depth_bottoms = [df[col_depth].max() for df in (df_log, df_drilling) if col_depth in df]
+        if fmi_depth is not None:
+            depth_bottoms.append(np.nanmax(fmi_depth))
+        df_intervals = formation_intervals.get_intervals(bottom_limit=max(depth_bottoms, default=None))
+        # one trace per formation, every interval of it is a separate closed rectangle
+        traces = []
+        for formation, df_zone in df_intervals.groupby("FORMATION", sort=False):
+            tops, bottoms = df_zone["TOP"].to_numpy(), df_zone["BOTTOM"].to_numpy()
+            gaps = np.full(len(tops), None)
+            traces.append(
+                {
+                    "type": "scatter",
+                    "x": np.tile([0, 100, 100, 0, 0, None], len(tops)),
+                    "y": np.column_stack([tops, tops, bottoms, bottoms, tops, gaps]).ravel(),
+                    "fill": "toself",
+                    "mode": "lines",
+                    "name": formation,
+                    "hoveron": "fills",
+                },
+            )
+        tracks.append((traces, {"title": {"text": "Formation tops"}, "automargin": True}))
 
-        fig.update_xaxes(
-            title={"text": "FMI Porosity", "font": {"color": "white"}},
-            row=1,
-            col=col_numbers + 1,
-            side="top",
-            tickangle=-90,
-            tickfont={"color": "white"},
-            showgrid=True,
-            gridcolor="gray",
-            gridwidth=0.2,  # Set thinner grid lines
-            layer="below traces",  # Ensure grid is below the curves
-        )
-        col_numbers += 1
+    return build_logview_figure(tracks, col_depth=col_depth)
 
-    if not df_formation.empty:
-        features_to_drop = ["DEPTH"]
-        cols_zone = [col for col in df_formation.columns if col not in features_to_drop]
 
-        for jx, zone in enumerate(cols_zone):
-            fig.add_trace(
-                go.Scatter(
-                    x=df_formation[zone],
-                    y=df_formation[col_depth],
-                    fill="tozerox",
-                    mode="lines",
-                    name=zone,
-                ),
-                row=1,
-                col=col_numbers + 1,
-            )
+def get_bin_edges(values: NDArray, scale: str = "linear", n_bins: int = CROSS_PLOT_DENSITY_BINS) -> NDArray:
+    """Method to return bin edges spanning the values, evenly spaced in log10 for log scale.
+
+    Args:
+        values: values without NaN, positive for log scale
+        scale: "linear" or "log"
+        n_bins: N of bins
+
+    Returns: n_bins + 1 edges
+
+    """
+    low, high = values.min(), values.max()
+    if high <= low:
+        high = low * 10 if scale == "log" else low + 1
+    if scale == "log":
+        edges = np.logspace(np.log10(low), np.log10(high), n_bins + 1)
+        # rounding of logspace must not leave the extreme values out of the bins
+        edges[0], edges[-1] = low, high
+        return edges
+    return np.linspace(low, high, n_bins + 1)
+
+
+def get_bin_centers(edges: NDArray, scale: str = "linear") -> NDArray:
+    """Method to return centers of bins, geometric for log scale."""
+    return np.sqrt(edges[1:] * edges[:-1]) if scale == "log" else (edges[1:] + edges[:-1]) / 2
+
+
+def get_density_grids(  # noqa: PLR0913
+    x: NDArray,
+    y: NDArray,
+    x_edges: NDArray,
+    y_edges: NDArray,
+    groups: NDArray | None = None,
+    n_groups: int = 1,
+) -> tuple[NDArray, NDArray, NDArray]:
+    """Method to count points within 2d bins, per group, and marginal counts in one pass.
+
+    Args:
+        x: x values
+        y: y values
+        x_edges: bin edges along x
+        y_edges: bin edges along y
+        groups: group code of every point from 0 to n_groups - 1, e.g. formation codes
+        n_groups: N of groups
+
+    Returns: counts of shape (n_groups, N y bins, N x bins) and marginal counts along x and y
+
+    """
+    n_x, n_y = len(x_edges) - 1, len(y_edges) - 1
+    # points on the last edge belong to the last bin as in np.histogram
+    x_ix = np.minimum(np.searchsorted(x_edges, x, side="right") - 1, n_x - 1)
+    y_ix = np.minimum(np.searchsorted(y_edges, y, side="right") - 1, n_y - 1)
+    valid = (x_ix >= 0) & (y_ix >= 0) & (x <= x_edges[-1]) & (y <= y_edges[-1])
+    flat = y_ix * n_x + x_ix
+    if groups is not None:
+        flat = flat + groups * (n_x * n_y)
+        valid &= groups >= 0
+    counts = np.bincount(flat[valid], minlength=n_groups * n_y * n_x).reshape(n_groups, n_y, n_x)
+    return counts, counts.sum(axis=(0, 1)), counts.sum(axis=(0, 2))
+
+
+def get_step_trace(edges: NDArray, counts: NDArray, orientation: str = "v", **kwargs: object) -> go.Scatter:
+    """Method to draw histogram from precomputed counts as filled steps, valid on log axes as well."""
+    steps_edges, steps_counts = np.repeat(edges, 2)[1:-1], np.repeat(counts, 2)
+    if orientation == "h":
+        return go.Scatter(x=steps_counts, y=steps_edges, mode="lines", fill="tozerox", **kwargs)
+    return go.Scatter(x=steps_edges, y=steps_counts, mode="lines", fill="tozeroy", **kwargs)
+
+
+def get_density_traces(  # noqa: PLR0913
+    x_data: NDArray,
+    y_data: NDArray,
+    x_scale: str,
+    y_scale: str,
+    codes: NDArray | None = None,
+    names: list[str] | None = None,
+    colors: list[str] | None = None,
+) -> list[go.Heatmap | go.Contour | go.Scatter]:
+    """Method to create traces of density cross plot with marginal histograms.
+
+    Only binned counts are sent: a heatmap of all points, or contour lines of every
+    formation in its colour when codes are given.
+
+    Args:
+        x_data: x values without NaN
+        y_data: y values without NaN
+        x_scale: "linear" or "log", bins are evenly spaced on the axis
+        y_scale: "linear" or "log"
+        codes: formation code of every point to draw density of every formation separately
+        names: name of every formation code
+        colors: colour of every formation code
+
+    Returns: density traces followed by marginal histograms of x and y
 
-        fig.update_xaxes(
-            title="Formation tops",
-            titlefont={"color": "white"},
-            row=1,
-            col=col_numbers + 1,
-            side="top",
-            tickangle=-90,
-            tickfont={"color": "white"},
-            automargin=True,
-            showgrid=True,
-            gridcolor="gray",
-            gridwidth=0.2,
-            layer="below traces",
+    """
+    x_edges, y_edges = get_bin_edges(x_data, x_scale), get_bin_edges(y_data, y_scale)
+    x_centers, y_centers = get_bin_centers(x_edges, x_scale), get_bin_centers(y_edges, y_scale)
+    n_groups = len(names) if codes is not None else 1
+    counts, x_marginal, y_marginal = get_density_grids(x_data, y_data, x_edges, y_edges, codes, n_groups)
+
+    traces = []
+    if codes is None:
+        total = counts[0].astype(np.float32)
+        total[total == 0] = np.nan  # empty bins are transparent
+        traces.append(
+            go.Heatmap(
+                z=total,
+                x=x_centers,
+                y=y_centers,
+                colorscale="viridis",
+                colorbar={"title": {"text": "N points", "font": {"color": "white"}}, "tickfont": {"color": "white"}},
+                hovertemplate="<b>X:</b> %{x}<br><b>Y:</b> %{y}<br><b>N points:</b> %{z}<extra></extra>",
+                name="Density",
+            ),
         )
-        col_numbers += 1
-
-    fig.update_yaxes(
-        title_text="DEPTH",
-        row=1,
-        col=1,
-        autorange="reversed",
-        tickformat=".0f",
-        tickfont={"color": "white"},
-        titlefont={"color": "white"},
-        showgrid=True,
-        gridcolor="gray",
-        gridwidth=0.2,
-        layer="below traces",
+    else:
+        for i, (formation, color) in enumerate(zip(names, colors, strict=True)):
+            traces.append(
+                go.Contour(
+                    z=counts[i],
+                    x=x_centers,
+                    y=y_centers,
+                    contours={"coloring": "lines"},
+                    ncontours=6,
+                    colorscale=[[0, color], [1, color]],
+                    line={"width": 1.5},
+                    showscale=False,
+                    showlegend=True,
+                    name=formation,
+                ),
+            )
+    traces.append(
+        get_step_trace(x_edges, x_marginal, yaxis="y2", opacity=0.5, line={"color": "blue"}, showlegend=False),
     )
-
-    fig.update_layout(
-        showlegend=False,
-        plot_bgcolor="black",
-        paper_bgcolor="black",
+    traces.append(
+        get_step_trace(
+            y_edges,
+            y_marginal,
+            orientation="h",
+            xaxis="x2",
+            opacity=0.5,
+            line={"color": "green"},
+            showlegend=False,
+        ),
     )
-
-    return fig
+    return traces
 
 
-def cross_plot(  # noqa: PLR0913, PLR0912
+def cross_plot(  # noqa: PLR0913, PLR0912, PLR0915
     df_cur: pd.DataFrame,
     x_col: str,
     y_col: str,
     x_scale: str = "linear",
     y_scale: str = "linear",
     interpolate: bool = False,
+    scatter_render_mode: str = SCATTER_RENDER_MODE,
+    plot_mode: str = CROSS_PLOT_MODE,
+    density_by_formation: bool = False,
 ) -> go.Figure:
-    """Method to visualize the cross plot using Plotly."""
+    """Method to visualize the cross plot using Plotly.
+
+    Markers are drawn with webgl for many points; above CROSS_PLOT_DENSITY_THRESHOLD points
+    "auto" plot_mode shows binned density with marginal histograms computed in NumPy instead.
+    """
     # Handle non-positive values for log scale
     if x_scale == "log":
         df_cur = df_cur[df_cur[x_col] > 0]
@@ -330,8 +559,18 @@ def cross_plot(  # noqa: PLR0913, PLR0912
     if "FORMATION" in df_cur.columns:
         df_cur["FORMATION"] = df_cur["FORMATION"].ffill()
 
-    x_data = df_cur[x_col]
-    y_data = df_cur[y_col]
+    x_data = df_cur[x_col].to_numpy(dtype=np.float64)
+    y_data = df_cur[y_col].to_numpy(dtype=np.float64)
+    codes, names = None, []
+    if "FORMATION" in df_cur.columns:
+        codes, names = pd.factorize(df_cur["FORMATION"])
+    # rows are filtered once, every trace and fit below reads the same arrays
+    valid = np.isfinite(x_data) & np.isfinite(y_data)
+    x_data, y_data = x_data[valid], y_data[valid]
+    if codes is not None:
+        codes = codes[valid]
+    color_palette = qualitative.Plotly
+    colors = [color_palette[i % len(color_palette)] for i in range(len(names))]
 
     x_bins = {}
     y_bins = {}
@@ -349,33 +588,48 @@ def cross_plot(  # noqa: PLR0913, PLR0912
         }
 
     fig = go.Figure()
-
-    if "FORMATION" in df_cur.columns:
-        unique_formations = df_cur["FORMATION"].unique()
-        color_palette = qualitative.Plotly
-        color_map = {formation: color_palette[i % len(color_palette)] for i, formation in enumerate(unique_formations)}
-        df_cur["color"] = df_cur["FORMATION"].map(color_map)
-    else:
-        df_cur["color"] = "royalblue"
-
-    if "FORMATION" in df_cur.columns:
-        for formation in unique_formations:
-            formation_data = df_cur[df_cur["FORMATION"] == formation]
+    is_density = plot_mode == "density" or (plot_mode == "auto" and len(x_data) > CROSS_PLOT_DENSITY_THRESHOLD)
+    if is_density:
+        by_formation = density_by_formation and codes is not None
+        density_traces = get_density_traces(
+            x_data,
+            y_data,
+            x_scale,
+            y_scale,
+            codes=codes if by_formation else None,
+            names=names,
+            colors=colors,
+        )
+        # marginal histograms are the last two traces and are added after the trendline
+        fig.add_traces(density_traces[:-2])
+    elif codes is not None:
+        # rows above the first formation top have code -1 and are not drawn as markers
+        has_formation = codes >= 0
+        fits = fit_lines(x_data[has_formation], y_data[has_formation], codes[has_formation], len(names))
+        scatter_class = get_scatter_class(len(x_data), scatter_render_mode)
+        order, group_slices = get_group_slices(codes, len(names))
+        x_sorted, y_sorted = x_data[order], y_data[order]
+        for i, (formation, color, rows) in enumerate(zip(names, colors, group_slices, strict=True)):
+            hovertemplate = (
+                f"<b>X:</b> %{{x}}<br><b>Y:</b> %{{y}}<br><b>Formation:</b> {formation}<br>"
+                f"<b>Fit:</b> y = {fits['intercept'][i]:.2f} + {fits['slope'][i]:.2f}x, "
+                f"R² = {fits['r_squared'][i]:.2f}<extra></extra>"
+            )
             fig.add_trace(
-                go.Scatter(
-                    x=formation_data[x_col],
-                    y=formation_data[y_col],
+                scatter_class(
+                    x=x_sorted[rows],
+                    y=y_sorted[rows],
                     mode="markers",
                     name=formation,
-                    marker={"color": color_map[formation]},
-                    text=formation_data["FORMATION"],
-                    hovertemplate="<b>X:</b> %{x}<br><b>Y:</b> %{y}<br><b>Formation:</b> %{text}<br><extra></extra>",
+                    marker={"color": color},
+                    hovertemplate=hovertemplate,
                     showlegend=True,
                 ),
             )
     else:
+        scatter_class = get_scatter_class(len(x_data), scatter_render_mode)
         fig.add_trace(
-            go.Scatter(
+            scatter_class(
                 x=x_data,
                 y=y_data,
                 mode="markers",
@@ -385,52 +639,49 @@ def cross_plot(  # noqa: PLR0913, PLR0912
             ),
         )
 
-    df_no_na = df_cur.dropna(subset=[x_col, y_col])
-    X = add_constant(df_no_na[x_col].values)
-    y = df_no_na[y_col].values
-    model = OLS(y, X).fit()
-    trendline_x = np.linspace(df_no_na[x_col].min(), df_no_na[x_col].max(), 100)
-    trendline_y = model.predict(add_constant(trendline_x))
-
-    intercept = model.params[0]
-    slope = model.params[1]
-    r_squared = model.rsquared
+    fit = fit_lines(x_data, y_data)
+    intercept, slope, r_squared = fit["intercept"][0], fit["slope"][0], fit["r_squared"][0]
+    trendline_x = np.linspace(x_data.min(), x_data.max(), 100)
+    trendline_y = intercept + slope * trendline_x
 
     fig.add_trace(
         go.Scatter(
             x=trendline_x,
             y=trendline_y,
             mode="lines",
-            name="Trendline (OLS)",
+            name="Trendline (least squares)",
             line={"color": "red", "dash": "dash"},
             hovertemplate=f"y = {intercept:.2f} + {slope:.2f}x<br>R² = {r_squared:.2f}<br>",
         ),
     )
 
-    fig.add_trace(
-        go.Histogram(
-            x=x_data,
-            name=f"{x_col}",
-            yaxis="y2",
-            opacity=0.5,
-            marker={"color": "blue"},
-            showlegend=False,
-            autobinx=x_scale != "log",
-            xbins=x_bins if x_scale == "log" else None,
-        ),
-    )
-    fig.add_trace(
-        go.Histogram(
-            y=y_data,
-            name=f"{y_col}",
-            xaxis="x2",
-            opacity=0.5,
-            marker={"color": "green"},
-            showlegend=False,
-            autobiny=y_scale != "log",
-            ybins=y_bins if y_scale == "log" else None,
-        ),
-    )
+    if is_density:
+        fig.add_traces(density_traces[-2:])
+    else:
+        fig.add_trace(
+            go.Histogram(
+                x=x_data,
+                name=f"{x_col}",
+                yaxis="y2",
+                opacity=0.5,
+                marker={"color": "blue"},
+                showlegend=False,
+                autobinx=x_scale != "log",
+                xbins=x_bins if x_scale == "log" else None,
+            ),
+        )
+        fig.add_trace(
+            go.Histogram(
+                y=y_data,
+                name=f"{y_col}",
+                xaxis="x2",
+                opacity=0.5,
+                marker={"color": "green"},
+                showlegend=False,
+                autobiny=y_scale != "log",
+                ybins=y_bins if y_scale == "log" else None,
+            ),
+        )
 
     fig.update_layout(
         xaxis={
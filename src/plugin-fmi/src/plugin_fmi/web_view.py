@@ -0,0 +1,188 @@
+"""Module with persistent web view to show plotly figures."""
+
+import functools
+import tempfile
+from pathlib import Path
+
+import plotly
+import plotly.graph_objects as go
+from plotly.offline import get_plotlyjs
+from qtpy.QtCore import QObject, QUrl, Signal, Slot
+from qtpy.QtWebChannel import QWebChannel
+from qtpy.QtWebEngineWidgets import QWebEngineView
+from qtpy.QtWidgets import QWidget
+
+from .serialization import dumps, encode_arrays, get_figure_json
+
+
+PAGE_HTML: str = r"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<script src="plotly.min.js"></script>
+<script src="qrc:///qtwebchannel/qwebchannel.js"></script>
+<style>
+    html, body { margin: 0; height: 100%; background-color: black; }
+    #plot { width: 100%; height: 100%; }
+</style>
+</head>
+<body>
+<div id="plot"></div>
+<script>
+    var figure = {data: [], layout: {}};
+    var plotDiv = document.getElementById("plot");
+    var bridge = null;
+    var isListening = false;
+    new QWebChannel(qt.webChannelTransport, function (channel) {
+        bridge = channel.objects.bridge;
+    });
+    function onRelayout(event) {
+        if (bridge === null) {
+            return;
+        }
+        for (const [key, value] of Object.entries(event)) {
+            if (/^yaxis\d*\.autorange$/.test(key)) {
+                bridge.on_autorange(plotDiv.clientHeight);
+                return;
+            }
+            if (/^yaxis\d*\.range\[0\]$/.test(key)) {
+                bridge.on_relayout(value, event[key.replace("[0]", "[1]")], plotDiv.clientHeight);
+                return;
+            }
+            if (/^yaxis\d*\.range$/.test(key)) {
+                bridge.on_relayout(value[0], value[1], plotDiv.clientHeight);
+                return;
+            }
+        }
+    }
+    function restyleTraces(updates) {
+        for (const [ix, attrs] of Object.entries(updates)) {
+            const wrapped = {};
+            for (const [key, value] of Object.entries(attrs)) {
+                wrapped[key] = [value];
+            }
+            Plotly.restyle(plotDiv, wrapped, [Number(ix)]);
+        }
+    }
+    function updateFigure(update) {
+        figure.data.length = update.n_traces;
+        for (const [ix, trace] of Object.entries(update.traces)) {
+            figure.data[Number(ix)] = trace;
+        }
+        if (update.layout !== null) {
+            figure.layout = update.layout;
+        }
+        Plotly.react(plotDiv, figure.data, figure.layout, {responsive: true});
+        if (!isListening) {
+            plotDiv.on("plotly_relayout", onRelayout);
+            isListening = true;
+        }
+    }
+</script>
+</body>
+</html>
+"""
+
+
+@functools.cache
+def get_page_path() -> Path:
+    """Method to write the page with bundled plotly.js once per plotly version and return its path."""
+    page_dir = Path(tempfile.gettempdir()) / f"napari_fmi_plotly_{plotly.__version__}"
+    page_dir.mkdir(exist_ok=True)
+    path_to_js = page_dir / "plotly.min.js"
+    if not path_to_js.exists():
+        path_to_js.write_text(get_plotlyjs(), encoding="utf-8")
+    path_to_page = page_dir / "index.html"
+    path_to_page.write_text(PAGE_HTML, encoding="utf-8")
+    return path_to_page
+
+
+class ViewportBridge(QObject):
+    """Class receives zoom and pan events of the plot from the page over the web channel."""
+
+    viewport_changed = Signal(float, float, int)  # top, bottom, height of the plot in pixels
+
+    @Slot(float, float, int)
+    def on_relayout(self, top: float, bottom: float, height: int) -> None:
+        """Method to pass new depth range of the plot."""
+        self.viewport_changed.emit(top, bottom, height)
+
+    @Slot(int)
+    def on_autorange(self, height: int) -> None:
+        """Method to pass reset of the depth range, NaN stands for the whole range."""
+        self.viewport_changed.emit(float("nan"), float("nan"), height)
+
+
+class PlotlyView(QWebEngineView):
+    """Class shows plotly figures in one long-lived page.
+
+    The page and plotly.js are loaded once; every next figure is pushed to the page
+    and drawn with Plotly.react, sending only the traces and layout which changed.
+    Zoom and pan of the depth axis are reported by viewport_changed.
+    """
+
+    def __init__(self, parent: QWidget | None = None) -> None:
+        super().__init__(parent)
+        self.bridge = ViewportBridge(self)
+        self.viewport_changed = self.bridge.viewport_changed
+        self.channel = QWebChannel(self.page())
+        self.channel.registerObject("bridge", self.bridge)
+        self.page().setWebChannel(self.channel)
+        self.is_loaded: bool = False
+        # JSON of traces and layout shown in the page
+        self.traces: list[str] = []
+        self.layout: str | None = None
+        # figure to show once the page is loaded
+        self.pending: tuple[list[str], str] | None = None
+        self.loadFinished.connect(self.on_load_finished)
+        self.setUrl(QUrl.fromLocalFile(str(get_page_path())))
+
+    def on_load_finished(self, ok: bool) -> None:
+        """Method to show the figure requested while the page was loading."""
+        self.is_loaded = ok
+        self.traces, self.layout = [], None
+        if ok and self.pending is not None:
+            self.push_update(*self.pending)
+            self.pending = None
+
+    def show_figure(self, fig: go.Figure) -> None:
+        """Method to show the figure, replacing the current one."""
+        # arrays are sent as base64 float32 instead of decimal text
+        traces, layout = get_figure_json(fig)
+        if not self.is_loaded:
+            self.pending = (traces, layout)
+            return
+        self.push_update(traces, layout)
+
+    def push_update(self, traces: list[str], layout: str) -> None:
+        """Method to send changed traces and layout to the page.
+
+        Args:
+            traces: JSON of every trace of the figure
+            layout: JSON of the figure layout
+
+        """
+        changed = ",".join(
+            f'"{ix}": {trace}'
+            for ix, trace in enumerate(traces)
+            if ix >= len(self.traces) or self.traces[ix] != trace
+        )
+        layout_update = layout if layout != self.layout else "null"
+        update = f'{{"n_traces": {len(traces)}, "traces": {{{changed}}}, "layout": {layout_update}}}'
+        self.page().runJavaScript(f"updateFigure({update});")
+        self.traces, self.layout = traces, layout
+
+    def restyle_traces(self, updates: dict[int, dict]) -> None:
+        """Method to replace data of the traces shown in the page, keeping zoom of the plot.
+
+        Args:
+            updates: index of the trace to its attributes, e.g. {"x": ..., "y": ...}
+
+        """
+        if not self.is_loaded or not updates:
+            return
+        self.page().runJavaScript(f"restyleTraces({dumps(encode_arrays(updates))});")
+        # restyled traces differ from the last figure, so they are sent again with the next one
+        for ix in updates:
+            if ix < len(self.traces):
+                self.traces[ix] = ""
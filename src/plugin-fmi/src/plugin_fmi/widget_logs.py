@@ -1,69 +1,154 @@
 """Module to visualize logging data and BHI."""
 
-import os
 import warnings
 from contextlib import suppress
-from functools import reduce
 from pathlib import Path
-import tempfile
+from typing import TYPE_CHECKING
 
 import numpy as np
 import pandas as pd
 from napari.utils.notifications import show_info
 from numpy.typing import NDArray
-from qtpy.QtCore import QUrl
-from qtpy.QtWebEngineWidgets import QWebEngineView
 from qtpy.QtWidgets import (
     QFileDialog,
+    QVBoxLayout,
 )
-from scipy.ndimage import gaussian_filter, gaussian_filter1d
+from scipy.ndimage import gaussian_filter1d
 
-from .constants import ENCODED_NONE, SAMPLING_STEP, SIGMA
+from .constants import FMI_SEGMENTATION_RANGE, LOGVIEW_TARGET_HEIGHT, SIGMA, SWEEP_N_THRESHOLDS
+from .depth_frame import DepthFrame, get_depth_column
+from .downsampling import downsample_curve
+from .formations import FormationIntervals
 from .gui_logs import LogsBase
-from .loaders import load_formation_tops, load_las
-from .processing import pivot_data_for_visualization
+from .loaders import get_las_curves, load_formation_tops, load_las
+from .processing import (
+    decimate_rows,
+    get_decimation_factor,
+    get_whashout_sweep,
+    prepare_logview_track,
+)
+from .products import ProductKey
 from .protocol_classes import FMIProcessorProtocol
-from .visualization import cross_plot, logview
+from .viewport import TrackPyramid, get_viewport_tracks, get_window_rows
+from .visualization import cross_plot, get_fmi_track_data, logview
+from .workers import LatestValueWorker
+
+
+if TYPE_CHECKING:
+    from .web_view import PlotlyView
 
 
 warnings.filterwarnings("ignore")
 
 
+def compute_viewport_update(request: tuple) -> dict[int, dict]:
+    """Method to prepare data of logview traces for the visible depth window.
+
+    FMI tracks are read from the pyramid level matching the window, curves are cut
+    to the window and downsampled, both to about twice the pixel height of the plot.
+
+    Args:
+        request: top and bottom of the window (NaN for the whole well), height of the plot in pixels
+            and output of LogsProcessor.get_viewport_sources
+
+    Returns: index of the trace to its new data attributes
+
+    """
+    top, bottom, height, (depth_pyramid, fmi_tracks, curves) = request
+    target_height = 2 * height
+    updates = {}
+    if fmi_tracks:
+        window_depth, window_tracks = get_viewport_tracks(
+            depth_pyramid,
+            {name: (pyramid, scale) for name, (_, pyramid, scale, _, _) in fmi_tracks.items()},
+            top,
+            bottom,
+            target_height,
+            sigma=SIGMA,
+        )
+        for name, (ix, _, _, colorscale, value_range) in fmi_tracks.items():
+            if colorscale is None:
+                updates[ix] = {"x": window_tracks[name], "y": window_depth}
+            else:
+                # colours follow the range of the whole track, not of the window
+                updates[ix] = get_fmi_track_data(window_tracks[name], window_depth, colorscale, value_range=value_range)
+    for ix, (depth, values) in curves.items():
+        start, stop = get_window_rows(depth, top, bottom)
+        window_depth, window_values = downsample_curve(depth[start:stop], values[start:stop], target_height)
+        updates[ix] = {"x": window_values, "y": window_depth}
+    return updates
+
+
 class LogsProcessor(LogsBase):
     """Class to create widget for logging data manipulation."""
 
     def __init__(self, fmi_processor: FMIProcessorProtocol) -> None:
         super().__init__(fmi_processor.viewer)
         self.fmi_processor = fmi_processor
+        # products prepared from the current channel, shared with the main widget
+        self.products = fmi_processor.products
         self.init_click_events()
 
         self.fmi_image_cur: NDArray | None = None
+        self.fmi_image_range: tuple[float, float] | None = None  # values mapped to the ends of the colorscale
         self.fmi_segmentation_results: NDArray | None = None
         self.fmi_image_depth_cur: NDArray | None = None
         self.fmi_porosity: NDArray | None = None
+        self.fmi_sweep: NDArray | None = None
+        self.sweep_thresholds: NDArray | None = None
+        self.decimation_factor: int = 1  # N of FMI rows reduced to one row of logview tracks
 
         self.formation_tops_data: pd.DataFrame = pd.DataFrame()
-        self.formation_tops_data_processed: pd.DataFrame = pd.DataFrame()
-        self.drilling_data: pd.DataFrame = pd.DataFrame()
-        self.logging_data: pd.DataFrame = pd.DataFrame()
+        self.formation_intervals: FormationIntervals | None = None
+        # .las files by source name, only their headers are read until curves are plotted
+        self.las_files: dict[str, Path] = {}
+        self.las_curves: dict[str, list[str]] = {}
 
         self.drilling_data_to_plot: pd.DataFrame = pd.DataFrame()
         self.logging_data_to_plot: pd.DataFrame = pd.DataFrame()
-        self.formation_tops_cross_plot: pd.DataFrame = pd.DataFrame()
         self.fmi_data_to_plot: pd.DataFrame = pd.DataFrame()
 
-        # dict to map curve names to dataframe
-        self.curve_mapping = {}
+        # curves of logs, drilling data and FMI porosity, each at its own depth sampling
+        self.depth_frame = DepthFrame()
 
         # prepare fmi image for visualization
+        self.update_fmi_data()
+
+        # dataframe to store the data for cross plot
+        self.cross_plot_data = pd.DataFrame()
+
+        # one view per tab, created on the first plot and updated in place afterwards
+        self.browser: PlotlyView | None = None
+        self.browser_cross_plot: PlotlyView | None = None
+
+        # full resolution data behind logview traces, read again on zoom and pan of the plot
+        self.viewport_sources: tuple | None = None
+        self.viewport_worker = LatestValueWorker(compute=compute_viewport_update)
+        self.viewport_worker.result_ready.connect(self.on_viewport_update_ready)
+        self.viewport_worker.error.connect(self.on_viewport_update_error)
+
+    def update_fmi_data(self) -> None:
+        """Method to take FMI products of the channel and threshold currently selected in the main widget."""
+        self.fmi_image_cur, self.fmi_segmentation_results, self.fmi_image_depth_cur = None, None, None
+        self.fmi_image_range = None
+        self.fmi_porosity, self.fmi_data_to_plot = None, pd.DataFrame()
+        self.depth_frame.remove_source("PHIT_FMI")
+        if self.fmi_processor.current_file is not None:
+            n_rows = len(self.fmi_processor.current_file["DEPT"])
+            self.decimation_factor = get_decimation_factor(n_rows, LOGVIEW_TARGET_HEIGHT)
         self.prepare_fmi_image()
         self.prepare_fmi_segmentation_results()
         self.prepare_fmi_image_depth()
         self.prepare_fmi_porosity()
         self.map_curve_to_dataframe()
 
-        # dataframe to store the data for cross plot
-        self.cross_plot_data = pd.DataFrame()
+    def get_channel_key(self) -> ProductKey:
+        """Method to return key of products which do not depend on threshold."""
+        return self.products.make_key(*self.fmi_processor.get_current_key(), factor=self.decimation_factor)
+
+    def get_mask_key(self) -> ProductKey:
+        """Method to return key of products derived from the current mask."""
+        return self.products.make_key(*self.fmi_processor.fmi_mask_key, factor=self.decimation_factor)
 
     def init_click_events(self) -> None:
         """Method to connect click events with actions."""
@@ -101,11 +186,10 @@ class LogsProcessor(LogsBase):
         if output == "":
             return
         self.path_to_well_logging: Path = Path(output)
-        self.logging_data: pd.DataFrame = load_las(self.path_to_well_logging)
+        self.add_las_file("WELL_LOGGING", self.path_to_well_logging)
         self.update_selectbox_for_logs()
         self.update_qlabel_for_selected_logs()
         self.map_curve_to_dataframe()
-        self.merge_dataframes_for_crossplot()
 
     def load_formation_tops_file(self) -> None:
         """Method to load formation tops .xlsx file."""
@@ -120,7 +204,7 @@ class LogsProcessor(LogsBase):
             show_info(msg)
             return
 
-        self.formation_tops_data_processed = pivot_data_for_visualization(self.formation_tops_data)
+        self.formation_intervals = FormationIntervals.from_table(self.formation_tops_data)
         self.update_qlabel_for_selected_formation_tops()
 
     def load_drilling_data_file(self) -> None:
@@ -131,40 +215,65 @@ class LogsProcessor(LogsBase):
         if output == "":
             return
         self.path_to_drilling_data: Path = Path(output)
-        self.drilling_data: pd.DataFrame = load_las(self.path_to_drilling_data)
+        self.add_las_file("DRILLING", self.path_to_drilling_data)
         self.update_selectbox_for_drilling()
         self.update_qlabel_for_selected_drilling()
         self.map_curve_to_dataframe()
-        self.merge_dataframes_for_crossplot()
+
+    def add_las_file(self, name: str, path_to_file: Path) -> None:
+        """Method to register .las file as the source of curves, only its header is read."""
+        self.las_files[name] = path_to_file
+        self.las_curves[name] = get_las_curves(path_to_file)
+        # curves of the previous file of the source are not valid anymore
+        self.depth_frame.remove_source(name)
+
+    def load_las_to_plot(self, name: str, curves: list[str]) -> pd.DataFrame:
+        """Method to load selected curves of .las file within the FMI depth window for logview.
+
+        Args:
+            name: source name of the file, e.g. "WELL_LOGGING"
+            curves: curves selected for visualization
+
+        Returns: dataframe with the curves and DEPTH column
+
+        """
+        depth_col = self.get_las_depth_column(name)
+        df_las = load_las(self.las_files[name], curves=[*curves, depth_col], depth_range=self.get_fmi_depth_range())
+        return df_las[[*curves, depth_col]].rename(columns={depth_col: "DEPTH"})
+
+    def get_las_depth_column(self, name: str) -> str:
+        """Method to return depth curve of .las file, the index curve of the file if none is named as depth."""
+        curves = self.las_curves[name]
+        return get_depth_column(curves) or curves[0]
+
+    def get_fmi_depth_range(self) -> tuple[float, float] | None:
+        """Method to return depth window of the current FMI channel, None if no channel is shown."""
+        if self.fmi_image_depth_cur is None or not np.isfinite(self.fmi_image_depth_cur).any():
+            return None
+        return float(np.nanmin(self.fmi_image_depth_cur)), float(np.nanmax(self.fmi_image_depth_cur))
 
     def prepare_well_logging_data_to_plot(self) -> None:
         """Method to prepare well logging data for visualization."""
-        # check if the logging data is empty
-        if self.logging_data.empty:
+        # check if the logging data is loaded
+        if "WELL_LOGGING" not in self.las_files:
             return
-        # check depth cols for logs and drilling
-        depth_col_for_logs = [
-            col for col in self.logging_data.columns if "depth" in col.lower() and "orig" not in col.lower()
-        ]
-        self.logging_data_to_plot = self.logging_data[self.logs_to_plot.get_selected_items() + depth_col_for_logs]
+        self.logging_data_to_plot = self.load_las_to_plot("WELL_LOGGING", self.logs_to_plot.get_selected_items())
 
     def prepare_drilling_data_to_plot(self) -> None:
         """Method to prepare drilling data for visualization."""
-        # check if the logging data is empty
-        if self.drilling_data.empty:
+        # check if the drilling data is loaded
+        if "DRILLING" not in self.las_files:
             return
-        # check depth cols for logs and drilling
-        depth_col_for_drilling = [
-            col for col in self.drilling_data.columns if "depth" in col.lower() and "orig" not in col.lower()
-        ]
-        self.drilling_data_to_plot = self.drilling_data[
-            self.drilling_logs_to_plot.get_selected_items() + depth_col_for_drilling
-        ]
+        self.drilling_data_to_plot = self.load_las_to_plot(
+            "DRILLING",
+            self.drilling_logs_to_plot.get_selected_items(),
+        )
 
     def plot_layout(self) -> None:
         """Method to plot the layout of the logging data."""
         self.prepare_well_logging_data_to_plot()
         self.prepare_drilling_data_to_plot()
+        self.prepare_fmi_sweep()
 
         # Define the columns and create the Plotly figure
         self.plot_main = logview(
@@ -173,178 +282,245 @@ class LogsProcessor(LogsBase):
             fmi_segmentation=self.fmi_segmentation_results,
             fmi_depth=self.fmi_image_depth_cur,
             fmi_porosity=self.fmi_porosity,
-            df_formation=self.formation_tops_data_processed,
+            fmi_sweep=self.fmi_sweep,
+            sweep_thresholds=self.sweep_thresholds,
+            fmi_image_range=self.fmi_image_range,
+            formation_intervals=self.formation_intervals,
             df_drilling=self.drilling_data_to_plot,
         )
 
-        # Generate the HTML with Plotly
-        html_content = self.plot_main.to_html(include_plotlyjs="cdn")
-
-        # Add custom CSS to change the background color of the container
-        css = """
-        <style>
-            body {
-                background-color: black;
-            }
-            .plot-container {
-                background-color: black;
-            }
-        </style>
+        # updates prepared for the previous figure refer to its traces
+        self.viewport_worker.cancel()
+        self.viewport_sources = self.get_viewport_sources()
+        if self.browser is None:
+            self.browser = self.init_plotly_view(self.logview_tab_layout)
+            self.browser.viewport_changed.connect(self.request_viewport_update)
+        self.browser.show_figure(self.plot_main)
+
+    def get_viewport_sources(self) -> tuple:
+        """Method to collect full resolution data behind logview traces which follow zoom of the plot.
+
+        Returns: pyramid of FMI depth, FMI tracks as name to (trace index, pyramid, scale, colorscale,
+            value range) with None colorscale for porosity, and curves as trace index to (depth, values)
+
         """
-        html_content = css + html_content
-
-        # Save the HTML content to a file
-        # file_path = os.path.abspath("plotly_chart.html")
-        # with open(file_path, "w") as f:
-        #     f.write(html_content)
-        
-        # Use system temp directory to avoid permission issues
-        temp_path = os.path.join(tempfile.gettempdir(), "plotly_chart.html")
-
-        # Save the HTML content to the temp file
-        with open(temp_path, "w", encoding="utf-8") as f:
-            f.write(html_content)
-            
-
-        # Load the HTML into QWebEngineView
-        self.browser = QWebEngineView()
-        self.browser.setUrl(QUrl.fromLocalFile(temp_path))
-        # Clear previous content from the tab layout
-        for i in reversed(range(self.logview_tab_layout.count())):
-            widget_to_remove = self.logview_tab_layout.itemAt(i).widget()
-            self.logview_tab_layout.removeWidget(widget_to_remove)
-            widget_to_remove.deleteLater()
-        self.logview_tab_layout.addWidget(self.browser)
+        # traces are found by their source and name, a curve may be drawn in several tracks
+        trace_indices: dict[tuple[str, str], list[int]] = {}
+        for ix, trace in enumerate(self.plot_main.data):
+            if trace.meta is not None:
+                trace_indices.setdefault(tuple(trace.meta), []).append(ix)
+        depth_pyramid, fmi_tracks = None, {}
+        current_file = self.fmi_processor.current_file
+        if current_file is not None:
+            channel_key = self.products.make_key(*self.fmi_processor.get_current_key())
+            depth_pyramid = self.products.get_or_compute(
+                channel_key,
+                "depth_pyramid",
+                lambda: TrackPyramid(current_file["DEPT"]),
+            )
+            if ("fmi", "FMI Image") in trace_indices:
+                fmi_image = current_file[self.fmi_processor.current_channel]
+                image_pyramid = self.products.get_or_compute(
+                    channel_key,
+                    "image_pyramid",
+                    lambda: TrackPyramid(fmi_image, reducer="mean"),
+                )
+                fmi_tracks["FMI Image"] = (
+                    trace_indices["fmi", "FMI Image"][0],
+                    image_pyramid,
+                    1,
+                    "viridis",
+                    self.fmi_image_range,
+                )
+        if depth_pyramid is not None and self.fmi_processor.fmi_mask_key is not None:
+            mask_key = self.products.make_key(*self.fmi_processor.fmi_mask_key)
+            fmi_mask, fmi_porosity = self.fmi_processor.fmi_mask, self.fmi_processor.fmi_porosity
+            if ("fmi", "FMI Segmentation") in trace_indices:
+                mask_pyramid = self.products.get_or_compute(
+                    mask_key,
+                    "segmentation_pyramid",
+                    lambda: TrackPyramid(fmi_mask, reducer="max"),
+                )
+                fmi_tracks["FMI Segmentation"] = (
+                    trace_indices["fmi", "FMI Segmentation"][0],
+                    mask_pyramid,
+                    255,
+                    "gray",
+                    FMI_SEGMENTATION_RANGE,
+                )
+            if ("fmi", "FMI Porosity") in trace_indices:
+                porosity_pyramid = self.products.get_or_compute(
+                    mask_key,
+                    "porosity_pyramid",
+                    lambda: TrackPyramid(fmi_porosity, reducer="mean"),
+                )
+                porosity_ix = trace_indices["fmi", "FMI Porosity"][0]
+                fmi_tracks["FMI Porosity"] = (porosity_ix, porosity_pyramid, 1, None, None)
+        curves = {}
+        for source, df_cur in (("logs", self.logging_data_to_plot), ("drilling", self.drilling_data_to_plot)):
+            if "DEPTH" not in df_cur:
+                continue
+            df_cur = df_cur.sort_values("DEPTH")
+            depth = df_cur["DEPTH"].to_numpy(dtype=np.float64)
+            for col in df_cur.columns:
+                if col == "DEPTH" or not pd.api.types.is_numeric_dtype(df_cur[col]):
+                    continue
+                for ix in trace_indices.get((source, col), []):
+                    curves[ix] = (depth, df_cur[col].to_numpy(dtype=np.float64))
+        return depth_pyramid, fmi_tracks, curves
+
+    def request_viewport_update(self, top: float, bottom: float, height: int) -> None:
+        """Method to prepare traces for the depth window shown after zoom or pan in background."""
+        if self.viewport_sources is None:
+            return
+        self.viewport_worker.submit((top, bottom, height, self.viewport_sources))
+
+    def on_viewport_update_ready(self, request: tuple, updates: dict[int, dict]) -> None:
+        """Method to show traces prepared for the depth window."""
+        # the figure could be replaced while the update was prepared
+        if request[3] is not self.viewport_sources or self.browser is None:
+            return
+        self.browser.restyle_traces(updates)
+
+    def on_viewport_update_error(self, _: tuple, error: Exception) -> None:
+        """Method to report failed preparation of traces, the plot keeps showing the previous window."""
+        show_info(f"Can not update logview for the depth window: {error}")
+
+    def shutdown(self) -> None:
+        """Method to stop the viewport worker and close the window, called when the main widget is deleted."""
+        self.viewport_worker.shutdown()
+        self.close()
 
     def plot_cross_plot(self) -> None:
         """Method to plot cross-plot."""
-        self.prepare_well_logging_data_to_plot()
-        self.prepare_drilling_data_to_plot()
-        self.merge_dataframes_for_crossplot()
         x_scale = self.scale_button_group_left.checkedButton().text()
         y_scale = self.scale_button_group_right.checkedButton().text()
         x_feature = self.combo_box_select_curve_left.currentText()
         y_feature = self.combo_box_select_curve_right.currentText()
-        interpolate = self.curve_mapping[x_feature] != self.curve_mapping[y_feature]
+        self.prepare_cross_plot_data(x_feature, y_feature)
+        # curves are already resampled on a common depth grid
         self.cross_plot = cross_plot(
             df_cur=self.cross_plot_data,
             x_col=x_feature,
             y_col=y_feature,
             x_scale=x_scale,
             y_scale=y_scale,
-            interpolate=interpolate,
         )
 
-        # Generate the HTML with Plotly
-        html_content_cross_plot = self.cross_plot.to_html(include_plotlyjs="cdn")
-
-        # Add custom CSS to change the background color of the container
-        css = """
-                <style>
-                    body {
-                        background-color: black;
-                    }
-                    .plot-container {
-                        background-color: black;
-                    }
-                </style>
-                """
-        html_content_cross_plot = css + html_content_cross_plot
-
-        # # Save the HTML content to a file
-        # file_path = os.path.abspath("plotly_cross_plot.html")
-        # with open(file_path, "w") as f:
-        #     f.write(html_content_cross_plot)
-        # Save the HTML content to a temporary file to avoid permission errors
-        temp_path_cross = os.path.join(tempfile.gettempdir(), "plotly_cross_plot.html")
-        with open(temp_path_cross, "w", encoding="utf-8") as f:
-            f.write(html_content_cross_plot)
-
-        # Load the HTML into QWebEngineView
-        self.browser_cross_plot = QWebEngineView()
-        self.browser_cross_plot.setUrl(QUrl.fromLocalFile(temp_path_cross))
-
-        # Clear previous content from the tab layout
-        for i in reversed(range(self.lower_part_layout.count())):
-            widget_to_remove = self.lower_part_layout.itemAt(i).widget()
-            self.lower_part_layout.removeWidget(widget_to_remove)
+        if self.browser_cross_plot is None:
+            self.browser_cross_plot = self.init_plotly_view(self.lower_part_layout)
+        self.browser_cross_plot.show_figure(self.cross_plot)
+
+    @staticmethod
+    def init_plotly_view(layout: QVBoxLayout) -> "PlotlyView":
+        """Method to replace content of the tab layout with the view for plotly figures."""
+        # Qt WebEngine is heavy to import and is loaded with the first plot
+        from .web_view import PlotlyView
+
+        for i in reversed(range(layout.count())):
+            widget_to_remove = layout.itemAt(i).widget()
+            layout.removeWidget(widget_to_remove)
             widget_to_remove.deleteLater()
-        self.lower_part_layout.addWidget(self.browser_cross_plot)
+        view = PlotlyView()
+        layout.addWidget(view)
+        return view
 
     def prepare_fmi_image(self) -> None:
         """Method to prepare FMI image for visualization."""
         # check if the layer exists
         if self.fmi_processor.current_layer is None:
             return
-        fmi_image_cur = self.fmi_processor.current_layer.data.copy()
-        fmi_image_cur = self.process_fmi_data(fmi_image_cur)
-        self.fmi_image_cur = fmi_image_cur
+        # read-only array from the channel cache, processing below does not modify it
+        fmi_image_cur = self.fmi_processor.current_file[self.fmi_processor.current_channel]
+        self.fmi_image_cur = self.products.get_or_compute(
+            self.get_channel_key(),
+            "image",
+            lambda: prepare_logview_track(fmi_image_cur, self.decimation_factor, reducer="mean", sigma=SIGMA),
+        )
+        self.fmi_image_range = self.get_fmi_image_range()
+
+    def get_fmi_image_range(self) -> tuple[float, float]:
+        """Method to return value range of the full resolution channel, so colours do not change with zoom."""
+        channel_stats = self.fmi_processor.get_channel_stats()
+        if channel_stats is not None and channel_stats["min"] is not None:
+            return channel_stats["min"], channel_stats["max"]
+        fmi_image = self.fmi_processor.current_file[self.fmi_processor.current_channel]
+        return self.products.get_or_compute(
+            self.get_channel_key(),
+            "image_range",
+            lambda: (float(np.nanmin(fmi_image)), float(np.nanmax(fmi_image))),
+        )
 
     def prepare_fmi_image_depth(self) -> None:
         """Method to prepare FMI image depth for visualization."""
         # check if the layer exists
         if self.fmi_processor.current_file is None:
             return
-        fmi_image_depth_cur = self.fmi_processor.current_file["DEPT"].copy()
-        fmi_image_depth_cur = self.sample_rows(fmi_image_depth_cur)
-        self.fmi_image_depth_cur = fmi_image_depth_cur
+        fmi_image_depth_cur = self.fmi_processor.current_file["DEPT"]
+        self.fmi_image_depth_cur = self.products.get_or_compute(
+            self.get_channel_key(),
+            "depth",
+            lambda: decimate_rows(fmi_image_depth_cur, self.decimation_factor, reducer="mean"),
+        )
 
     def prepare_fmi_segmentation_results(self) -> None:
         """Method to prepare FMI segmentation results for visualization."""
         # check if the layer exists
-        if self.fmi_processor.mask_layer is None:
+        if self.fmi_processor.mask_layer is None or self.fmi_processor.fmi_mask_key is None:
             return
-        fmi_segmentation_results = self.fmi_processor.mask_layer.data.copy()
-        fmi_segmentation_results = self.process_fmi_data(fmi_segmentation_results * 255)
-        self.fmi_segmentation_results = fmi_segmentation_results
+        # mask layer may hold pyramid levels, take full resolution mask instead;
+        # block max keeps thin washouts which would be skipped by taking every Nth row
+        fmi_mask = self.fmi_processor.fmi_mask
+        self.fmi_segmentation_results = self.products.get_or_compute(
+            self.get_mask_key(),
+            "segmentation",
+            lambda: prepare_logview_track(fmi_mask, self.decimation_factor, reducer="max", sigma=SIGMA) * 255,
+        )
 
     def prepare_fmi_porosity(self) -> None:
         """Method to prepare FMI porosity for visualization."""
         # check if the layer exists
-        if self.fmi_processor.fmi_mask is None:
+        if self.fmi_processor.fmi_mask is None or self.fmi_processor.fmi_mask_key is None:
             return
-        # prepare fmi porosity
-        fmi_mask = self.fmi_processor.fmi_mask.copy()
-        fmi_porosity = fmi_mask.sum(axis=1) / fmi_mask.shape[1]
-        # Remove NaN values form fmi image
-        fmi_porosity = self.process_fmi_data(fmi_porosity, single_dim=True)
-        self.fmi_porosity = fmi_porosity
-        # prepare dataframe sampled
-        depth_col = self.sample_rows(self.fmi_image_depth_cur)
-        fmi_porosity = self.sample_rows(fmi_porosity)
-        self.fmi_data_to_plot = pd.DataFrame({"DEPTH": depth_col, "PHIT_FMI": fmi_porosity})
+        # porosity over valid pixels is computed together with the mask
+        fmi_porosity = self.fmi_processor.fmi_porosity
+        # rows without valid pixels are skipped by the block mean
+        self.fmi_porosity = self.products.get_or_compute(
+            self.get_mask_key(),
+            "porosity",
+            lambda: prepare_logview_track(fmi_porosity, self.decimation_factor, reducer="mean", sigma=SIGMA),
+        )
+        self.fmi_data_to_plot = pd.DataFrame({"DEPTH": self.fmi_image_depth_cur, "PHIT_FMI": self.fmi_porosity})
+        self.depth_frame.add_source("PHIT_FMI", self.fmi_image_depth_cur, {"PHIT_FMI": self.fmi_porosity})
 
+    def prepare_fmi_sweep(self) -> None:
+        """Method to prepare whashout curves for a range of thresholds for visualization."""
+        self.fmi_sweep, self.sweep_thresholds = None, None
+        if not self.checkbox_threshold_sweep.isChecked() or self.fmi_processor.current_layer is None:
+            return
+        self.sweep_thresholds, self.fmi_sweep = self.products.get_or_compute(
+            self.get_channel_key(),
+            "sweep",
+            self.compute_fmi_sweep,
+        )
 
-    @staticmethod
-    def sample_rows(data: NDArray) -> NDArray:
-        """Method to sample every Nth row."""
-        return data[::SAMPLING_STEP]
-
-    def process_fmi_data(self, data: NDArray, single_dim: bool = False) -> NDArray:
-        """Method to process FMI data."""
-        # remove negative values
-        data = np.where(data < ENCODED_NONE, np.nan, data)
-        # substitute nan / inf to 0
-        data = np.nan_to_num(data, nan=0, posinf=0, neginf=0)
-        # sample every Nth row
-        data = self.sample_rows(data)
-        # apply smoothing
-        if single_dim:
-            return gaussian_filter1d(data, sigma=SIGMA)
-        return gaussian_filter(data, sigma=SIGMA)
+    def compute_fmi_sweep(self) -> tuple[NDArray, NDArray]:
+        """Method to compute smoothed whashout curves for thresholds up to the maximum of the channel."""
+        fmi_image = self.fmi_processor.current_file[self.fmi_processor.current_channel]
+        sweep_thresholds = np.linspace(0, self.fmi_processor.slider_threshold.maximum(), SWEEP_N_THRESHOLDS)
+        fmi_sweep = get_whashout_sweep(fmi_image, sweep_thresholds) / fmi_image.shape[1]
+        # smoothing along depth only, columns of different thresholds are not mixed
+        fmi_sweep = decimate_rows(fmi_sweep, self.decimation_factor, reducer="mean")
+        return sweep_thresholds, gaussian_filter1d(fmi_sweep, sigma=SIGMA, axis=0)
 
     def update_selectbox_for_logs(self) -> None:
         """Method to add select box for logs."""
-        if self.logging_data is None:
-            return
-        features_from_logs = [feat for feat in self.logging_data if "depth" not in feat.lower()]
+        features_from_logs = [feat for feat in self.las_curves.get("WELL_LOGGING", []) if "depth" not in feat.lower()]
         self.logs_to_plot.update_items(features_from_logs)
 
     def update_selectbox_for_drilling(self) -> None:
         """Method to add select box for drilling data."""
-        if self.drilling_data is None:
-            return
-        features_from_drilling = [feat for feat in self.drilling_data if "depth" not in feat.lower()]
+        features_from_drilling = [feat for feat in self.las_curves.get("DRILLING", []) if "depth" not in feat.lower()]
         self.drilling_logs_to_plot.update_items(features_from_drilling)
 
     def update_qlabel_for_selected_logs(self) -> None:
@@ -360,63 +536,35 @@ class LogsProcessor(LogsBase):
         self.loadded_drilling_file.setText(f"Drilling data file: {self.path_to_drilling_data.name}")
 
     def map_curve_to_dataframe(self) -> None:
-        """Method to map curve names to dataframe."""
-        curve_mapping_original = {
-            "WELL_LOGGING": list(self.logging_data.columns) if not self.logging_data.empty else [],
-            "DRILLING": list(self.drilling_data.columns) if not self.drilling_data.empty else [],
-            "PHIT_FMI": list(self.fmi_data_to_plot.columns) if not self.fmi_data_to_plot.empty else [],
-        }
-        self.curve_mapping = {
-            value: key
-            for key, values in curve_mapping_original.items()
-            if values  # Exclude empty lists
-            for value in values
-        }
-        # assign keys of the dict to the select curve widget
+        """Method to list curves available for cross plot in the select curve widgets."""
+        las_curve_names = [
+            curve
+            for name, curves in self.las_curves.items()
+            for curve in curves
+            if curve != self.get_las_depth_column(name)
+        ]
+        # curves of .las files are loaded into the depth frame only when they are cross plotted
+        curve_names = list(dict.fromkeys([*las_curve_names, *self.depth_frame.get_curve_names()]))
         self.combo_box_select_curve_left.clear()
         self.combo_box_select_curve_right.clear()
-        self.combo_box_select_curve_left.addItems(list(self.curve_mapping.keys()))
-        self.combo_box_select_curve_right.addItems(list(self.curve_mapping.keys()))
-
-    def merge_dataframes_for_crossplot(self) -> None:
-        """Method to merge dataframes for cross plot."""
-        # check if the dataframes are empty
-        df_fmi = pd.DataFrame()
-        if self.fmi_porosity is not None:
-            df_fmi = pd.DataFrame({"DEPTH": self.fmi_image_depth_cur, "PHIT_FMI": self.fmi_porosity})
-        # get depth column for the dataframes
-        depth_col_logging = [
-            col for col in self.logging_data.columns if "depth" in col.lower() and "orig" not in col.lower()
-        ]
-        depth_col_drilling = [
-            col for col in self.drilling_data.columns if "depth" in col.lower() and "orig" not in col.lower()
-        ]
-        # prepare formation tops data
-        self.prepare_formation_tops_data_for_crops_plot()
-        # renamge the depth column
-        if len(depth_col_logging):
-            self.logging_data.rename(columns={depth_col_logging[0]: "DEPTH"}, inplace=True)
-        if len(depth_col_drilling):
-            self.drilling_data.rename(columns={depth_col_drilling[0]: "DEPTH"}, inplace=True)
-        # check which dataframes are empty
-        list_df_to_merge = [
-            df_cur
-            for df_cur in [df_fmi, self.logging_data, self.drilling_data, self.formation_tops_cross_plot]
-            if not df_cur.empty
-        ]
-        # merge the dataframes on DEPTH
-        self.cross_plot_data = reduce(
-            lambda left, right: pd.merge(left, right, on="DEPTH", how="outer"),
-            list_df_to_merge,
-        ).sort_values("DEPTH")
-
-    def prepare_formation_tops_data_for_crops_plot(self) -> None:
-        """Method to prepare formation tops data for cross plot."""
-        # check if the formation tops data is empty
-        if self.formation_tops_data.empty:
+        self.combo_box_select_curve_left.addItems(curve_names)
+        self.combo_box_select_curve_right.addItems(curve_names)
+
+    def prepare_cross_plot_data(self, x_feature: str, y_feature: str) -> None:
+        """Method to put the two curves of cross plot and formation names on a common depth grid."""
+        self.load_cross_plot_curves([x_feature, y_feature])
+        # only the two curves are resampled, the coarser one onto depth of the finer one
+        self.cross_plot_data = self.depth_frame.get_cross_plot_data(x_feature, y_feature, mode="linear")
+        if self.formation_intervals is None:
             return
-        # prepare formation tops data
-        formation_tops = self.formation_tops_data_processed.copy()
-        formation_columns = [col for col in formation_tops.columns if "DEPTH" not in col]
-        formation_tops["FORMATION"] = self.formation_tops_data_processed[formation_columns].idxmax(axis=1)
-        self.formation_tops_cross_plot = formation_tops[["DEPTH", "FORMATION"]]
+        self.cross_plot_data["FORMATION"] = self.formation_intervals.lookup(self.cross_plot_data["DEPTH"].to_numpy())
+
+    def load_cross_plot_curves(self, curves: list[str]) -> None:
+        """Method to load curves of .las files which are not in the depth frame yet, whole depth range is read."""
+        for name, las_curves in self.las_curves.items():
+            loaded = list(self.depth_frame.sources.get(name, (None, {}))[1])
+            missing = [curve for curve in curves if curve in las_curves and curve not in loaded]
+            if missing:
+                depth_col = self.get_las_depth_column(name)
+                df_las = load_las(self.las_files[name], curves=[*loaded, *missing, depth_col])
+                self.depth_frame.add_table(name, df_las, depth_col=depth_col)
@@ -1,29 +1,105 @@
 """Module to create widget for FMI images processing."""
 
+from functools import partial
 from pathlib import Path
 from typing import TYPE_CHECKING, Any
 
-import cv2
 import numpy as np
-import pandas as pd
+from napari.layers import Layer
+from napari.qt.threading import thread_worker
 from napari.utils.notifications import show_info
 from napari.viewer import Viewer
+from numpy.typing import NDArray
 from qtpy.QtWidgets import QFileDialog, QTableWidgetItem
 
+from .cache import CachedFMIFile, ChannelCache
+from .constants import CHANNELS_TO_PARSE
+from .export import get_export_name, init_results_folders, save_mask, save_whashout_curve
+from .folder_index import index_opened_file, iter_folder_index
 from .gui_main import FMIProcessorBase
-from .loaders import get_available_files, load_fmi_pickle
-from .processing import get_boolean_mask, get_whashout_curve
+from .loaders import get_available_files
+from .prefetch import FilePrefetcher
+from .processing import get_mask_labels, get_whashout_curve_sorted, segment_fmi_image, sort_rows
+from .products import ProductRegistry
+from .pyramid import build_pyramid, load_or_build_pyramid
+from .storage import find_store
 from .widget_logs import LogsProcessor
+from .workers import LatestValueWorker, shutdown_workers
 
 
 if TYPE_CHECKING:
-    from numpy.typing import NDArray
+    from collections.abc import Mapping
+
 
-CHANNELS_TO_PARSE: list = ["DYN_HRUT", "DYN_HRLT", "STA_HRLT", "STA_HRUT"]
 IMAGE_SCALE: int = 20
 DEPTH_KEY: str = "DEPT"
 
 
+def get_mask_data(mask: NDArray, multiscale: bool) -> NDArray | list[NDArray]:
+    """Method to convert mask to labels data, block max keeps thin washouts visible on coarse levels."""
+    labels = get_mask_labels(mask)
+    return build_pyramid(labels, reducer="max") if multiscale else labels
+
+
+def set_layer_data(layer: Layer, data: NDArray | list[NDArray], name: str | None = None, reset_contrast_limits: bool = False) -> None:
+    """Method to replace data of the shown layer, the layer is redrawn once.
+
+    Events of the single assignments are held back and emitted after all of them, so the
+    canvas is not refreshed for data, name and contrast limits one after another.
+
+    Args:
+        layer: napari layer to update
+        data: new data of the layer
+        name: new name of the layer, None to keep it
+        reset_contrast_limits: whether contrast limits follow the new data
+
+    """
+    with layer.events.blocker_all():
+        layer.data = data
+        if name is not None:
+            layer.name = name
+        if reset_contrast_limits:
+            layer.reset_contrast_limits()
+    layer.events.data(value=layer.data)
+    layer.events.extent()
+    if name is not None:
+        layer.events.name()
+    if reset_contrast_limits:
+        layer.events.contrast_limits()
+    layer.refresh()
+
+
+def compute_threshold_products(request: tuple) -> tuple:
+    """Method to compute whashout curve and, if the image is given, mask for the threshold.
+
+    Args:
+        request: file and channel key, threshold, sorted rows, image or None, multiscale flag
+
+    Returns: whashout curve, mask, porosity and labels data; all but the curve are None if the image is not given
+
+    """
+    _, threshold, sorted_rows, image, multiscale = request
+    if image is None:
+        return get_whashout_curve_sorted(sorted_rows, threshold), None, None, None
+    mask, curve, porosity = segment_fmi_image(image, threshold)
+    return curve, mask, porosity, get_mask_data(mask, multiscale)
+
+
+def compute_channel_products(request: tuple) -> tuple:
+    """Method to prepare channel for display: sorted rows and mask for the threshold.
+
+    Args:
+        request: file and channel key, opened file, threshold
+
+    Returns: sorted rows, mask and porosity
+
+    """
+    (_, channel), fmi_file, threshold = request
+    image = fmi_file[channel]
+    mask, _, porosity = segment_fmi_image(image, threshold)
+    return sort_rows(image), mask, porosity
+
+
 class FMIProcessor(FMIProcessorBase):
     """Class to process FMI images."""
 
@@ -32,7 +108,7 @@ class FMIProcessor(FMIProcessorBase):
         self.viewer = napari_viewer
         self.init_click_events()
 
-        self.current_file: np.array | None = None  # current pickle file to upload
+        self.current_file: Mapping | None = None  # current pickle file or store to upload
         self.current_channel: str = None  # current channel to process within pickle file
 
         self.current_layer = None  # viewer layer where images are plotted
@@ -42,10 +118,37 @@ class FMIProcessor(FMIProcessorBase):
         self.curve_layer = None  # viewer layer to plot curve with content of washouts
         self.mask_layer = None  # viewer layer for mask
         self.fmi_mask: NDArray | None = None  # current fmi mask
+        self.fmi_porosity: NDArray | None = None  # share of valid pixels within the mask for every row
+        self.fmi_mask_key: tuple[Path, str, int] | None = None  # file, channel and threshold of the current mask
+        self.sorted_rows: NDArray | None = None  # current channel with every row sorted
+        self.sorted_rows_key: tuple[Path, str] | None = None  # file and channel of sorted rows
         self.output_name: str | None = None  # name of the output file
         self.path_xlsx_files: str | None = None  # path to store xlsx files
         self.path_img_files: str | None = None  # path to store segmentation results
         self.img_scale: str = IMAGE_SCALE
+        self.pyramid_key: tuple[Path, str] | None = None  # file and channel of the current pyramid
+        self.pyramid_levels: list[NDArray] | None = None  # levels of the current pyramid
+        self.pyramid_pending: set[tuple[Path, str]] = set()  # pyramids being built in background
+        self.folder_index: dict[str, dict] = {}  # metadata of files within the folder
+        self.index_worker = None  # collects metadata of the folder files in background
+        self.unindexed_files: set[Path] = set()  # files to index once they are opened
+        self.channel_cache = ChannelCache()  # decoded channels shared between files and widgets
+        # loads neighbouring files in background
+        self.prefetcher = FilePrefetcher(loader=partial(CachedFMIFile, cache=self.channel_cache))
+        # products prepared for the logs window, shared with it
+        self.products = ProductRegistry()
+        self.log_window: LogsProcessor | None = None  # logs window, reused between openings
+        # recompute products off the GUI thread, only results of the latest slider value are shown
+        self.threshold_worker = LatestValueWorker(compute=compute_threshold_products)
+        self.threshold_worker.result_ready.connect(self.on_threshold_products_ready)
+        self.threshold_worker.error.connect(self.on_worker_error)
+        self.channel_worker = LatestValueWorker(compute=compute_channel_products)
+        self.channel_worker.result_ready.connect(self.on_channel_products_ready)
+        self.channel_worker.error.connect(self.on_worker_error)
+        # threads are stopped when the widget is deleted, the logs window is added once it is created;
+        # the slot does not refer to the widget, so it is still called during its destruction
+        self.background_workers: list = [self.threshold_worker, self.channel_worker, self.prefetcher]
+        self.destroyed.connect(partial(shutdown_workers, self.background_workers))
 
     def init_click_events(self) -> None:
         """Method to connect click events with actions."""
@@ -60,8 +163,11 @@ class FMIProcessor(FMIProcessorBase):
         self.previous_file_button.clicked.connect(self.update_index_file_previous)
         # slider for threshold
         self.slider_threshold.valueChanged.connect(self.update_current_threshold)
+        self.slider_threshold.sliderReleased.connect(self.update_mask_on_release)
         # slider for aspect ratio
         self.slider_aspect_ratio.valueChanged.connect(self.update_aspect_ratio)
+        # checkbox for multiscale pyramid
+        self.checkbox_multiscale.toggled.connect(self.plot_fmi_channel)
         # save button
         self.button_save_results.clicked.connect(self.save_segmentation_results)
         # align with logging data button
@@ -73,7 +179,9 @@ class FMIProcessor(FMIProcessorBase):
         if output == "":
             return
         self.folder_target = Path(output)
+        self.prefetcher.clear()
         self.fmi_image_list = get_available_files(self.folder_target)
+        self.folder_index, self.unindexed_files = {}, set()
 
         self.label_folder_image.setText(self.folder_target.name)
         self.n_files_found: int = len(self.fmi_image_list)
@@ -83,6 +191,48 @@ class FMIProcessor(FMIProcessorBase):
             self.index_file = 0
             self.index_channel = 0
             self.update_current_file()
+        self.start_folder_indexing()
+
+    def start_folder_indexing(self) -> None:
+        """Method to collect channels and statistics of the folder files in background.
+
+        Only new or modified files are indexed, rows of the table are filled as entries arrive.
+        """
+        if self.index_worker is not None:
+            self.index_worker.quit()
+        self.index_worker = thread_worker(iter_folder_index)(self.folder_target, self.fmi_image_list)
+        self.index_worker.yielded.connect(partial(self.on_folder_entry, self.folder_target))
+        self.index_worker.start()
+
+    def on_folder_entry(self, path_to_folder: Path, indexed: tuple[Path, dict | None]) -> None:
+        """Method to take entry of the folder index, files left unindexed are indexed once opened."""
+        path_to_file, entry = indexed
+        if entry is not None:
+            self.on_file_indexed(path_to_folder, indexed)
+        elif path_to_folder == self.folder_target and find_store(path_to_file) is None:
+            # pickle is not decoded only to be indexed, broken store is not indexed at all
+            self.unindexed_files.add(path_to_file)
+            if self.index_file is not None and path_to_file == self.fmi_image_list[self.index_file]:
+                self.index_current_file()
+
+    def index_current_file(self) -> None:
+        """Method to index opened pickle in background, its channels are taken from the channel cache."""
+        path_to_file = self.fmi_image_list[self.index_file]
+        if path_to_file not in self.unindexed_files:
+            return
+        self.unindexed_files.discard(path_to_file)
+        worker = thread_worker(index_opened_file)(self.folder_target, path_to_file, self.current_file)
+        worker.returned.connect(partial(self.on_file_indexed, self.folder_target))
+        worker.start()
+
+    def on_file_indexed(self, path_to_folder: Path, indexed: tuple[Path, dict | None]) -> None:
+        """Method to add index entry of the file and show it in the table."""
+        path_to_file, entry = indexed
+        # entries of the previous folder may arrive after another folder is opened
+        if path_to_folder != self.folder_target or entry is None or path_to_file not in self.fmi_image_list:
+            return
+        self.folder_index[path_to_file.name] = entry
+        self.update_table_row(self.fmi_image_list.index(path_to_file), entry)
 
     def load_results_folder(self) -> None:
         """Method to load path to folder where results will be saved."""
@@ -100,9 +250,20 @@ class FMIProcessor(FMIProcessorBase):
         """Method to extend the table with images."""
         # set number of rows
         self.tableWidget.setRowCount(self.n_files_found)
-        # fill the table with images
+        # fill the table with images, channels and depth are added once files are indexed
         for ix, image in enumerate(self.fmi_image_list):
             self.tableWidget.setItem(ix, 0, QTableWidgetItem(image.name))
+            entry = self.folder_index.get(image.name)
+            if entry is not None:
+                self.update_table_row(ix, entry)
+
+    def update_table_row(self, ix: int, entry: dict) -> None:
+        """Method to show channels and depth range of the indexed file."""
+        channels = [channel for channel in entry["channels"] if channel.upper() in CHANNELS_TO_PARSE]
+        self.tableWidget.setItem(ix, 1, QTableWidgetItem(", ".join(channels) or "-"))
+        if entry["depth"] is not None:
+            depth_range = f"{entry['depth']['top']:.1f} - {entry['depth']['bottom']:.1f}"
+            self.tableWidget.setItem(ix, 2, QTableWidgetItem(depth_range))
 
     def configure_slider_for_channels(self) -> None:
         """Method to configure slider with channels."""
@@ -114,17 +275,31 @@ class FMIProcessor(FMIProcessorBase):
     def configure_slider_for_threshold(self) -> None:
         """Method to configure slider for threshold value."""
         if len(self.relevant_channels):
+            channel_stats = self.get_channel_stats()
+            if channel_stats is not None and channel_stats["max"] is not None:
+                max_value = channel_stats["max"]
+            else:
+                max_value = np.nanmax(self.current_file[self.current_channel])
             self.slider_threshold.setMinimum(0)
-            self.slider_threshold.setMaximum(np.max(self.current_file[self.current_channel]))
+            self.slider_threshold.setMaximum(int(max_value))
             self.slider_threshold.setValue(self.current_threshold)
 
     def update_file_info(self) -> None:
         """Method to update info about current file."""
         self.value_current_file.setText(self.fmi_image_list[self.index_file].name)
 
+    def get_channel_stats(self) -> dict | None:
+        """Method to return statistics of the current channel from the folder index."""
+        entry = self.folder_index.get(self.fmi_image_list[self.index_file].name)
+        if entry is None:
+            return None
+        return entry["channels"].get(self.current_channel)
+
     def update_channel_info(self) -> None:
         """Method to update info about channels for file."""
-        all_keys = self.current_file.keys()
+        # take channels from the index, so files without relevant channels are not decoded
+        entry = self.folder_index.get(self.fmi_image_list[self.index_file].name)
+        all_keys = entry["channels"].keys() if entry is not None else self.current_file.keys()
         self.relevant_channels = [channel for channel in all_keys if channel.upper() in CHANNELS_TO_PARSE]
         if not len(self.relevant_channels):
             show_info("File does not have relevant channels!")
@@ -136,7 +311,7 @@ class FMIProcessor(FMIProcessorBase):
 
         self.current_channel = self.relevant_channels[self.index_channel]
         self.value_current_channel.setText(self.current_channel)
-        self.plot_fmi_channel()
+        self.request_channel_products()
 
     def update_channel_by_slider(self, value: int) -> None:
         """Method to update slider for channels."""
@@ -145,7 +320,33 @@ class FMIProcessor(FMIProcessorBase):
         self.index_channel = value
         self.current_channel = self.relevant_channels[self.index_channel]
         self.value_current_channel.setText(self.current_channel)
+        self.request_channel_products()
+
+    def request_channel_products(self) -> None:
+        """Method to sort and threshold the current channel in background, the channel is shown once it is ready."""
+        # products of the previous channel are not needed anymore
+        self.threshold_worker.cancel()
+        self.channel_worker.submit(
+            (self.get_current_key(), self.current_file, self.current_threshold),
+        )
+
+    def on_worker_error(self, request: tuple, error: Exception) -> None:
+        """Method to report failed background recomputation, the key of the channel comes first in every request."""
+        path_to_file, channel = request[0]
+        show_info(f"Can not process channel {channel} of {path_to_file.name}: {error}")
+
+    def on_channel_products_ready(self, request: tuple, result: tuple) -> None:
+        """Method to show channel once it is sorted and thresholded in background."""
+        key, _, threshold = request
+        if key != self.get_current_key():
+            return
+        sorted_rows, mask, porosity = result
+        self.sorted_rows, self.sorted_rows_key = sorted_rows, key
+        self.set_fmi_mask(mask, porosity, (*key, threshold))
         self.plot_fmi_channel()
+        # threshold moved while the channel was prepared
+        if threshold != self.current_threshold:
+            self.request_threshold_products(build_mask=True)
 
     def update_index_file_previous(self) -> None:
         """Method to update current index for file to previous value."""
@@ -169,49 +370,147 @@ class FMIProcessor(FMIProcessorBase):
 
     def update_current_file(self) -> None:
         """Method to update currently processing file."""
-        self.current_file: dict[str, Any] = load_fmi_pickle(self.fmi_image_list[self.index_file])
+        self.current_file: Mapping[str, Any] = self.prefetcher.load(self.fmi_image_list[self.index_file])
         self.update_file_info()
         self.update_channel_info()
         self.configure_slider_for_channels()
         self.configure_slider_for_threshold()
+        self.index_current_file()
+        # start loading neighbours while the current file is processed
+        self.prefetcher.prefetch(self.fmi_image_list, self.index_file, self.current_channel)
+
+    def get_current_key(self) -> tuple[Path, str]:
+        """Method to return file and channel shown in the viewer."""
+        return self.fmi_image_list[self.index_file], self.current_channel
 
     def update_current_threshold(self, value: int) -> None:
         """Method to update current threshold value for the whashout detection."""
         self.current_threshold = value
-        self.plot_whashout_curve()
+        # full mask is O(H*W), while the slider is dragged it is rebuilt only if it is shown
+        mask_visible = self.mask_layer is not None and self.mask_layer.visible
+        self.request_threshold_products(build_mask=not self.slider_threshold.isSliderDown() or mask_visible)
+
+    def update_mask_on_release(self) -> None:
+        """Method to build the mask for the threshold selected when the slider is released."""
+        if self.fmi_mask_key != (*self.get_current_key(), self.current_threshold):
+            self.request_threshold_products(build_mask=True)
+
+    def request_threshold_products(self, build_mask: bool) -> None:
+        """Method to recompute whashout curve and mask for the current threshold in background."""
+        key = self.get_current_key()
+        if self.sorted_rows_key != key:
+            # channel is still being prepared, its products will use the current threshold
+            return
+        multiscale = self.current_layer is not None and self.current_layer.multiscale
+        image = self.current_file[self.current_channel] if build_mask else None
+        self.threshold_worker.submit((key, self.current_threshold, self.sorted_rows, image, multiscale))
+
+    def on_threshold_products_ready(self, request: tuple, result: tuple) -> None:
+        """Method to show whashout curve and mask computed in background."""
+        key, threshold, *_ = request
+        if key != self.get_current_key():
+            return
+        curve, mask, porosity, mask_data = result
+        self.whashout_curve = curve
+        self.show_whashout_curve()
+        if mask is not None:
+            self.set_fmi_mask(mask, porosity, (*key, threshold))
+            self.show_fmi_mask(mask_data)
 
     def update_fmi_mask(self) -> None:
         """Method to plot whashout mask."""
-        self.fmi_mask: NDArray = get_boolean_mask(
-            fmi_image=self.current_file[self.current_channel],
-            threshold=self.current_threshold,
-        )
+        key = (*self.get_current_key(), self.current_threshold)
+        if self.fmi_mask_key == key:
+            return
+        # mask and porosity are computed in one pass over the image
+        mask, _, porosity = segment_fmi_image(self.current_file[self.current_channel], threshold=self.current_threshold)
+        self.set_fmi_mask(mask, porosity, key)
+
+    def set_fmi_mask(self, mask: NDArray, porosity: NDArray, key: tuple[Path, str, int]) -> None:
+        """Method to store the current mask, products of other channels and thresholds are dropped."""
+        self.fmi_mask, self.fmi_porosity, self.fmi_mask_key = mask, porosity, key
+        self.products.retain(*key)
+
+    def update_sorted_rows(self) -> None:
+        """Method to sort rows of the current channel once, for fast whashout curve lookups."""
+        key = self.get_current_key()
+        if self.sorted_rows_key != key:
+            self.sorted_rows = sort_rows(self.current_file[self.current_channel])
+            self.sorted_rows_key = key
 
     def update_aspect_ratio(self, value: int) -> None:
         """Method to update aspect ratio of the main image."""
         self.img_scale = value
-        self.plot_fmi_channel()
+        # only transforms change, layer data is not uploaded again
+        for layer in (self.current_layer, self.curve_layer, self.mask_layer):
+            if self.is_layer_shown(layer):
+                layer.scale = (1, self.img_scale)
+
+    def is_layer_shown(self, layer: Layer | None) -> bool:
+        """Method to check that layer exists and was not removed from the viewer by user."""
+        return layer is not None and layer in self.viewer.layers
+
+    def get_image_levels(self) -> list[NDArray] | None:
+        """Method to return pyramid of the current channel, starting to build it if needed."""
+        if not self.checkbox_multiscale.isChecked():
+            return None
+        key = self.get_current_key()
+        if self.pyramid_key == key:
+            return self.pyramid_levels
+        if key not in self.pyramid_pending:
+            self.pyramid_pending.add(key)
+            worker = thread_worker(load_or_build_pyramid)(key[0], key[1], self.current_file[key[1]])
+            worker.returned.connect(partial(self.on_pyramid_ready, key))
+            worker.finished.connect(partial(self.pyramid_pending.discard, key))
+            worker.start()
+        return None
+
+    def on_pyramid_ready(self, key: tuple[Path, str], levels: list[NDArray]) -> None:
+        """Method to show pyramid built in background if it is still relevant."""
+        if key != self.get_current_key():
+            return
+        self.pyramid_key, self.pyramid_levels = key, levels
+        if self.checkbox_multiscale.isChecked() and len(levels) > 1:
+            self.plot_fmi_channel()
 
     def plot_fmi_channel(self) -> None:
         """Method to plot fmi channel in viewer."""
         if self.current_file is not None and self.current_channel is not None:
-            self.clear_image_layer()
-            print(self.current_file.keys())
-            self.current_layer = self.viewer.add_image(
-                self.current_file[self.current_channel],
-                name=f"{self.fmi_image_list[self.index_file].name}_{self.current_channel}",
-                scale=(1, self.img_scale),
-                colormap="bop blue",
-                interpolation2d="linear",
-            )
-            self.plot_whashout_curve()
+            # full resolution image is shown until the pyramid is ready
+            levels = self.get_image_levels()
+            multiscale = levels is not None and len(levels) > 1
+            data = levels if multiscale else self.current_file[self.current_channel]
+            name = f"{self.fmi_image_list[self.index_file].name}_{self.current_channel}"
+            if self.is_layer_shown(self.current_layer) and self.current_layer.multiscale == multiscale:
+                # reuse the layer, only the image buffer is replaced
+                set_layer_data(self.current_layer, data, name=name, reset_contrast_limits=True)
+            else:
+                self.clear_image_layer()
+                self.current_layer = self.viewer.add_image(
+                    data,
+                    multiscale=multiscale,
+                    name=name,
+                    scale=(1, self.img_scale),
+                    colormap="bop blue",
+                    interpolation2d="linear",
+                )
+            # sorted rows and mask are prepared in background, until then only the image is updated
+            if self.sorted_rows_key == self.get_current_key():
+                self.plot_whashout_curve()
+                self.plot_fmi_mask()
 
     def plot_whashout_curve(self) -> None:
         """Method to plot whashout curve."""
+        # O(H log W) lookup in sorted rows instead of thresholding the whole image
+        self.whashout_curve = get_whashout_curve_sorted(self.sorted_rows, self.current_threshold)
+        self.show_whashout_curve()
+
+    def show_whashout_curve(self) -> None:
+        """Method to show current whashout curve, the layer is reused if it exists."""
+        if self.is_layer_shown(self.curve_layer):
+            set_layer_data(self.curve_layer, [self.whashout_curve])
+            return
         self.clear_curve_layer()
-        self.clear_fmi_mask()
-        self.update_fmi_mask()
-        self.whashout_curve = get_whashout_curve(fmi_boolean=self.fmi_mask)
         self.curve_layer = self.viewer.add_shapes(
             [self.whashout_curve],
             shape_type="path",
@@ -221,12 +520,35 @@ class FMIProcessor(FMIProcessorBase):
             name="Caverns content, %",
             visible=False,
         )
-        self.plot_fmi_mask()
 
     def plot_fmi_mask(self) -> None:
-        """Method to plot fmi mask according to threshold value."""
+        """Method to plot fmi mask of the current channel, the mask is computed in background."""
+        if self.fmi_mask_key is None or self.fmi_mask_key[:2] != self.get_current_key():
+            return
+        multiscale = self.current_layer is not None and self.current_layer.multiscale
+        if multiscale:
+            # block max pyramid of the mask is built in background
+            worker = thread_worker(get_mask_data)(self.fmi_mask, multiscale)
+            worker.returned.connect(partial(self.on_mask_pyramid_ready, self.fmi_mask))
+            worker.start()
+            return
+        self.show_fmi_mask(get_mask_data(self.fmi_mask, multiscale))
+
+    def on_mask_pyramid_ready(self, fmi_mask: NDArray, levels: list[NDArray]) -> None:
+        """Method to show mask pyramid built in background if the mask is still the current one."""
+        if fmi_mask is self.fmi_mask:
+            self.show_fmi_mask(levels)
+
+    def show_fmi_mask(self, data: NDArray | list[NDArray]) -> None:
+        """Method to show mask data, the layer is reused if it exists."""
+        multiscale = isinstance(data, list)
+        if self.is_layer_shown(self.mask_layer) and self.mask_layer.multiscale == multiscale:
+            set_layer_data(self.mask_layer, data)
+            return
+        self.clear_fmi_mask()
         self.mask_layer = self.viewer.add_labels(
-            self.fmi_mask * 255,
+            data,
+            multiscale=multiscale,
             scale=(1, self.img_scale),
             name="Segmentation results",
             opacity=0.6,
@@ -235,52 +557,63 @@ class FMIProcessor(FMIProcessorBase):
     def clear_image_layer(self) -> None:
         """Method to clear images after visualization."""
         if self.current_layer is not None:
-            self.viewer.layers.remove(self.current_layer)
+            if self.is_layer_shown(self.current_layer):
+                self.viewer.layers.remove(self.current_layer)
             self.current_layer = None
 
     def clear_curve_layer(self) -> None:
         """Method to clear curve layer."""
         if self.curve_layer is not None:
-            self.viewer.layers.remove(self.curve_layer)
+            if self.is_layer_shown(self.curve_layer):
+                self.viewer.layers.remove(self.curve_layer)
             self.curve_layer = None
 
     def clear_fmi_mask(self) -> None:
         """Method to clear mask layer."""
         if self.mask_layer is not None:
-            self.viewer.layers.remove(self.mask_layer)
+            if self.is_layer_shown(self.mask_layer):
+                self.viewer.layers.remove(self.mask_layer)
             self.mask_layer = None
 
     def init_folders_to_save_results(self) -> None:
         """Method to init folders where we will store .xlsx file and images."""
-        self.path_xlsx_files: Path = self.folder_results / "excel_files"
-        self.path_img_files: Path = self.folder_results / "segmentation_results"
-        self.path_xlsx_files.resolve().mkdir(exist_ok=True, parents=True)
-        self.path_img_files.resolve().mkdir(exist_ok=True, parents=True)
+        self.path_xlsx_files, self.path_img_files = init_results_folders(self.folder_results)
 
     def save_segmentation_results(self) -> None:
         """Method to save segmentation results to .xlsx file."""
-        df_results = pd.DataFrame(
-            {
-                "Depth": self.current_file[DEPTH_KEY],
-                "Whashout": self.whashout_curve[:, 1] / self.fmi_mask.shape[1],  # normalize to width of the image
-            },
-        )
+        # make sure the curve and the mask match the selected threshold
+        self.threshold_worker.cancel()
+        self.update_sorted_rows()
+        self.update_fmi_mask()
+        self.plot_whashout_curve()
+        self.plot_fmi_mask()
         file_name: str = self.fmi_image_list[self.index_file].name.split(".")[0]
-        save_name: str = f"{file_name}_{self.current_threshold}.xlsx"
-        path_to_export: Path = self.path_xlsx_files / save_name
-        df_results.to_excel(path_to_export.resolve(), index=False)
+        save_name: str = get_export_name(self.fmi_image_list[self.index_file], self.current_threshold)
+        save_whashout_curve(
+            self.path_xlsx_files / f"{save_name}.xlsx",
+            depth=self.current_file[DEPTH_KEY],
+            whashout_curve=self.whashout_curve,
+            width=self.fmi_mask.shape[1],  # normalize to width of the image
+        )
         self.save_mask()
         show_info(f"Results for {file_name} were saved to .xlsx file!")
 
     def save_mask(self) -> None:
         """Method to save the mask."""
         file_name: str = self.fmi_image_list[self.index_file].name.split(".")[0]
-        save_name: str = f"{file_name}_{self.current_threshold}.png"
-        path_to_save: Path = self.path_img_files / save_name
-        cv2.imwrite(str(path_to_save.resolve()), self.mask_layer.data)
+        save_name: str = get_export_name(self.fmi_image_list[self.index_file], self.current_threshold)
+        # mask layer may still wait for its pyramid, the current mask is saved
+        save_mask(self.path_img_files / f"{save_name}.png", get_mask_labels(self.fmi_mask))
         show_info(f"Results for {file_name} were saved to .xlsx and .png files!")
 
     def open_logs_layout(self) -> None:
-        """Method to start new layout for logging data processing."""
-        self.log_window = LogsProcessor(fmi_processor=self)
+        """Method to open layout for logging data processing, the window is created once."""
+        if self.log_window is None:
+            self.log_window = LogsProcessor(fmi_processor=self)
+            self.background_workers.append(self.log_window)
+        else:
+            # products of unchanged channel and threshold are taken from the registry
+            self.log_window.update_fmi_data()
         self.log_window.show()
+        self.log_window.raise_()
+        self.log_window.activateWindow()
@@ -0,0 +1,110 @@
+"""Module with background workers for recomputations triggered by GUI controls."""
+
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from typing import Generic, TypeVar
+
+from qtpy.QtCore import QObject, QTimer, Signal
+
+from .constants import WORKER_DEBOUNCE_MS
+
+
+RequestT = TypeVar("RequestT")
+ResultT = TypeVar("ResultT")
+
+class LatestValueWorker(QObject, Generic[RequestT, ResultT]):
+    """Class to run recomputation on a worker thread for the latest requested value only.
+
+    Requests coming while the slider is dragged are debounced and coalesced: at most one
+    job runs at a time, and only the newest request waits for it. Results of requests
+    which were superseded or cancelled are dropped before they reach the GUI thread.
+    """
+
+    result_ready = Signal(object, object)  # request, result
+    error = Signal(object, object)  # request, exception raised by compute
+    _computed = Signal(int, object, object)  # generation, request, result
+    _failed = Signal(int, object, object)  # generation, request, exception
+
+    def __init__(self, compute: Callable[[RequestT], ResultT], debounce_ms: int = WORKER_DEBOUNCE_MS) -> None:
+        super().__init__()
+        self.compute = compute
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="fmi-worker")
+        self.lock = threading.Lock()
+        self.generation: int = 0
+        self.pending: tuple[int, RequestT] | None = None
+        self.running: bool = False
+        self.stopped: bool = False
+        # signals are emitted from the worker thread and delivered on the GUI thread
+        self._computed.connect(self._deliver)
+        self._failed.connect(self._deliver_error)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(debounce_ms)
+        self.timer.timeout.connect(self._start)
+
+    def submit(self, request: RequestT) -> None:
+        """Method to request recomputation, replacing any request which has not started yet."""
+        with self.lock:
+            self.generation += 1
+            self.pending = (self.generation, request)
+        self.timer.start()
+
+    def cancel(self) -> None:
+        """Method to drop the pending request and the result of the running one."""
+        self.timer.stop()
+        with self.lock:
+            self.generation += 1
+            self.pending = None
+
+    def _start(self) -> None:
+        with self.lock:
+            if self.running or self.pending is None or self.stopped:
+                return
+            self.running = True
+        self.executor.submit(self._run)
+
+    def _run(self) -> None:
+        while True:
+            with self.lock:
+                if self.pending is None:
+                    self.running = False
+                    return
+                generation, request = self.pending
+                self.pending = None
+            # failed request is reported to the GUI thread and the loop goes on with the next one
+            try:
+                result = self.compute(request)
+            except Exception as error:  # noqa: BLE001
+                self._failed.emit(generation, request, error)
+                continue
+            with self.lock:
+                is_stale = generation != self.generation
+            if not is_stale:
+                self._computed.emit(generation, request, result)
+
+    def _deliver(self, generation: int, request: RequestT, result: ResultT) -> None:
+        if generation == self.generation:
+            self.result_ready.emit(request, result)
+
+    def _deliver_error(self, generation: int, request: RequestT, error: Exception) -> None:
+        if generation == self.generation:
+            self.error.emit(request, error)
+
+    def shutdown(self) -> None:
+        """Method to stop the worker thread, requests submitted afterwards are ignored."""
+        self.cancel()
+        self.stopped = True
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_workers(workers: Iterable, *_: object) -> None:
+    """Method to stop worker threads, connected to destruction of the widget which owns them.
+
+    Args:
+        workers: workers and prefetchers with shutdown method
+        *_: arguments of the signal
+
+    """
+    for worker in workers:
+        worker.shutdown()
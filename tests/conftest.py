@@ -0,0 +1,38 @@
+"""Fixtures shared by the tests."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+from numpy.typing import NDArray
+
+
+@pytest.fixture
+def fmi_data() -> dict:
+    """FMI file as loaded from pickle: depth, image channels with NaN and encoded None, and metadata."""
+    rng = np.random.default_rng(0)
+    n_rows, width = 5000, 48
+    image = rng.uniform(0, 100, size=(n_rows, width)).astype(np.float32)
+    image[rng.random(image.shape) < 0.05] = np.nan
+    image[rng.random(image.shape) < 0.05] = -99
+    return {
+        "DEPT": np.linspace(1000, 1000 + n_rows * 0.0025, n_rows),
+        "DYN_HRUT": image,
+        "STA_HRLT": rng.integers(0, 255, size=(n_rows, width), dtype=np.uint8),
+        "WELL": "well-1",
+    }
+
+
+@pytest.fixture
+def fmi_pickle(tmp_path: Path, fmi_data: dict) -> Path:
+    """FMI file saved as pickle within the temporary folder."""
+    path_to_file = tmp_path / "well_1.pkl"
+    pd.to_pickle(fmi_data, path_to_file)
+    return path_to_file
+
+
+@pytest.fixture
+def fmi_image(fmi_data: dict) -> NDArray:
+    """FMI image with NaN and encoded None values."""
+    return fmi_data["DYN_HRUT"]
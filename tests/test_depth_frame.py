@@ -0,0 +1,46 @@
+"""Tests of curves kept at native depth sampling."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from plugin_fmi.depth_frame import DepthFrame, resample_curve
+
+
+DEPTH = np.array([100.0, 100.5, 101.0, 101.5, 102.0])
+VALUES = np.array([1.0, np.nan, 3.0, 4.0, 5.0])
+
+
+def test_resample_linear() -> None:
+    """Linear interpolation between valid samples, NaN outside of the curve."""
+    grid = np.array([99.0, 100.25, 100.5, 101.75, 103.0])
+    np.testing.assert_allclose(resample_curve(DEPTH, VALUES, grid), [np.nan, 1.5, 2.0, 4.5, np.nan])
+
+
+def test_resample_nearest() -> None:
+    """Nearest sample within one step of the curve, text values become None outside of it."""
+    grid = np.array([99.0, 100.2, 101.4, 102.4, 103.0])
+    np.testing.assert_allclose(resample_curve(DEPTH, VALUES, grid, mode="nearest"), [np.nan, 1, 4, 5, np.nan])
+    names = np.array(["A", "B", "C", "D", "E"], dtype=object)
+    assert resample_curve(DEPTH, names, grid, mode="nearest").tolist() == [None, "A", "D", "E", None]
+
+
+def test_resample_mean() -> None:
+    """Mean of valid samples within every cell between midpoints of the grid."""
+    grid = np.array([99.0, 100.0, 101.0, 102.0, 105.0])
+    expected = [np.nan, 1.0, 3.5, 5.0, np.nan]
+    np.testing.assert_allclose(resample_curve(DEPTH, VALUES, grid, mode="mean"), expected)
+    with pytest.raises(ValueError, match="Unknown resampling mode"):
+        resample_curve(DEPTH, VALUES, grid, mode="cubic")
+
+
+def test_add_table_depth_column() -> None:
+    """Index curve of .las file is taken as depth when no column is named as depth."""
+    frame = DepthFrame()
+    frame.add_table("logs", pd.DataFrame({"DEPT": DEPTH[::-1], "GR": VALUES[::-1], "ZONE": list("ABCDE")}))
+    depth, values = frame.get_curve("GR")
+    np.testing.assert_array_equal(depth, DEPTH)
+    np.testing.assert_array_equal(values, VALUES)
+    assert frame.get_curve_names() == ["GR"]
+    with pytest.raises(ValueError, match="no numeric depth column"):
+        frame.add_table("tops", pd.DataFrame({"ZONE": list("ABCDE"), "GR": VALUES}))
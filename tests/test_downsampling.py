@@ -0,0 +1,60 @@
+"""Tests of log curve downsampling for display."""
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from plugin_fmi.downsampling import downsample_curve, get_lttb_indices, get_minmax_indices
+
+
+@pytest.fixture
+def curve() -> tuple[NDArray, NDArray]:
+    """Noisy curve with spikes and a gap."""
+    rng = np.random.default_rng(0)
+    depth = np.linspace(1000, 1100, 10001)
+    values = np.sin(depth / 5) + rng.normal(scale=0.1, size=len(depth))
+    values[1234], values[8765] = 10, -10
+    values[5000:5300] = np.nan
+    return depth, values
+
+
+@pytest.mark.parametrize("n_out", [2, 64, 999])
+def test_minmax_keeps_extremes_of_every_bucket(curve: tuple[NDArray, NDArray], n_out: int) -> None:
+    """Minimum and maximum of every bucket are kept, so no spike is lost."""
+    values = curve[1]
+    indices = get_minmax_indices(values, n_out)
+    assert len(indices) <= max(n_out, 2)
+    assert np.all(np.diff(indices) > 0)
+    n_buckets = max(n_out // 2, 1)
+    bucket_size = -(-len(values) // n_buckets)
+    for start in range(0, len(values), bucket_size):
+        bucket = values[start : start + bucket_size]
+        kept = values[indices[(indices >= start) & (indices < start + bucket_size)]]
+        if np.isfinite(bucket).any():
+            assert np.nanmin(bucket) in kept
+            assert np.nanmax(bucket) in kept
+
+
+@pytest.mark.parametrize("n_out", [3, 100, 1000])
+def test_lttb_keeps_endpoints(curve: tuple[NDArray, NDArray], n_out: int) -> None:
+    """Exactly n_out increasing indices are kept, including both ends of the curve."""
+    depth, values = curve
+    valid = np.isfinite(values)
+    indices = get_lttb_indices(depth[valid], values[valid], n_out)
+    assert len(indices) == n_out
+    assert indices[0] == 0
+    assert indices[-1] == valid.sum() - 1
+    assert np.all(np.diff(indices) > 0)
+
+
+@pytest.mark.parametrize("method", ["minmax", "lttb"])
+def test_downsample_curve(curve: tuple[NDArray, NDArray], method: str) -> None:
+    """Short curves are kept as they are, long ones keep their spikes."""
+    depth, values = curve
+    short_depth, short_values = downsample_curve(depth[:100], values[:100], 200, method=method)
+    np.testing.assert_array_equal(short_depth, depth[:100])
+    np.testing.assert_array_equal(short_values, values[:100])
+    kept_depth, kept_values = downsample_curve(depth, values, 500, method=method)
+    assert len(kept_values) <= 500
+    assert {10, -10} <= set(kept_values)
+    assert np.isin(kept_depth, depth).all()
@@ -0,0 +1,65 @@
+"""Tests of the metadata index of the folder with FMI files."""
+
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from plugin_fmi.folder_index import (
+    build_folder_index,
+    compute_channel_stats,
+    index_file,
+    index_opened_file,
+    iter_folder_index,
+    read_folder_index,
+)
+from plugin_fmi.storage import FMIStore, convert_fmi_pickle
+
+
+def test_channel_stats(fmi_pickle: Path, fmi_data: dict) -> None:
+    """Statistics streamed from the store equal those of the whole array."""
+    image = fmi_data["DYN_HRUT"]
+    finite = image[np.isfinite(image)]
+    stats = compute_channel_stats(fmi_data, "DYN_HRUT")
+    assert stats["min"] == finite.min()
+    assert stats["max"] == finite.max()
+    assert sum(stats["histogram"]["counts"]) == finite.size
+    assert abs(stats["percentiles"]["50"] - np.median(finite)) < (finite.max() - finite.min()) / 100
+    store = FMIStore(convert_fmi_pickle(fmi_pickle, chunk_rows=700))
+    assert compute_channel_stats(store, "DYN_HRUT") == stats
+
+
+def test_index_file_requires_store(fmi_pickle: Path) -> None:
+    """Pickle is not decoded to be indexed, only its store is read."""
+    assert index_file(fmi_pickle) is None
+    convert_fmi_pickle(fmi_pickle)
+    entry = index_file(fmi_pickle)
+    assert set(entry["channels"]) == {"DYN_HRUT", "STA_HRLT"}
+    assert entry["depth"]["top"] == 1000
+
+
+def test_folder_index_is_refreshed(fmi_pickle: Path, fmi_data: dict) -> None:
+    """Saved entries are reused, entries of removed files are dropped."""
+    convert_fmi_pickle(fmi_pickle)
+    entries = build_folder_index(fmi_pickle.parent, [fmi_pickle])
+    assert read_folder_index(fmi_pickle.parent)["files"] == entries
+    path_to_other = fmi_pickle.with_name("well_2.pkl")
+    pd.to_pickle(fmi_data, path_to_other)
+    convert_fmi_pickle(path_to_other)
+    assert set(build_folder_index(fmi_pickle.parent, [fmi_pickle, path_to_other])) == {"well_1.pkl", "well_2.pkl"}
+    assert build_folder_index(fmi_pickle.parent, [path_to_other]).keys() == {"well_2.pkl"}
+    assert read_folder_index(fmi_pickle.parent)["files"].keys() == {"well_2.pkl"}
+
+
+def test_opened_file_entry_kept_by_folder_index(fmi_pickle: Path, fmi_data: dict) -> None:
+    """Entry saved on opening the file while the folder is indexed is not overwritten."""
+    path_to_other = fmi_pickle.with_name("well_2.pkl")
+    pd.to_pickle(fmi_data, path_to_other)
+    convert_fmi_pickle(path_to_other)
+    folder_entries = iter_folder_index(fmi_pickle.parent, [fmi_pickle, path_to_other])
+    next(folder_entries)
+    _, entry = index_opened_file(fmi_pickle.parent, fmi_pickle, fmi_data)
+    list(folder_entries)
+    saved = read_folder_index(fmi_pickle.parent)["files"]
+    assert saved.keys() == {"well_1.pkl", "well_2.pkl"}
+    assert saved["well_1.pkl"] == entry
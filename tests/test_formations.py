@@ -0,0 +1,27 @@
+"""Tests of formation tops kept as depth intervals."""
+
+import numpy as np
+import pandas as pd
+
+from plugin_fmi.formations import FormationIntervals
+
+
+def test_lookup_matches_intervals() -> None:
+    """Binary search finds the same formation as checking every interval, None in gaps."""
+    df_tops = pd.DataFrame(
+        {
+            "TOP": [1200.0, 1000.0, 1100.0, 1300.0],
+            "BOTTOM": [1250.0, np.nan, 1200.0, np.nan],
+            "FORMATION": ["C", "A", "B", "A"],
+        },
+    )
+    intervals = FormationIntervals.from_table(df_tops)
+    depth = np.linspace(950, 1400, 901)
+    expected = [None] * len(depth)
+    for top, bottom, formation in zip(intervals.tops, intervals.bottoms, intervals.names[intervals.codes]):
+        for i, d in enumerate(depth):
+            if top <= d < bottom:
+                expected[i] = formation
+    assert intervals.lookup(depth).tolist() == expected
+    assert intervals.lookup([1000, 1099.9, 1260, 1500]).tolist() == ["A", "A", None, "A"]
+    assert intervals.get_intervals(bottom_limit=1350)["BOTTOM"].tolist() == [1100, 1200, 1250, 1350]
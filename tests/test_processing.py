@@ -0,0 +1,115 @@
+"""Tests of segmentation kernels against brute-force references."""
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from plugin_fmi.processing import (
+    count_below_threshold,
+    decimate_rows,
+    fit_lines,
+    get_whashout_curve,
+    get_whashout_sweep,
+    segment_fmi_image,
+    sort_rows,
+)
+
+
+THRESHOLDS: list[float] = [-100, -99, 0, 37.5, 50, 100, 1000]
+
+
+@pytest.fixture
+def image_with_gaps(fmi_image: NDArray) -> NDArray:
+    """FMI image with ties of values, rows without valid values and a width which is not a power of two."""
+    image = fmi_image[:1000, :45].copy()
+    image[::7, ::3] = 50
+    image[10] = np.nan
+    image[11] = -99
+    return image
+
+
+@pytest.mark.parametrize("threshold", THRESHOLDS)
+def test_count_below_threshold(image_with_gaps: NDArray, threshold: float) -> None:
+    """Binary search over sorted rows counts the same values as comparing the whole image."""
+    counts = count_below_threshold(sort_rows(image_with_gaps), threshold)
+    np.testing.assert_array_equal(counts, (image_with_gaps < threshold).sum(axis=1))
+
+
+@pytest.mark.parametrize("block_rows", [1, 7, 4096])
+def test_whashout_sweep(image_with_gaps: NDArray, block_rows: int) -> None:
+    """Every column of the sweep is the whashout curve of its threshold, thresholds may be unsorted."""
+    thresholds = np.array(THRESHOLDS[::-1])
+    sweep = get_whashout_sweep(image_with_gaps, thresholds, block_rows=block_rows)
+    expected = np.stack([(image_with_gaps < threshold).sum(axis=1) for threshold in thresholds], axis=1)
+    np.testing.assert_array_equal(sweep, expected)
+
+
+def segment_reference(fmi_image: NDArray, threshold: float) -> tuple[NDArray, NDArray, NDArray]:
+    """Brute-force mask, whashout curve and porosity computed row by row."""
+    fmi_mask = fmi_image < threshold
+    porosity = np.full(len(fmi_image), np.nan)
+    for i, row in enumerate(fmi_image):
+        valid = row > -99
+        if valid.any():
+            porosity[i] = (row[valid] < threshold).sum() / valid.sum()
+    return fmi_mask, get_whashout_curve(fmi_mask), porosity
+
+
+@pytest.mark.parametrize("threshold", THRESHOLDS)
+@pytest.mark.parametrize("block_rows", [7, 4096])
+def test_segment_fmi_image_numpy(image_with_gaps: NDArray, threshold: float, block_rows: int) -> None:
+    """Fused NumPy segmentation equals the reference."""
+    segmented = segment_fmi_image(image_with_gaps, threshold, block_rows=block_rows, use_numba=False)
+    for result, expected in zip(segmented, segment_reference(image_with_gaps, threshold)):
+        np.testing.assert_array_equal(result, expected)
+
+
+@pytest.mark.parametrize("threshold", THRESHOLDS)
+def test_segment_fmi_image_numba(image_with_gaps: NDArray, threshold: float) -> None:
+    """Numba kernel equals the NumPy implementation."""
+    pytest.importorskip("numba")
+    segmented = segment_fmi_image(image_with_gaps, threshold)
+    for result, expected in zip(segmented, segment_fmi_image(image_with_gaps, threshold, use_numba=False)):
+        np.testing.assert_array_equal(result, expected)
+
+
+def decimate_reference(data: NDArray, factor: int, reducer: str) -> NDArray:
+    """Brute-force reduction of every factor rows, invalid values are ignored by the mean."""
+    rows = data.reshape(data.shape[0], -1).astype(np.float64)
+    groups = [rows[start : start + factor] for start in range(0, len(rows), factor)]
+    if reducer == "max":
+        return np.stack([group.max(axis=0) for group in groups])
+    reduced = []
+    for group in groups:
+        valid = group > -99
+        sums, counts = np.where(valid, group, 0).sum(axis=0), valid.sum(axis=0)
+        reduced.append(np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0))
+    return np.stack(reduced)
+
+
+@pytest.mark.parametrize("factor", [1, 3, 7])
+@pytest.mark.parametrize("block_rows", [1, 20, 4096])
+def test_decimate_rows(image_with_gaps: NDArray, factor: int, block_rows: int) -> None:
+    """Streamed decimation equals the reference for images, masks and 1d curves."""
+    decimated = decimate_rows(image_with_gaps, factor, block_rows=block_rows)
+    np.testing.assert_allclose(decimated, decimate_reference(image_with_gaps, factor, "mean"), rtol=1e-5)
+    fmi_mask = np.multiply(image_with_gaps < 37.5, 255, dtype=np.uint8)
+    decimated = decimate_rows(fmi_mask, factor, reducer="max", block_rows=block_rows)
+    np.testing.assert_array_equal(decimated, decimate_reference(fmi_mask, factor, "max"))
+    curve = image_with_gaps[:, 0]
+    decimated = decimate_rows(curve, factor, block_rows=block_rows)
+    np.testing.assert_allclose(decimated, decimate_reference(curve, factor, "mean")[:, 0], rtol=1e-5)
+
+
+def test_fit_lines() -> None:
+    """Closed form fit of every group equals the least squares polynomial fit."""
+    rng = np.random.default_rng(0)
+    codes = rng.integers(0, 3, size=300)
+    x = rng.uniform(2000, 2100, size=300)
+    y = 0.5 * x + codes + rng.normal(size=300)
+    fitted = fit_lines(x, y, codes, n_groups=4)
+    for code in range(3):
+        slope, intercept = np.polyfit(x[codes == code], y[codes == code], 1)
+        np.testing.assert_allclose([fitted["slope"][code], fitted["intercept"][code]], [slope, intercept])
+        assert fitted["n"][code] == (codes == code).sum()
+    assert np.isnan(fitted["slope"][3])
@@ -0,0 +1,58 @@
+"""Tests of multiscale pyramids of FMI channels."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+from numpy.typing import NDArray
+
+from plugin_fmi.pyramid import block_reduce, build_pyramid, load_or_build_pyramid, load_pyramid
+
+
+def block_reduce_reference(data: NDArray, factors: tuple[int, int], reducer: str) -> NDArray:
+    """Brute-force reduction looping over blocks, incomplete blocks at the ends are dropped."""
+    n_rows, n_cols = data.shape[0] // factors[0], data.shape[1] // factors[1]
+    reduced = np.empty((n_rows, n_cols), dtype=np.float64)
+    for i in range(n_rows):
+        for j in range(n_cols):
+            block = data[i * factors[0] : (i + 1) * factors[0], j * factors[1] : (j + 1) * factors[1]]
+            reduced[i, j] = block.max() if reducer == "max" else np.nanmean(block)
+    return reduced
+
+
+@pytest.mark.parametrize("factors", [(2, 1), (2, 2), (3, 5)])
+def test_block_reduce_mean(fmi_image: NDArray, factors: tuple[int, int]) -> None:
+    """NaN-aware mean of every block, dtype is kept."""
+    data = fmi_image[:301]
+    reduced = block_reduce(data, factors)
+    assert reduced.dtype == data.dtype
+    np.testing.assert_allclose(reduced, block_reduce_reference(data, factors, "mean"), rtol=1e-5)
+
+
+def test_block_reduce_max(fmi_image: NDArray) -> None:
+    """Max of every block of the mask, so thin washouts are kept."""
+    mask = np.multiply(fmi_image[:301] < 10, 255, dtype=np.uint8)
+    reduced = block_reduce(mask, (4, 3), reducer="max")
+    assert reduced.dtype == np.uint8
+    np.testing.assert_array_equal(reduced, block_reduce_reference(mask, (4, 3), "max"))
+
+
+def test_build_pyramid_levels(fmi_image: NDArray) -> None:
+    """Depth is halved until min_height, narrow images keep their width."""
+    levels = build_pyramid(fmi_image, min_height=1000)
+    assert [level.shape for level in levels] == [(5000, 48), (2500, 48), (1250, 48)]
+    assert levels[0] is fmi_image
+
+
+def test_pyramid_persistence(fmi_pickle: Path, fmi_image: NDArray) -> None:
+    """Saved levels are loaded back unchanged and ignored once the source file is modified."""
+    levels = load_or_build_pyramid(fmi_pickle, "DYN_HRUT", fmi_image)
+    loaded = load_pyramid(fmi_pickle, "DYN_HRUT", fmi_image)
+    assert loaded is not None
+    assert len(loaded) == len(levels) > 1
+    for level, level_loaded in zip(levels, loaded):
+        np.testing.assert_array_equal(level_loaded, level)
+    stat = fmi_pickle.stat()
+    os.utime(fmi_pickle, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert load_pyramid(fmi_pickle, "DYN_HRUT", fmi_image) is None
@@ -0,0 +1,56 @@
+"""Tests of the columnar sidecar cache of parsed tables."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from plugin_fmi.sidecar import read_sidecar, write_sidecar
+
+
+@pytest.fixture
+def table_file(tmp_path: Path) -> tuple[Path, pd.DataFrame]:
+    """Source file and the table parsed from it with numeric and text columns."""
+    path_to_file = tmp_path / "logs.las"
+    path_to_file.write_text("~Version\n")
+    df = pd.DataFrame(
+        {
+            "DEPT": np.arange(10, dtype=np.float64),
+            "GR": np.linspace(20, 120, 10),
+            "FORMATION": ["A", "A", None, "B", "B", "B", None, "C", "C", "C"],
+        },
+    )
+    return path_to_file, df
+
+
+def test_sidecar_round_trip(table_file: tuple[Path, pd.DataFrame]) -> None:
+    """Table is read back unchanged, missing text values stay None."""
+    path_to_file, df = table_file
+    write_sidecar(path_to_file, "las", df)
+    cached = read_sidecar(path_to_file, "las")
+    pd.testing.assert_frame_equal(cached, df, check_dtype=False)
+    assert cached["FORMATION"].tolist() == df["FORMATION"].tolist()
+
+
+def test_sidecar_reads_selected_columns(table_file: tuple[Path, pd.DataFrame]) -> None:
+    """Only requested columns are read, the first column is kept on request."""
+    path_to_file, df = table_file
+    write_sidecar(path_to_file, "las", df)
+    assert read_sidecar(path_to_file, "las", columns=["GR"]).columns.tolist() == ["GR"]
+    assert read_sidecar(path_to_file, "las", columns=["GR"], keep_first_column=True).columns.tolist() == ["DEPT", "GR"]
+
+
+def test_sidecar_validity(table_file: tuple[Path, pd.DataFrame]) -> None:
+    """Sidecar survives touching the file, but not changing its content or reading as another kind."""
+    path_to_file, df = table_file
+    write_sidecar(path_to_file, "las", df)
+    assert read_sidecar(path_to_file, "tops") is None
+    stat = path_to_file.stat()
+    os.utime(path_to_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert read_sidecar(path_to_file, "las") is not None
+    # same size, so the content hash decides
+    path_to_file.write_text("~VERSION\n")
+    os.utime(path_to_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2 * 10**9))
+    assert read_sidecar(path_to_file, "las") is None
@@ -0,0 +1,43 @@
+"""Tests of the chunked store of FMI channels."""
+
+import os
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from plugin_fmi.storage import FMIStore, convert_fmi_folder, convert_fmi_pickle, find_store
+
+
+def test_store_round_trip(fmi_pickle: Path, fmi_data: dict) -> None:
+    """Numeric channels are read back unchanged, metadata is dropped."""
+    store = FMIStore(convert_fmi_pickle(fmi_pickle, chunk_rows=700))
+    assert set(store) == {"DEPT", "DYN_HRUT", "STA_HRLT"}
+    for key in store:
+        np.testing.assert_array_equal(store[key], fmi_data[key])
+        assert store.shape(key) == fmi_data[key].shape
+        assert store.dtype(key) == fmi_data[key].dtype
+
+
+@pytest.mark.parametrize(("start", "stop"), [(0, 1), (650, 1450), (699, 700), (4900, None), (0, None)])
+def test_store_read_rows(fmi_pickle: Path, fmi_data: dict, start: int, stop: int | None) -> None:
+    """Depth window spanning any chunks equals the slice of the channel."""
+    store = FMIStore(convert_fmi_pickle(fmi_pickle, chunk_rows=700))
+    np.testing.assert_array_equal(store.read_rows("DYN_HRUT", start, stop), fmi_data["DYN_HRUT"][start:stop])
+
+
+def test_store_outdated_after_pickle_is_modified(fmi_pickle: Path) -> None:
+    """Store is ignored once the pickle is modified after conversion."""
+    path_to_store = convert_fmi_pickle(fmi_pickle)
+    assert find_store(fmi_pickle) == path_to_store
+    assert find_store(path_to_store) == path_to_store
+    stat = fmi_pickle.stat()
+    os.utime(fmi_pickle, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    assert find_store(fmi_pickle) is None
+
+
+def test_convert_folder_skips_up_to_date_stores(fmi_pickle: Path) -> None:
+    """Only pickles without up-to-date store are converted unless overwrite is set."""
+    assert convert_fmi_folder(fmi_pickle.parent) == [fmi_pickle.with_suffix(".fmi")]
+    assert convert_fmi_folder(fmi_pickle.parent) == []
+    assert convert_fmi_folder(fmi_pickle.parent, overwrite=True) == [fmi_pickle.with_suffix(".fmi")]